@@ -0,0 +1,295 @@
+"""
+Línea de comandos de WineProton Manager (wpm). Usa las mismas configuraciones, logs y cachés que la
+interfaz gráfica, pero sin Qt: no necesita pantalla y arranca en milisegundos.
+
+    wpm list [--type wine|proton]
+    wpm install --config X vcrun2022 dxvk ./setup.exe
+    wpm backup --all [--incremental]
+    wpm download proton GE-Proton9-x
+"""
+import argparse
+import sys
+from pathlib import Path
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+def _print_error(message: str):
+    print(f"Error: {message}", file=sys.stderr)
+
+def _target_configs(config_manager, args) -> list[str] | None:
+    """Configuraciones indicadas con --config/--all (por defecto, la última usada). None si alguna no existe."""
+    if args.all:
+        return list(config_manager.configs.get("configs", {}))
+    names = args.config or [config_manager.configs.get("last_used")]
+    missing = [name for name in names if not config_manager.get_config(name)]
+    if missing:
+        _print_error(f"Configuración no encontrada: {', '.join(str(name) for name in missing)}")
+        return None
+    return names
+
+def _parse_install_items(config_manager, raw_items: list[str]) -> list[tuple[str, str, str]]:
+    """
+    Convierte los argumentos en elementos (ruta o verbo, tipo, nombre) como los de la tabla de instalación:
+    un programa personalizado por su nombre, un .exe/.msi o un script .wtr por su ruta, o un verbo de winetricks.
+    """
+    custom_programs = {program.get("name"): program for program in config_manager.get_custom_programs()}
+    items = []
+    for raw_item in raw_items:
+        program = custom_programs.get(raw_item)
+        if program:
+            items.append((program["path"], program["type"], program["name"]))
+        elif raw_item.lower().endswith((".exe", ".msi")):
+            items.append((str(Path(raw_item).resolve()), "exe", Path(raw_item).name))
+        elif raw_item.lower().endswith(".wtr"):
+            items.append((str(Path(raw_item).resolve()), "wtr", Path(raw_item).name))
+        else:
+            items.append((raw_item, "winetricks", raw_item))
+    return items
+
+def _prepare_environment(config_manager, config_name: str) -> dict | None:
+    """Entorno de la configuración; crea su prefijo si todavía no existe (la interfaz lo pregunta antes)."""
+    from core.prefix_creation import PrefixCreator
+
+    config = config_manager.get_config(config_name)
+    try:
+        env = config_manager.get_current_environment(config_name)
+    except (ValueError, FileNotFoundError) as e:
+        _print_error(f"[{config_name}] No se pudo configurar el entorno: {e}")
+        return None
+
+    prefix_path = Path(config["prefix"])
+    if not prefix_path.exists():
+        print(f"[{config_name}] Creando el prefijo {prefix_path}...")
+        result = []
+        creator = PrefixCreator(env, prefix_path, config_manager, config_name)
+        creator.finished.connect(lambda ok, message: result.append((ok, message)))
+        creator.run()
+        ok, message = result[0] if result else (False, "Sin resultado")
+        if not ok:
+            _print_error(f"[{config_name}] No se pudo crear el prefijo: {message}")
+            return None
+        print(f"[{config_name}] {message}")
+    return env
+
+def cmd_list(config_manager, args) -> int:
+    names = config_manager.find_configs(type_=args.type) if args.type else list(config_manager.configs.get("configs", {}))
+    last_used = config_manager.configs.get("last_used")
+    for name in names:
+        config = config_manager.get_config(name) or {}
+        build = config.get("proton_dir") or config.get("wine_dir") or "Wine del sistema"
+        marker = "*" if name == last_used else " "
+        print(f"{marker} {name:<30} {config.get('type', ''):<7} {config.get('arch', ''):<6} {config.get('prefix', '')}  ({build})")
+    return EXIT_OK
+
+def cmd_install(config_manager, args) -> int:
+    from core.install_runner import InstallRunner
+    from core.prefix_index import get_install_index
+    from core.winetricks_planner import plan_installation, load_verb_dependencies
+
+    config_names = _target_configs(config_manager, args)
+    if config_names is None:
+        return EXIT_USAGE
+    items = _parse_install_items(config_manager, args.items)
+    winetricks_path = config_manager.get_winetricks_path()
+    silent_mode = config_manager.get_silent_install() if args.silent is None else args.silent
+    force_mode = config_manager.get_force_winetricks_install() or args.force
+
+    targets = []
+    for config_name in config_names:
+        env = _prepare_environment(config_manager, config_name)
+        if env is not None:
+            targets.append((config_name, env))
+    if not targets:
+        return EXIT_FAILED
+
+    dependencies = load_verb_dependencies(winetricks_path) if any(item[1] == "winetricks" for item in items) else {}
+    indexes = {config_name: get_install_index(env["WINEPREFIX"]) for config_name, env in targets}
+
+    runner = InstallRunner(config_manager, config_manager.get_max_parallel_installs())
+    prefetch_verbs: set[str] = set()
+    for config_name, env in targets:
+        plan = plan_installation(items, indexes[config_name].installed_names(), dependencies, force_mode)
+        for (_, _, item_name), reason in plan.dropped:
+            print(f"[{config_name}] {item_name}: Omitido ({reason})")
+        if plan.items:
+            runner.add_job(config_name, plan.items, env, silent_mode=silent_mode, force_mode=force_mode, winetricks_path=winetricks_path)
+            prefetch_verbs.update(item[0] for item in plan.items if item[1] == "winetricks")
+    if not args.no_prefetch:
+        runner.set_prefetch(prefetch_verbs, winetricks_path)
+
+    runner.prefetch_progress.connect(lambda message: print(message))
+    runner.job_started.connect(lambda config_name: print(f"[{config_name}] Iniciando instalación..."))
+    runner.job_progress.connect(lambda config_name, item_name, status: print(f"[{config_name}] {item_name}: {status}"))
+    runner.job_item_error.connect(lambda config_name, item_name, message: print(f"[{config_name}] {item_name}: {message}", file=sys.stderr))
+    runner.job_error.connect(lambda config_name, message: _print_error(f"[{config_name}] {message}"))
+    if args.verbose:
+        runner.job_console_output.connect(lambda config_name, lines: print("\n".join(f"[{config_name}] | {line}" for line in lines)))
+
+    try:
+        summary = runner.run()
+    except KeyboardInterrupt:
+        print("Instalación cancelada.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+
+    print(f"Terminado: {summary['installed']} instalado(s), {summary['failed']} con error en {len(summary['jobs'])} configuración(es).")
+    return EXIT_FAILED if summary["failed"] or summary["errors"] or summary["canceled"] else EXIT_OK
+
+def cmd_backup(config_manager, args) -> int:
+    from core.backup import PrefixBackup, backup_source_path, backup_destination_path
+
+    config_names = _target_configs(config_manager, args)
+    if config_names is None:
+        return EXIT_USAGE
+
+    failures = 0
+    for config_name in config_names:
+        config = config_manager.get_config(config_name)
+        source_to_backup = backup_source_path(config)
+        if not source_to_backup.exists():
+            _print_error(f"[{config_name}] El directorio de origen para backup '{source_to_backup}' no existe.")
+            failures += 1
+            continue
+        destination_path = backup_destination_path(config_manager, config_name, source_to_backup, is_full_backup=not args.incremental)
+        if destination_path is None:
+            _print_error(f"[{config_name}] No hay un backup completo previo para hacer un backup incremental.")
+            failures += 1
+            continue
+
+        print(f"[{config_name}] Backup {'incremental' if args.incremental else 'completo'} de {source_to_backup} a {destination_path}...")
+        backup = PrefixBackup(source_to_backup, destination_path, config_manager, not args.incremental, config_name)
+        result = []
+        backup.finished.connect(lambda success, message, final_path, _name: result.append((success, message)))
+        if args.verbose:
+            backup.progress_update.connect(lambda line: print(f"[{config_name}] | {line}"))
+        try:
+            backup.run()
+        except KeyboardInterrupt:
+            backup.stop()
+            print("Backup cancelado.", file=sys.stderr)
+            return EXIT_INTERRUPTED
+        success, message = result[0] if result else (False, "Sin resultado")
+        print(f"[{config_name}] {message}", file=sys.stdout if success else sys.stderr)
+        failures += 0 if success else 1
+    return EXIT_FAILED if failures else EXIT_OK
+
+def cmd_download(config_manager, args) -> int:
+    from core.downloads import FileDownload, ArchiveExtraction, fetch_releases
+
+    repositories = [repo for repo in config_manager.get_repositories(args.type) if repo.get("enabled", True)]
+    if args.repo:
+        repositories = [repo for repo in repositories if repo.get("name") == args.repo]
+    if not repositories:
+        _print_error(f"No hay repositorios de {args.type.capitalize()} activos.")
+        return EXIT_USAGE
+
+    available, assets, release_label = [], None, ""
+    for repo in repositories:
+        try:
+            releases = fetch_releases(repo)
+        except Exception as e:
+            _print_error(f"No se pudieron obtener las versiones de '{repo['name']}': {e}")
+            continue
+        for release_name, version, release_assets, _ in releases:
+            available.append(version)
+            if args.version in (version, release_name):
+                assets, release_label = release_assets, release_name
+                break
+        if assets:
+            break
+    if not assets:
+        _print_error(f"No se encontró la versión '{args.version}'. Disponibles: {', '.join(available[:15]) or 'ninguna'}")
+        return EXIT_FAILED
+
+    if args.asset:
+        assets = [asset for asset in assets if args.asset in asset["name"]]
+    if len(assets) != 1:
+        names = ", ".join(asset["name"] for asset in assets) or "ninguno"
+        _print_error(f"Indica qué archivo descargar con --asset (coincidencias: {names}).")
+        return EXIT_USAGE
+
+    asset = assets[0]
+    download_dir = config_manager.proton_download_dir if args.type == "proton" else config_manager.wine_download_dir
+    name = f"{args.type.capitalize()} {release_label}"
+    result = []
+    last_percent = [-10]
+    def on_progress(percent: int):
+        if percent >= last_percent[0] + 10:
+            last_percent[0] = percent - percent % 10
+            print(f"Descargando {asset['name']}: {percent}%")
+
+    download = FileDownload(asset["browser_download_url"], download_dir / asset["name"], name, config_manager, "Downloads")
+    download.progress.connect(on_progress)
+    download.finished.connect(lambda path: result.append(path))
+    download.error.connect(_print_error)
+    try:
+        download.run()
+    except KeyboardInterrupt:
+        download.stop()
+        print("Descarga cancelada.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    if not result:
+        return EXIT_FAILED
+
+    print(f"Descomprimiendo {asset['name']}...")
+    extraction = ArchiveExtraction(result[0], config_manager, name, "Downloads")
+    extracted = []
+    extraction.finished.connect(lambda path: extracted.append(path))
+    extraction.error.connect(_print_error)
+    extraction.run()
+    if not extracted:
+        return EXIT_FAILED
+    print(f"Descarga y descompresión de {name} completadas.\nInstalado en: {extracted[0]}")
+    return EXIT_OK
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="wpm", description="WineProton Manager sin interfaz gráfica.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_targets(subparser):
+        group = subparser.add_mutually_exclusive_group()
+        group.add_argument("--config", "-c", action="append", metavar="NOMBRE", help="Configuración destino (se puede repetir). Por defecto, la última usada.")
+        group.add_argument("--all", action="store_true", help="Todas las configuraciones guardadas.")
+        subparser.add_argument("--verbose", "-v", action="store_true", help="Mostrar la salida de los procesos.")
+
+    list_parser = subparsers.add_parser("list", help="Lista las configuraciones guardadas.")
+    list_parser.add_argument("--type", choices=["wine", "proton"])
+    list_parser.set_defaults(handler=cmd_list)
+
+    install_parser = subparsers.add_parser("install", help="Instala componentes de winetricks, scripts .wtr, ejecutables o programas personalizados.")
+    add_targets(install_parser)
+    install_parser.add_argument("items", nargs="+", metavar="ELEMENTO")
+    install_parser.add_argument("--force", action="store_true", help="Reinstalar aunque ya esté instalado (winetricks --force).")
+    install_parser.add_argument("--silent", action=argparse.BooleanOptionalAction, default=None, help="Instalación silenciosa (por defecto, según los ajustes).")
+    install_parser.add_argument("--no-prefetch", action="store_true", help="No precargar las descargas de winetricks en la caché.")
+    install_parser.set_defaults(handler=cmd_install)
+
+    backup_parser = subparsers.add_parser("backup", help="Hace un backup de los prefijos con rsync.")
+    add_targets(backup_parser)
+    backup_parser.add_argument("--incremental", action="store_true", help="Sincronizar sobre el último backup completo en lugar de crear uno nuevo.")
+    backup_parser.set_defaults(handler=cmd_backup)
+
+    download_parser = subparsers.add_parser("download", help="Descarga y descomprime una versión de Wine o Proton de los repositorios configurados.")
+    download_parser.add_argument("type", choices=["wine", "proton"])
+    download_parser.add_argument("version", help="Etiqueta o nombre de la versión (p. ej. GE-Proton9-20).")
+    download_parser.add_argument("--asset", help="Texto que debe contener el nombre del archivo si la versión tiene varios.")
+    download_parser.add_argument("--repo", help="Nombre del repositorio en el que buscar.")
+    download_parser.set_defaults(handler=cmd_download)
+    return parser
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from config_manager import ConfigManager
+    config_manager = ConfigManager()
+    try:
+        return args.handler(config_manager, args)
+    finally:
+        config_manager.flush_configs()
+        config_manager.close_logs()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,46 @@
 import os
 import json
-import subprocess
-import re
+import shutil
 import time
+import atexit
+import sqlite3
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from PyQt5.QtWidgets import QWidget, QApplication, QPushButton, QTableWidget, QGroupBox, QListWidget, QTreeWidget, QLineEdit, QComboBox, QCheckBox, QRadioButton, QMessageBox
-from PyQt5.QtCore import QSize
-from PyQt5.QtGui import QPalette, QColor
 
-from styles import STYLE_BREEZE, COLOR_BREEZE_ACCENT # Importa desde tu nuevo módulo de estilos
+from core.prefix_index import get_install_index
+from core.process_runner import run_command
+from core.version_cache import WineVersionCache
+from core.log_writer import LogWriter, LogStream
+from core.config_store import ConfigStore, ConfigRoot
+from core.env_snapshot import EnvironmentSnapshot, config_key, file_signature
+
+if TYPE_CHECKING: # Qt solo se importa al usarse, para no cargarlo en el arranque
+    from PyQt5.QtCore import QSize
+    from PyQt5.QtWidgets import QWidget
+
+# Los cambios de configuración hechos dentro de este margen se escriben juntos en una sola escritura
+CONFIG_SAVE_DEBOUNCE_SECONDS = 0.5
 
 class ConfigManager:
     """
     Gestor optimizado para configuraciones persistentes, incluyendo rutas, temas y repositorios.
-    Asegura la estructura básica de configuración al inicio.
+    Asegura la estructura básica de configuración al inicio. No importa Qt (solo lo hacen los métodos
+    de estilo y tamaño de ventana), de modo que la línea de comandos puede usarlo sin pantalla.
     """
-    def __init__(self, app_instance):
+    def __init__(self, app_instance=None):
         self.app_instance = app_instance # Referencia a la instancia de InstallerApp
         self.config_dir = Path.home() / ".config" / "WineProtonManager"
-        self.config_file = self.config_dir / "config.json"
+        self.config_file = self.config_dir / "config.json" # Solo para migrar configuraciones antiguas
+        self.config_db_file = self.config_dir / "config.db"
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
         self.log_dir = self.config_dir / "logs"
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.installation_log_file = self.log_dir / "installation.log"
+        self.log_writer = LogWriter()
+        atexit.register(self.close_logs)
 
         self.wine_download_dir = self.config_dir / "Wine"
         self.proton_download_dir = self.config_dir / "Proton"
@@ -36,6 +52,17 @@ class ConfigManager:
         self.backup_dir = self.config_dir / "Backup"
         self.backup_dir.mkdir(exist_ok=True)
 
+        # Caché de descargas de winetricks (W_CACHE) compartida por todas las configuraciones
+        self.winetricks_cache_dir = self.config_dir / "cache" / "winetricks"
+        self.winetricks_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Plantillas de prefijos recién inicializados, por compilación de Wine/Proton y arquitectura
+        self.prefix_templates_dir = self.config_dir / "templates"
+        self.prefix_templates_dir.mkdir(exist_ok=True)
+
+        # Versiones de Wine/Proton ya consultadas, para no lanzar 'wine --version' en cada llamada
+        self.wine_version_cache = WineVersionCache(self.config_dir / "cache" / "wine_versions.json")
+
         self.last_browsed_dirs = {
             "wine_prefix": str(self.wine_download_dir),
             "proton_prefix": str(self.proton_download_dir),
@@ -45,6 +72,15 @@ class ConfigManager:
             "winetricks": str(Path.home())
         }
 
+        # Entornos resueltos por configuración (también guardados en la base de datos)
+        self._env_snapshots: dict[str, EnvironmentSnapshot] = {}
+        self._snapshot_lock = threading.Lock()
+
+        self._save_lock = threading.Lock()
+        self._save_timer: threading.Timer | None = None
+        self._configs_dirty = False
+        atexit.register(self.flush_configs)
+
         self.configs = self._load_configs()
         self._ensure_default_config()
 
@@ -52,7 +88,7 @@ class ConfigManager:
         """Asegura que existan configuraciones básicas, inicializándolas si faltan."""
         default_settings = {
             "winetricks_path": str(Path(__file__).parent / "AppDir" / "usr" / "bin" / "winetricks"),
-            "config_path": str(self.config_file),
+            "config_path": str(self.config_db_file),
             "theme": "dark",
             "window_size": [900, 650],
             "silent_install": True,
@@ -60,7 +96,12 @@ class ConfigManager:
             "ask_for_backup_before_action": True,
             "last_browsed_dirs": self.last_browsed_dirs,
             "last_full_backup_path": {},
-            "steam_root_path": ""
+            "steam_root_path": "",
+            "max_parallel_installs": 2,
+            "winetricks_cache_max_mb": 10240,
+            "watch_steam_library": True,
+            "protondb_cache_ttl_hours": 72,
+            "protondb_offline": False
         }
 
         default_repositories = {
@@ -128,29 +169,62 @@ class ConfigManager:
 
         self.save_configs()
 
-    def _load_configs(self):
-        """Carga las configuraciones desde el archivo JSON. Devuelve un diccionario vacío si falla o no existe."""
-        if not self.config_file.exists():
-            return {}
-
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                loaded_configs = json.load(f)
-                if "settings" in loaded_configs and "last_browsed_dirs" in loaded_configs["settings"]:
-                    self.last_browsed_dirs = loaded_configs["settings"]["last_browsed_dirs"]
-                return loaded_configs
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error cargando el archivo de configuración {self.config_file}: {e}. Se usará la configuración por defecto.")
-            return {}
+    def _load_configs(self) -> ConfigRoot:
+        """
+        Abre el almacén SQLite de configuración. Si está vacío y existe el antiguo config.json,
+        lo migra y lo renombra a config.json.migrated.
+        """
+        configs = ConfigRoot(ConfigStore(self.config_db_file))
+        if configs.store.is_empty() and self.config_file.exists():
+            try:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    configs.import_dict(json.load(f))
+                configs.flush()
+                self.config_file.rename(self.config_file.with_name(self.config_file.name + ".migrated"))
+            except (json.JSONDecodeError, OSError, sqlite3.Error) as e:
+                print(f"Error migrando el archivo de configuración {self.config_file}: {e}. Se usará la configuración por defecto.")
+
+        settings = configs.get("settings", {})
+        if "last_browsed_dirs" in settings:
+            self.last_browsed_dirs = settings["last_browsed_dirs"]
+        return configs
 
     def save_configs(self):
-        """Guarda las configuraciones en el archivo JSON con manejo de errores."""
-        try:
-            self.configs["settings"]["last_browsed_dirs"] = self.last_browsed_dirs
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.configs, f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error guardando el archivo de configuración {self.config_file}: {e}")
+        """
+        Marca las configuraciones como modificadas y programa su escritura. Las llamadas que llegan
+        dentro de CONFIG_SAVE_DEBOUNCE_SECONDS se agrupan en una sola escritura (ver flush_configs).
+        """
+        with self._save_lock:
+            self._configs_dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(CONFIG_SAVE_DEBOUNCE_SECONDS, self.flush_configs)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush_configs(self):
+        """Escribe ya las configuraciones pendientes (solo las filas y valores modificados, en una transacción)."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._configs_dirty:
+                return
+            try:
+                self.configs["settings"]["last_browsed_dirs"] = self.last_browsed_dirs
+                self.configs.flush()
+                self._configs_dirty = False
+            except RuntimeError:
+                # Se estaba modificando desde otro hilo mientras se serializaba: reintentar más tarde
+                self._save_timer = threading.Timer(CONFIG_SAVE_DEBOUNCE_SECONDS, self.flush_configs)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+            except sqlite3.Error as e:
+                print(f"Error guardando la configuración en {self.config_db_file}: {e}")
+
+    def find_configs(self, type_: str | None = None, build: str | None = None, prefix: str | None = None) -> list[str]:
+        """Nombres de las configuraciones guardadas por tipo, compilación (proton_dir/wine_dir) y/o ruta del prefijo."""
+        self.flush_configs() # La búsqueda se hace en la base de datos: incluir los cambios pendientes
+        return self.configs["configs"].find(type_, build, prefix)
 
     def get_config(self, config_name: str) -> dict | None:
         """Obtiene una configuración específica por nombre."""
@@ -159,19 +233,61 @@ class ConfigManager:
     def get_current_environment(self, config_name: str) -> dict:
         """
         Obtiene las variables de entorno para la configuración dada.
-        Valida la existencia de los ejecutables clave de Wine/Proton.
+        Reutiliza su instantánea de entorno (ver core.env_snapshot) mientras la configuración y los
+        ejecutables de su compilación no cambien; si no, la vuelve a resolver y la guarda.
         """
         config = self.get_config(config_name)
         if not config:
             raise ValueError(f"Configuración '{config_name}' no encontrada.")
+        return self.get_environment_snapshot(config_name, config).apply(os.environ)
 
-        env = os.environ.copy()
+    def get_environment_snapshot(self, config_name: str, config: dict | None = None) -> EnvironmentSnapshot:
+        config = config or self.get_config(config_name)
+        if not config:
+            raise ValueError(f"Configuración '{config_name}' no encontrada.")
+        key = config_key(config)
+        with self._snapshot_lock:
+            snapshot = self._env_snapshots.get(config_name)
+            if snapshot is None:
+                try:
+                    snapshot = EnvironmentSnapshot.from_dict(self.configs.store.load_snapshot(config_name))
+                except (sqlite3.Error, ValueError):
+                    snapshot = None
+            if snapshot is not None and snapshot.is_valid(key):
+                self._env_snapshots[config_name] = snapshot
+                return snapshot
+        return self.refresh_environment_snapshot(config_name, config)
+
+    def refresh_environment_snapshot(self, config_name: str, config: dict | None = None) -> EnvironmentSnapshot:
+        """Resuelve de nuevo el entorno de la configuración y guarda la instantánea (p. ej. al guardar la configuración)."""
+        config = config or self.get_config(config_name)
+        if not config:
+            raise ValueError(f"Configuración '{config_name}' no encontrada.")
+        snapshot = self._resolve_environment(config)
+        with self._snapshot_lock:
+            self._env_snapshots[config_name] = snapshot
+            if snapshot.complete:
+                try:
+                    self.configs.store.save_snapshot(config_name, snapshot.to_dict())
+                except sqlite3.Error as e:
+                    print(f"Error guardando el entorno de '{config_name}': {e}")
+        return snapshot
+
+    def build_environment(self, config: dict) -> dict:
+        """Variables de entorno para una configuración que no tiene por qué estar guardada (p. ej. al probarla)."""
+        return self._resolve_environment(config).apply(os.environ)
+
+    def _resolve_environment(self, config: dict) -> EnvironmentSnapshot:
+        """Comprueba los ejecutables, lee las versiones y calcula las variables propias de la configuración."""
+        env = {}
         env["WINEPREFIX"] = config["prefix"]
         env["WINEARCH"] = config.get("arch", "win64")
 
         wine_executable = "wine"
         wineserver_executable = "wineserver"
         path_override = ""
+        checked_files: list[str] = []
+        complete = True
 
         if config.get("type") == "proton":
             proton_dir = Path(config["proton_dir"])
@@ -194,15 +310,15 @@ class ConfigManager:
 
             env["PROTON_DIR"] = str(proton_dir)
             version_file = proton_dir / "version"
+            checked_files.append(str(version_file))
             if version_file.exists():
                 with open(version_file, 'r', encoding='utf-8') as f:
                     env["PROTON_VERSION"] = f.read().strip()
 
-            try:
-                result = subprocess.run([wine_executable, "--version"], env=env, capture_output=True, text=True, check=True, timeout=5)
-                env["WINE_VERSION_IN_PROTON"] = result.stdout.strip()
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                env["WINE_VERSION_IN_PROTON"] = "N/A (Error al obtener versión o tiempo de espera agotado)"
+            probe_env = dict(os.environ, **env, PATH=f"{path_override}:{os.environ.get('PATH', '')}")
+            version = self._probe_wine_version([wine_executable, "--version"], probe_env)
+            complete = version is not None
+            env["WINE_VERSION_IN_PROTON"] = version or "N/A (Error al obtener versión o tiempo de espera agotado)"
 
         else: # type == "wine"
             wine_dir = config.get("wine_dir")
@@ -215,26 +331,41 @@ class ConfigManager:
                 if not Path(wine_executable).is_file():
                     raise FileNotFoundError(f"Ejecutable de Wine no encontrado en {wine_dir}: {wine_executable}")
 
-                try:
-                    result = subprocess.run([wine_executable, "--version"], capture_output=True, text=True, check=True, timeout=5)
-                    env["WINE_VERSION"] = result.stdout.strip()
-                except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                    env["WINE_VERSION"] = "N/A (Error al obtener versión)"
+                version = self._probe_wine_version([wine_executable, "--version"])
+                complete = version is not None
+                env["WINE_VERSION"] = version or "N/A (Error al obtener versión)"
             else: # Usar Wine del sistema
-                try:
-                    subprocess.run(["which", "wine"], capture_output=True, text=True, check=True, timeout=5)
-                    result = subprocess.run(["wine", "--version"], capture_output=True, text=True, check=True, timeout=5)
-                    env["WINE_VERSION"] = result.stdout.strip()
-                except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                    env["WINE_VERSION"] = "N/A (Versión no detectable)"
-
-        if path_override:
-            env["PATH"] = f"{path_override}:{os.environ.get('PATH', '')}"
+                system_wine = shutil.which("wine")
+                version = self._probe_wine_version([system_wine, "--version"]) if system_wine else None
+                complete = version is not None
+                if system_wine:
+                    checked_files.append(system_wine)
+                env["WINE_VERSION"] = version or "N/A (Versión no detectable)"
 
         env["WINE"] = wine_executable
         env["WINESERVER"] = wineserver_executable
+        env["W_CACHE"] = str(self.winetricks_cache_dir)
+
+        if Path(wine_executable).is_absolute():
+            checked_files[:0] = [wine_executable, wineserver_executable]
+        checks = [file_signature(path) for path in dict.fromkeys(checked_files)]
+        return EnvironmentSnapshot(env, path_override, checks, config_key(config), complete)
 
-        return env
+    def _probe_wine_version(self, cmd: list[str], env: dict | None = None) -> str | None:
+        """
+        Versión de Wine del ejecutable cmd[0], desde la caché si la compilación no ha cambiado.
+        Si no, ejecuta 'wine --version' con un límite de 5 s. Devuelve None si falla.
+        """
+        def probe() -> str | None:
+            try:
+                result = run_command(cmd, env=env, timeout=5, merge_stderr=False)
+            except OSError:
+                return None
+            if result.timed_out or result.returncode != 0:
+                return None
+            return result.stdout.strip() or None
+
+        return self.wine_version_cache.get_version(cmd[0], probe)
 
     def delete_custom_program(self, program_name: str) -> bool:
         """Elimina un programa personalizado por nombre."""
@@ -296,9 +427,7 @@ class ConfigManager:
             self.configs.setdefault("settings", {})["winetricks_path"] = path
             self.save_configs()
             return True
-        else:
-            QMessageBox.warning(None, "Ruta Inválida", "La ruta de Winetricks no es válida o no existe.")
-            return False
+        return False # La interfaz avisa de la ruta inválida
 
     def set_silent_install(self, enabled: bool):
         """Establece si la instalación silenciosa está habilitada y guarda la configuración."""
@@ -318,6 +447,32 @@ class ConfigManager:
         """Obtiene si la instalación forzada de Winetricks está habilitada. Por defecto es False."""
         return self.configs.get("settings", {}).get("force_winetricks_install", False)
 
+    def set_max_parallel_installs(self, count: int):
+        """Establece cuántos prefijos distintos pueden instalarse en paralelo y guarda la configuración."""
+        self.configs.setdefault("settings", {})["max_parallel_installs"] = max(1, int(count))
+        self.save_configs()
+
+    def get_max_parallel_installs(self) -> int:
+        """Obtiene el límite global de instalaciones en paralelo. Por defecto es 2."""
+        return max(1, int(self.configs.get("settings", {}).get("max_parallel_installs", 2)))
+
+    def get_winetricks_cache_dir(self) -> Path:
+        """Obtiene el directorio de la caché compartida de descargas de winetricks (W_CACHE)."""
+        return self.winetricks_cache_dir
+
+    def get_prefix_templates_dir(self) -> Path:
+        """Obtiene el directorio donde se guardan las plantillas de prefijos."""
+        return self.prefix_templates_dir
+
+    def set_winetricks_cache_max_mb(self, size_mb: int):
+        """Establece el tamaño máximo de la caché de winetricks (en MB) y guarda la configuración."""
+        self.configs.setdefault("settings", {})["winetricks_cache_max_mb"] = max(0, int(size_mb))
+        self.save_configs()
+
+    def get_winetricks_cache_max_mb(self) -> int:
+        """Obtiene el tamaño máximo de la caché de winetricks (en MB). Por defecto es 10240."""
+        return max(0, int(self.configs.get("settings", {}).get("winetricks_cache_max_mb", 10240)))
+
     def set_ask_for_backup_before_action(self, enabled: bool):
         """Establece si se pregunta por backup antes de una acción y guarda la configuración."""
         self.configs.setdefault("settings", {})["ask_for_backup_before_action"] = enabled
@@ -327,6 +482,33 @@ class ConfigManager:
         """Obtiene si se pregunta por backup antes de una acción. Por defecto es True."""
         return self.configs.get("settings", {}).get("ask_for_backup_before_action", True)
 
+    def set_watch_steam_library(self, enabled: bool):
+        """Establece si se vigilan las bibliotecas de Steam para actualizar la tabla de juegos y guarda la configuración."""
+        self.configs.setdefault("settings", {})["watch_steam_library"] = enabled
+        self.save_configs()
+
+    def get_watch_steam_library(self) -> bool:
+        """Obtiene si se vigilan las bibliotecas de Steam. Por defecto es True."""
+        return self.configs.get("settings", {}).get("watch_steam_library", True)
+
+    def set_protondb_cache_ttl_hours(self, hours: int):
+        """Establece cuántas horas se consideran vigentes las calificaciones de ProtonDB guardadas y guarda la configuración."""
+        self.configs.setdefault("settings", {})["protondb_cache_ttl_hours"] = max(1, int(hours))
+        self.save_configs()
+
+    def get_protondb_cache_ttl_hours(self) -> int:
+        """Obtiene la vigencia (en horas) de las calificaciones de ProtonDB guardadas. Por defecto es 72."""
+        return max(1, int(self.configs.get("settings", {}).get("protondb_cache_ttl_hours", 72)))
+
+    def set_protondb_offline(self, enabled: bool):
+        """Establece si las calificaciones de ProtonDB se muestran solo desde la caché, sin consultar la red, y guarda la configuración."""
+        self.configs.setdefault("settings", {})["protondb_offline"] = enabled
+        self.save_configs()
+
+    def get_protondb_offline(self) -> bool:
+        """Obtiene si ProtonDB está en modo sin conexión. Por defecto es False."""
+        return self.configs.get("settings", {}).get("protondb_offline", False)
+
     def set_last_full_backup_path(self, config_name: str, path: str):
         """Guarda la ruta del último backup completo exitoso para una configuración específica."""
         # Asegurarse de que el diccionario 'last_full_backup_path' exista en settings
@@ -343,38 +525,29 @@ class ConfigManager:
         """Elimina una configuración guardada, ajustando 'last_used' si es necesario."""
         if config_name in self.configs.get("configs", {}):
             del self.configs["configs"][config_name]
+            with self._snapshot_lock:
+                self._env_snapshots.pop(config_name, None)
             if self.configs["last_used"] == config_name:
                 self.configs["last_used"] = "Wine-System" if "Wine-System" in self.configs["configs"] else ""
             self.save_configs()
             return True
         return False
 
-    def get_installed_winetricks(self, prefix_path: str) -> list[str]:
+    def get_installed_winetricks(self, prefix_path: str) -> set[str]:
         """
-        Obtiene la lista de componentes de winetricks instalados en un prefijo
-        desde el archivo wineprotomanager.ini.
+        Obtiene los elementos registrados como instalados en un prefijo (nombres, orígenes y verbos de
+        winetricks) desde su índice wineprotonmanager.json, cacheado mientras no cambie en disco.
         """
-        wineprotonmanager_ini = Path(prefix_path) / "wineprotonmanager.ini"
-        installed = set()
-        if wineprotonmanager_ini.exists():
-            try:
-                with open(wineprotonmanager_ini, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line in f:
-                        match = re.search(r"installed\s+(\S+)", line)
-                        if match:
-                            installed.add(match.group(1))
+        return get_install_index(prefix_path).installed_names()
 
-            except Exception as e:
-                print(f"Error leyendo el archivo wineprotomanager.ini: {e}")
-        return list(installed)
-
-    def save_window_size(self, size: QSize):
+    def save_window_size(self, size: "QSize"):
         """Guarda el tamaño de la ventana."""
         self.configs.setdefault("settings", {})["window_size"] = [size.width(), size.height()]
         self.save_configs()
 
-    def get_window_size(self) -> QSize:
+    def get_window_size(self) -> "QSize":
         """Obtiene el tamaño de ventana guardado. Por defecto es 900x650."""
+        from PyQt5.QtCore import QSize
         size = self.configs.get("settings", {}).get("window_size", [900, 650])
         return QSize(size[0], size[1])
 
@@ -392,15 +565,25 @@ class ConfigManager:
             return self.log_dir / f"{config_name}.log"
 
     def write_to_log(self, config_name: str, source: str, message: str):
-        """Escribe un mensaje con marca de tiempo en el log apropiado."""
+        """Encola un mensaje con marca de tiempo para el log apropiado (lo escribe el hilo de LogWriter)."""
         # El método get_log_path ahora maneja la lógica de cuál archivo usar.
-        log_path = self.get_log_path(config_name)
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        try:
-            with open(log_path, 'a', encoding='utf-8') as f:
-                f.write(f"[{timestamp}] [{source}] {message}\n")
-        except IOError as e:
-            print(f"Error escribiendo en el log {log_path}: {e}")
+        self.log_writer.write(self.get_log_path(config_name), f"[{timestamp}] [{source}] {message}\n")
+
+    def open_log_stream(self, config_name: str) -> LogStream:
+        """
+        Devuelve un objeto tipo archivo sobre el log de la configuración, para volcar
+        salida de procesos línea a línea a través del escritor en segundo plano.
+        """
+        return self.log_writer.stream(self.get_log_path(config_name))
+
+    def flush_logs(self, timeout: float | None = 5.0) -> bool:
+        """Espera a que se escriban los mensajes de log encolados (p. ej. antes de leer un log)."""
+        return self.log_writer.flush(timeout)
+
+    def close_logs(self):
+        """Escribe los mensajes pendientes y cierra los archivos de log. Se llama al cerrar la aplicación."""
+        self.log_writer.close()
 
     def get_repositories(self, type_: str) -> list[dict]:
         """Obtiene repositorios para Wine o Proton."""
@@ -453,8 +636,11 @@ class ConfigManager:
         self.configs.setdefault("settings", {})["steam_root_path"] = path
         # El guardado se realizará con save_configs() en el diálogo de configuración.
 
-    def apply_breeze_style_to_widget(self, widget: QWidget):
+    def apply_breeze_style_to_widget(self, widget: "QWidget"):
         """Aplica el estilo Breeze a un widget y sus hijos de forma recursiva."""
+        from PyQt5.QtWidgets import QWidget, QApplication, QPushButton, QTableWidget, QGroupBox, QListWidget, QTreeWidget, QLineEdit, QComboBox, QCheckBox, QRadioButton
+        from PyQt5.QtGui import QPalette
+        from styles import STYLE_BREEZE, COLOR_BREEZE_ACCENT
 
         theme = self.get_theme()
         style_settings = STYLE_BREEZE
@@ -0,0 +1,115 @@
+import shutil
+import time
+from pathlib import Path
+
+from config_manager import ConfigManager
+from core.events import Event
+from core.process_runner import ProcessRunner
+
+def backup_source_path(config: dict) -> Path:
+    """Carpeta que se copia en el backup de una configuración: su prefijo, o su compatdata si es de Steam."""
+    if config.get("steam_appid"):
+        return Path.home() / ".local/share/Steam/steamapps/compatdata" / config["steam_appid"]
+    return Path(config["prefix"])
+
+def backup_destination_path(config_manager: ConfigManager, config_name: str, source_to_backup: Path, is_full_backup: bool) -> Path | None:
+    """
+    Determina la ruta de destino correcta para el backup.
+    Si is_full_backup es True, creará una subcarpeta con timestamp.
+    Si es incremental, intentará usar la ruta del último backup completo para *esa* configuración.
+    """
+    base_backup_path_for_config = config_manager.backup_dir / config_name
+    base_backup_path_for_config.mkdir(parents=True, exist_ok=True)
+
+    if is_full_backup:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        # El destino final incluye el nombre de la carpeta a copiar (source_to_backup.name)
+        return base_backup_path_for_config / f"{source_to_backup.name}_backup_{timestamp}"
+    # Para backup incremental, el destino es la última ruta de backup completo guardada para *esta* configuración.
+    last_full_backup_path_str = config_manager.get_last_full_backup_path(config_name)
+    if last_full_backup_path_str and Path(last_full_backup_path_str).is_dir():
+        return Path(last_full_backup_path_str)
+    return None # No hay un backup completo previo para incremental para esta configuración
+
+class PrefixBackup:
+    """
+    Backup de un prefijo con rsync: completo (a una carpeta nueva, pasando por una temporal) o incremental
+    (sobre el último backup completo). Sin Qt: run() es bloqueante y avisa mediante Event.
+    """
+
+    def __init__(self, source_path: Path, destination_path: Path, config_manager: ConfigManager, is_full_backup: bool, config_name: str):
+        self.progress_update = Event() # (línea de rsync)
+        self.finished = Event()        # (éxito, mensaje, ruta final del backup, configuración)
+        self.source_path = source_path
+        self.destination_path = destination_path
+        self.config_manager = config_manager
+        self.is_full_backup = is_full_backup
+        self.config_name = config_name
+        self._is_running = True
+        self._runner: ProcessRunner | None = None
+
+    def run(self):
+        log_source = "Backup"
+        self.config_manager.write_to_log(self.config_name, log_source, f"Iniciando backup de '{self.source_path}' a '{self.destination_path}'")
+        try:
+            if not self.source_path.exists() or not self.source_path.is_dir():
+                raise FileNotFoundError(f"La carpeta de origen del prefijo no existe: {self.source_path}")
+
+            rsync_command = ["rsync", "-av", "--no-o", "--no-g"]
+            final_backup_path_str = ""
+
+            if not self.is_full_backup:
+                rsync_command.append("--checksum")
+                self.config_manager.write_to_log(self.config_name, log_source, "Realizando backup incremental con rsync --checksum.")
+                rsync_command.extend([f"{self.source_path}/", str(self.destination_path)])
+                final_backup_path_str = str(self.destination_path)
+            else:
+                self.config_manager.write_to_log(self.config_name, log_source, "Realizando backup completo (nueva carpeta con timestamp).")
+                temp_backup_dir = self.destination_path.parent / (self.destination_path.name + "_tmp")
+                temp_backup_dir.mkdir(parents=True, exist_ok=True)
+                rsync_command.extend([f"{self.source_path}/", str(temp_backup_dir)])
+                final_backup_path_str = str(self.destination_path)
+
+            self.progress_update.emit("Iniciando sincronización...")
+            self.config_manager.write_to_log(self.config_name, log_source, f"Comando rsync: {' '.join(rsync_command)}")
+            self._runner = ProcessRunner(rsync_command, tail_lines=50)
+            if not self._is_running:
+                self._runner.cancel()
+            result = self._runner.run(lambda line: self.progress_update.emit(line.strip()))
+            self.config_manager.write_to_log(self.config_name, log_source, f"Rsync terminado: {result.describe()}")
+
+            if not self._is_running:
+                self.finished.emit(False, "Backup cancelado por el usuario.", "", self.config_name)
+                self.config_manager.write_to_log(self.config_name, log_source, "Backup cancelado por el usuario.")
+                if self.is_full_backup and 'temp_backup_dir' in locals() and temp_backup_dir.exists():
+                    shutil.rmtree(temp_backup_dir, ignore_errors=True)
+            elif result.returncode == 0:
+                if self.is_full_backup:
+                    shutil.move(str(temp_backup_dir), str(Path(final_backup_path_str)))
+                    self.config_manager.set_last_full_backup_path(self.config_name, final_backup_path_str)
+                    success_msg = f"Backup COMPLETO de '{self.source_path.name}' completado exitosamente a '{final_backup_path_str}'."
+                else:
+                    success_msg = f"Backup INCREMENTAL de '{self.source_path.name}' completado exitosamente a '{self.destination_path}'."
+                self.config_manager.write_to_log(self.config_name, log_source, success_msg)
+                self.finished.emit(True, success_msg, final_backup_path_str, self.config_name)
+            else:
+                output = result.output
+                error_msg = f"Rsync falló con código {result.returncode}.\nSalida: {output}"
+                self.config_manager.write_to_log(self.config_name, log_source, f"ERROR: {error_msg}")
+                if self.is_full_backup and 'temp_backup_dir' in locals() and temp_backup_dir.exists():
+                    shutil.rmtree(temp_backup_dir, ignore_errors=True)
+                self.finished.emit(False, f"Error durante el backup: {output.strip()}", "", self.config_name)
+
+        except FileNotFoundError as e:
+            msg = f"Error: Comando rsync no encontrado o ruta de origen/destino inválida. Asegúrate de que rsync esté instalado. {e}"
+            self.config_manager.write_to_log(self.config_name, log_source, f"ERROR: {msg}")
+            self.finished.emit(False, msg, "", self.config_name)
+        except Exception as e:
+            msg = f"Error inesperado durante el backup: {str(e)}"
+            self.config_manager.write_to_log(self.config_name, log_source, f"ERROR: {msg}")
+            self.finished.emit(False, msg, "", self.config_name)
+
+    def stop(self):
+        self._is_running = False
+        if self._runner:
+            self._runner.cancel()
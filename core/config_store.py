@@ -0,0 +1,255 @@
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from pathlib import Path
+
+SCHEMA_VERSION = 2
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+def config_build(config: dict) -> str:
+    """Compilación de Wine/Proton que usa una configuración (directorio), o "" si es el Wine del sistema."""
+    return config.get("proton_dir") or config.get("wine_dir") or ""
+
+class ConfigStore:
+    """
+    Almacén SQLite de la configuración. Cada configuración de Wine/Proton es una fila (con columnas
+    indexadas de tipo, compilación y prefijo para búsquedas) y el resto de claves de primer nivel
+    (settings, repositories, custom_programs, last_used) se guardan como valores JSON en una tabla aparte.
+    El entorno resuelto de cada configuración se guarda en env_snapshots.
+    Así un cambio en una configuración reescribe solo su fila, no el archivo completo.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS configs (
+                    name TEXT PRIMARY KEY,
+                    type TEXT NOT NULL DEFAULT '',
+                    build TEXT NOT NULL DEFAULT '',
+                    prefix TEXT NOT NULL DEFAULT '',
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS configs_type ON configs(type);
+                CREATE INDEX IF NOT EXISTS configs_build ON configs(build);
+                CREATE INDEX IF NOT EXISTS configs_prefix ON configs(prefix);
+                CREATE TABLE IF NOT EXISTS kv (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS env_snapshots (
+                    name TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                );
+            """)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return (self._conn.execute("SELECT 1 FROM kv LIMIT 1").fetchone() is None
+                    and self._conn.execute("SELECT 1 FROM configs LIMIT 1").fetchone() is None)
+
+    def load_values(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM kv").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def config_names(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM configs ORDER BY name")]
+
+    def load_config(self, name: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM configs WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_configs(self, type_: str | None = None, build: str | None = None, prefix: str | None = None) -> list[str]:
+        """Nombres de las configuraciones que coinciden con todos los criterios indicados (búsqueda por índice)."""
+        conditions, params = [], []
+        for column, value in (("type", type_), ("build", build), ("prefix", prefix)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(f"SELECT name FROM configs{where} ORDER BY name", params)]
+
+    def write(self, values: dict[str, object], configs: dict[str, dict], deleted_configs: set[str]):
+        """Escribe en una sola transacción los valores y configuraciones modificados y borra los eliminados."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO kv(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    [(key, _dumps(value)) for key, value in values.items()]
+                )
+                self._conn.executemany("DELETE FROM configs WHERE name = ?", [(name,) for name in deleted_configs])
+                self._conn.executemany("DELETE FROM env_snapshots WHERE name = ?", [(name,) for name in deleted_configs])
+                self._conn.executemany(
+                    "INSERT INTO configs(name, type, build, prefix, data) VALUES(?, ?, ?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET type = excluded.type, build = excluded.build, "
+                    "prefix = excluded.prefix, data = excluded.data",
+                    [(name, config.get("type", ""), config_build(config), config.get("prefix", ""), _dumps(config))
+                     for name, config in configs.items()]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load_snapshot(self, name: str) -> dict | None:
+        """Instantánea de entorno guardada para una configuración (ver core.env_snapshot)."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM env_snapshots WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_snapshot(self, name: str, data: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO env_snapshots(name, data) VALUES(?, ?) ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+                (name, _dumps(data))
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ConfigTable(MutableMapping):
+    """
+    Vista tipo dict de las configuraciones de Wine/Proton. Los nombres se leen al inicio, pero cada
+    configuración se carga de la base de datos la primera vez que se usa. Recuerda qué filas han
+    cambiado (también por modificación directa del dict devuelto) para escribir solo esas.
+    """
+
+    def __init__(self, store: ConfigStore):
+        self._store = store
+        self._names: set[str] = set(store.config_names())
+        self._cache: dict[str, dict] = {}
+        self._snapshots: dict[str, str] = {} # JSON de cada configuración tal como está en la base de datos
+        self._deleted: set[str] = set()
+
+    def __getitem__(self, name: str) -> dict:
+        if name not in self._names:
+            raise KeyError(name)
+        config = self._cache.get(name)
+        if config is None:
+            config = self._store.load_config(name) or {}
+            self._cache[name] = config
+            self._snapshots[name] = _dumps(config)
+        return config
+
+    def __setitem__(self, name: str, config: dict):
+        self._names.add(name)
+        self._deleted.discard(name)
+        self._cache[name] = config
+
+    def __delitem__(self, name: str):
+        if name not in self._names:
+            raise KeyError(name)
+        self._names.discard(name)
+        self._cache.pop(name, None)
+        self._snapshots.pop(name, None)
+        self._deleted.add(name)
+
+    def __contains__(self, name) -> bool:
+        return name in self._names
+
+    def __iter__(self):
+        return iter(sorted(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def find(self, type_: str | None = None, build: str | None = None, prefix: str | None = None) -> list[str]:
+        return self._store.find_configs(type_, build, prefix)
+
+    def pending_changes(self) -> tuple[dict[str, dict], set[str], dict[str, str]]:
+        """(configuraciones nuevas o modificadas, nombres borrados, nuevo JSON de cada una)."""
+        changed, serialized = {}, {}
+        for name, config in self._cache.items():
+            data = _dumps(config)
+            if self._snapshots.get(name) != data:
+                changed[name] = config
+                serialized[name] = data
+        return changed, set(self._deleted), serialized
+
+    def mark_written(self, serialized: dict[str, str], deleted: set[str]):
+        self._snapshots.update(serialized)
+        self._deleted -= deleted
+
+
+class ConfigRoot(MutableMapping):
+    """
+    Sustituto del antiguo dict de config.json: "configs" es una ConfigTable respaldada por SQLite y el resto
+    de claves son valores en memoria que se guardan solo cuando cambian. flush() escribe lo modificado.
+    """
+
+    def __init__(self, store: ConfigStore):
+        self._store = store
+        self._values: dict = store.load_values()
+        self._snapshots: dict[str, str] = {key: _dumps(value) for key, value in self._values.items()}
+        self._table = ConfigTable(store)
+
+    def __getitem__(self, key: str):
+        if key == "configs":
+            return self._table
+        return self._values[key]
+
+    def __setitem__(self, key: str, value):
+        if key == "configs":
+            # Sustitución completa de las configuraciones
+            for name in list(self._table):
+                if name not in value:
+                    del self._table[name]
+            for name, config in value.items():
+                self._table[name] = config
+            return
+        self._values[key] = value
+
+    def __delitem__(self, key: str):
+        if key == "configs":
+            raise KeyError("No se puede eliminar la tabla de configuraciones.")
+        del self._values[key]
+
+    def __iter__(self):
+        yield "configs"
+        yield from self._values
+
+    def __len__(self) -> int:
+        return len(self._values) + 1
+
+    @property
+    def store(self) -> ConfigStore:
+        return self._store
+
+    def flush(self) -> bool:
+        """Escribe las configuraciones y valores modificados. Devuelve True si había algo que escribir."""
+        changed_values, serialized_values = {}, {}
+        for key, value in self._values.items():
+            data = _dumps(value)
+            if self._snapshots.get(key) != data:
+                changed_values[key] = value
+                serialized_values[key] = data
+        changed_configs, deleted_configs, serialized_configs = self._table.pending_changes()
+        if not (changed_values or changed_configs or deleted_configs):
+            return False
+        self._store.write(changed_values, changed_configs, deleted_configs)
+        self._snapshots.update(serialized_values)
+        self._table.mark_written(serialized_configs, deleted_configs)
+        return True
+
+    def import_dict(self, data: dict):
+        """Carga el contenido de un config.json antiguo (migración)."""
+        for key, value in data.items():
+            self[key] = value
@@ -0,0 +1,217 @@
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+from urllib.request import urlopen, Request, HTTPError
+
+from config_manager import ConfigManager
+from core.events import Event
+
+RELEASE_ARCHIVE_EXTENSIONS = ('.tar.gz', '.tar.xz', '.zip', '.tar.bz2', '.tar.zst')
+
+def fetch_releases(repo: dict) -> list[tuple[str, str, list[dict], str]]:
+    """
+    Versiones publicadas en un repositorio de GitHub (API de releases) que tienen archivos descargables,
+    como (nombre, versión/etiqueta, archivos, fecha de publicación). Lanza HTTPError u OSError si falla.
+    """
+    url = repo["url"]
+    req = Request(url, headers={'User-Agent': 'Mozilla/5.0 WineProtonManager'})
+    with urlopen(req, timeout=10) as response:
+        if response.getcode() != 200:
+            raise HTTPError(url, response.getcode(), response.reason, response.headers, None)
+        releases = json.loads(response.read().decode())
+
+    result = []
+    for release in releases:
+        if release.get("draft", False) or release.get("prerelease", False):
+            continue
+
+        version = release["tag_name"]
+        assets = [a for a in release["assets"] if a["name"].endswith(RELEASE_ARCHIVE_EXTENSIONS)]
+        if not assets:
+            continue
+
+        result.append((release.get("name", version), version, assets, release.get("published_at", "")))
+    return result
+
+class FileDownload:
+    """Descarga un archivo (p. ej. una versión de Wine/Proton). Sin Qt: run() es bloqueante y avisa mediante Event."""
+
+    def __init__(self, url: str, destination_path: Path, name: str, config_manager: ConfigManager, config_name: str):
+        self.progress = Event() # (porcentaje)
+        self.finished = Event() # (ruta del archivo descargado)
+        self.error = Event()    # (mensaje)
+        self.url = url
+        self.destination = destination_path
+        self.name = name
+        self.config_manager = config_manager
+        self.config_name = config_name 
+        self._is_running = True
+
+    def run(self):
+        log_source = f"Download-{self.name}"
+        self.config_manager.write_to_log(self.config_name, log_source, f"Iniciando descarga de {self.url} a {self.destination}")
+        try:
+            req = Request(self.url, headers={'User-Agent': 'Mozilla/5.0'})
+            with urlopen(req, timeout=30) as response:
+                if response.getcode() != 200:
+                    raise HTTPError(self.url, response.getcode(), response.reason, response.headers, None)
+
+                total_size = int(response.headers.get('content-length', 0))
+                downloaded = 0
+                chunk_size = 8192
+
+                free_space = shutil.disk_usage(self.destination.parent).free
+                required_space = total_size * 2 if total_size > 0 else 500 * 1024 * 1024
+
+                if free_space < required_space:
+                    raise IOError(f"Espacio en disco insuficiente en {self.destination.parent}. Requerido: {required_space / (1024*1024):.1f} MB, Disponible: {free_space / (1024*1024):.1f} MB")
+
+                if self.destination.exists():
+                    try:
+                        self.destination.unlink()
+                    except OSError as e:
+                        raise IOError(f"No se pudo eliminar el archivo parcial existente {self.destination}: {e}")
+
+                with open(self.destination, 'wb') as f:
+                    while self._is_running:
+                        chunk = response.read(chunk_size)
+                        if not chunk:
+                            break
+
+                        f.write(chunk)
+                        downloaded += len(chunk)
+
+                        if total_size > 0:
+                            progress = int(downloaded * 100 / total_size)
+                            self.progress.emit(progress)
+
+                if not self._is_running:
+                    if self.destination.exists():
+                        try:
+                            self.destination.unlink()
+                        except OSError:
+                            pass
+                    self.config_manager.write_to_log(self.config_name, log_source, f"Descarga de {self.name} cancelada.")
+                    return
+
+                self.finished.emit(str(self.destination))
+                self.config_manager.write_to_log(self.config_name, log_source, f"Descarga de {self.name} completada.")
+
+        except HTTPError as e:
+            msg = f"Error HTTP descargando {self.url}: {e.code} - {e.reason}"
+            self.config_manager.write_to_log(self.config_name, log_source, f"ERROR: {msg}")
+            self.error.emit(msg)
+        except Exception as e:
+            msg = f"Error inesperado durante la descarga de {self.name}: {str(e)}"
+            self.config_manager.write_to_log(self.config_name, log_source, f"ERROR: {msg}")
+            if self.destination.exists():
+                try:
+                    self.destination.unlink()
+                except OSError:
+                    pass
+            self.error.emit(msg)
+
+    def stop(self):
+        """Detiene la descarga."""
+        self._is_running = False
+
+
+class ArchiveExtraction:
+    """
+    Descomprime una versión descargada junto al archivo (quitando la carpeta raíz si la hay), ajusta
+    permisos y borra el archivo comprimido. Sin Qt: run() es bloqueante y avisa mediante Event.
+    """
+
+    def __init__(self, archive_path: str, config_manager: ConfigManager, name: str, config_name: str):
+        self.finished = Event() # (directorio de destino)
+        self.error = Event()    # (mensaje)
+        self.progress = Event() # (porcentaje)
+        self.archive_path = Path(archive_path)
+        self.config_manager = config_manager
+        self.name = name
+        self.config_name = config_name
+        self.target_dir = None
+        self._is_running = True
+
+    def _set_permissions_recursively(self, path: Path):
+        """Aplica permisos 0o755 (ejecutable para todos) a directorios y archivos específicos, 0o644 a otros archivos."""
+        log_source = f"Decompress-{self.name}"
+        if not path.exists():
+            return
+        try:
+            if path.is_dir():
+                os.chmod(path, 0o755)
+                for item in path.iterdir():
+                    self._set_permissions_recursively(item)
+            elif path.is_file():
+                if "bin" in path.parts or "wine" in path.name.lower() or "wineserver" in path.name.lower():
+                    os.chmod(path, 0o755)
+                else:
+                    os.chmod(path, 0o644)
+        except OSError as e:
+            self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: No se pudieron establecer permisos en {path}: {e}")
+
+    def run(self):
+        log_source = f"Decompress-{self.name}"
+        self.config_manager.write_to_log(self.config_name, log_source, f"Iniciando descompresión de {self.archive_path}")
+        try:
+            if not self.archive_path.exists():
+                raise FileNotFoundError(f"El archivo {self.archive_path} no existe.")
+
+            dest_dir_root = self.archive_path.parent
+            base_name = self.archive_path.stem
+            if self.archive_path.suffix in ['.gz', '.xz', '.zip'] and base_name.endswith('.tar'):
+                base_name = Path(base_name).stem
+            self.target_dir = dest_dir_root / base_name
+
+            if self.target_dir.exists():
+                self.config_manager.write_to_log(self.config_name, log_source, f"El directorio de destino {self.target_dir} ya existe. Eliminando...")
+                shutil.rmtree(self.target_dir)
+
+            with tempfile.TemporaryDirectory(prefix="wpm_decompress_") as temp_unzip_dir_str:
+                temp_unzip_dir = Path(temp_unzip_dir_str)
+                self.config_manager.write_to_log(self.config_name, log_source, f"Descomprimiendo al directorio temporal: {temp_unzip_dir}")
+
+                if self.archive_path.suffix == '.zip':
+                    with zipfile.ZipFile(self.archive_path, 'r') as zip_ref:
+                        zip_ref.extractall(temp_unzip_dir)
+                elif self.archive_path.suffix in ['.gz', '.xz', '.bz2', '.zst'] or self.archive_path.name.endswith(('.tar.gz', '.tar.xz', '.tar.bz2', '.tar.zst')):
+                    mode = "r:" + self.archive_path.suffix[1:]
+                    with tarfile.open(self.archive_path, mode) as tar:
+                        tar.extractall(path=temp_unzip_dir, filter='data')
+                else:
+                    raise ValueError(f"Formato de archivo no compatible para descompresión: {self.archive_path.suffix}")
+
+                extracted_contents = list(temp_unzip_dir.iterdir())
+                source_dir_to_move = extracted_contents[0] if len(extracted_contents) == 1 and extracted_contents[0].is_dir() else temp_unzip_dir
+
+                self.config_manager.write_to_log(self.config_name, log_source, f"Moviendo {source_dir_to_move} a {self.target_dir}")
+                shutil.move(str(source_dir_to_move), str(self.target_dir))
+                self._set_permissions_recursively(self.target_dir)
+
+            try:
+                self.archive_path.unlink()
+                self.config_manager.write_to_log(self.config_name, log_source, f"Archivo comprimido {self.archive_path} eliminado.")
+            except OSError as e:
+                self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: No se pudo eliminar el archivo comprimido {self.archive_path}: {e}")
+
+            self.finished.emit(str(self.target_dir))
+            self.config_manager.write_to_log(self.config_name, log_source, f"Descompresión de {self.name} completada. Ruta: {self.target_dir}")
+
+        except Exception as e:
+            msg = f"Error descomprimiendo {self.name}: {str(e)}"
+            self.config_manager.write_to_log(self.config_name, log_source, f"ERROR: {msg}")
+            if self.target_dir and self.target_dir.exists():
+                try:
+                    shutil.rmtree(self.target_dir, ignore_errors=True)
+                    self.config_manager.write_to_log(self.config_name, log_source, f"Directorio incompleto {self.target_dir} eliminado después del error.")
+                except OSError as cleanup_error:
+                    self.config_manager.write_to_log(self.config_name, log_source, f"Error limpiando {self.target_dir}: {cleanup_error}")
+            self.error.emit(msg)
+
+    def stop(self):
+        self._is_running = False
\ No newline at end of file
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+import time
+
+# Cambiar si cambia la forma de resolver el entorno: invalida todas las instantáneas guardadas
+SNAPSHOT_FORMAT = 1
+
+def config_key(config: dict) -> str:
+    """Huella del contenido de una configuración (cualquier cambio en ella invalida su instantánea)."""
+    return hashlib.sha1(json.dumps(config, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def file_signature(path: str) -> list:
+    """[ruta, mtime_ns, tamaño] de un archivo, o [ruta, -1, -1] si no existe."""
+    try:
+        stat = os.stat(path)
+        return [path, stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return [path, -1, -1]
+
+class EnvironmentSnapshot:
+    """
+    Entorno ya resuelto de una configuración: solo las variables propias de Wine/Proton (prefijo, ejecutables,
+    versiones, Steam, W_CACHE) y el directorio que se antepone al PATH, más la firma (fecha y tamaño) de los
+    archivos de los que se obtuvieron. Mientras la configuración y esas firmas no cambien, se reutiliza sin
+    volver a comprobar rutas, leer el archivo 'version' ni ejecutar 'wine --version'.
+    """
+
+    def __init__(self, variables: dict[str, str], path_prefix: str, checks: list[list], key: str, complete: bool = True):
+        self.variables = variables
+        self.path_prefix = path_prefix
+        self.checks = checks
+        self.key = key
+        self.complete = complete # False si alguna consulta de versión falló: no se guarda para reintentarla
+        self.created = time.time()
+
+    def is_valid(self, key: str) -> bool:
+        """Comprobación barata: misma configuración y mismos archivos (un stat por archivo)."""
+        return self.key == key and all(file_signature(check[0]) == list(check) for check in self.checks)
+
+    def apply(self, base_env) -> dict:
+        """Entorno completo para lanzar procesos: base_env (normalmente os.environ) más las variables resueltas."""
+        env = dict(base_env)
+        env.update(self.variables)
+        if self.path_prefix:
+            env["PATH"] = f"{self.path_prefix}:{base_env.get('PATH', '')}"
+        return env
+
+    def to_dict(self) -> dict:
+        return {"format": SNAPSHOT_FORMAT, "variables": self.variables, "path_prefix": self.path_prefix,
+                "checks": self.checks, "key": self.key, "created": self.created}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EnvironmentSnapshot | None":
+        if not isinstance(data, dict) or data.get("format") != SNAPSHOT_FORMAT:
+            return None
+        try:
+            snapshot = cls(dict(data["variables"]), data["path_prefix"], [list(c) for c in data["checks"]], data["key"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        snapshot.created = data.get("created", 0.0)
+        return snapshot
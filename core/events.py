@@ -0,0 +1,27 @@
+import threading
+
+class Event:
+    """
+    Señal mínima sin Qt para la lógica de core: connect() registra funciones y emit() las llama en el
+    hilo que emite. Los hilos de la interfaz (threads/) conectan cada Event al emit de su pyqtSignal,
+    y la línea de comandos (cli.py) conecta directamente sus funciones de salida.
+    """
+
+    def __init__(self):
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def connect(self, callback):
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def disconnect(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def emit(self, *args):
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(*args)
@@ -0,0 +1,260 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from config_manager import ConfigManager
+from core.env_snapshot import config_key, file_signature
+from core.events import Event
+from core.prefix_index import get_install_index, INDEX_FILENAME, WINETRICKS_LOG_FILENAME
+
+CACHE_VERSION = 1
+CACHE_FILENAME = "health.json"
+# El tamaño del prefijo se vuelve a medir si cambia su firma o, como mucho, una vez al día
+SIZE_MAX_AGE_SECONDS = 24 * 3600
+
+STATUS_OK = "ok"
+STATUS_WARNING = "warning"
+STATUS_ERROR = "error"
+
+REGISTRY_HEADER = "WINE REGISTRY Version"
+
+class HealthCache:
+    """
+    Último informe de estado de cada configuración y tamaño medido de cada prefijo, en memoria y en
+    cache/health.json. Los informes se muestran al abrir el diálogo, antes de que termine el nuevo análisis.
+    """
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self.reports: dict[str, dict] = {}
+        self.sizes: dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.reports = dict(data.get("reports", {}))
+                self.sizes = dict(data.get("sizes", {}))
+        except (OSError, ValueError, AttributeError):
+            self.reports, self.sizes = {}, {}
+
+    def save(self):
+        with self.lock:
+            data = {"version": CACHE_VERSION, "reports": self.reports, "sizes": self.sizes}
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+            except OSError as e:
+                print(f"Error guardando la caché de estado de prefijos {self.cache_file}: {e}")
+
+
+_caches: dict[str, HealthCache] = {}
+_caches_lock = threading.Lock()
+
+def get_health_cache(config_manager: ConfigManager) -> HealthCache:
+    """Caché compartida por todos los análisis (una por directorio de configuración)."""
+    cache_file = config_manager.config_dir / "cache" / CACHE_FILENAME
+    with _caches_lock:
+        cache = _caches.get(str(cache_file))
+        if cache is None:
+            cache = _caches[str(cache_file)] = HealthCache(cache_file)
+        return cache
+
+
+class HealthScanner:
+    """
+    Comprueba en paralelo (con un número limitado de hilos) el estado de las configuraciones: que los
+    ejecutables de Wine/Proton existen y responden a 'wine --version', que el prefijo existe y tiene un
+    system.reg válido de la arquitectura configurada, su tamaño y la fecha de la última instalación.
+    Lo barato se comprueba siempre; el tamaño (recorrer el prefijo) solo se vuelve a medir si cambian
+    los registros, el índice de instalación o drive_c. Sin Qt: run() es bloqueante y avisa mediante Event.
+    """
+
+    def __init__(self, config_manager: ConfigManager, max_workers: int = 4):
+        self.config_manager = config_manager
+        self.max_workers = max(1, max_workers)
+        self.cache = get_health_cache(config_manager)
+        self.report_ready = Event() # (configuración, informe)
+        self.finished = Event()     # (resumen)
+        self._is_running = True
+
+    def cached_reports(self) -> dict[str, dict]:
+        with self.cache.lock:
+            return dict(self.cache.reports)
+
+    def run(self, config_names: list[str] | None = None):
+        """Analiza las configuraciones indicadas (todas si no se indica ninguna)."""
+        configs = self.config_manager.configs.get("configs", {})
+        names = [name for name in (config_names if config_names is not None else list(configs)) if name in configs]
+        summary = {STATUS_OK: 0, STATUS_WARNING: 0, STATUS_ERROR: 0, "canceled": False}
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.check_config, name): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    report = future.result()
+                except Exception as e:
+                    report = self._report(STATUS_ERROR, [f"Error inesperado al comprobar la configuración: {e}"])
+                if report is None: # Cancelado
+                    continue
+                with self.cache.lock:
+                    self.cache.reports[name] = report
+                summary[report["status"]] += 1
+                self.report_ready.emit(name, report)
+        summary["canceled"] = not self._is_running
+        with self.cache.lock:
+            for name in list(self.cache.reports):
+                if name not in configs:
+                    del self.cache.reports[name]
+        self.cache.save()
+        self.config_manager.write_to_log("wineprotonmanager", "Health",
+                                         f"Estado de {len(names)} configuración(es) comprobado en {time.monotonic() - start:.1f} s: "
+                                         f"{summary[STATUS_OK]} correcta(s), {summary[STATUS_WARNING]} con avisos, {summary[STATUS_ERROR]} con errores.")
+        self.finished.emit(summary)
+
+    def stop(self):
+        self._is_running = False
+
+    def check_config(self, config_name: str) -> dict | None:
+        config = self.config_manager.get_config(config_name)
+        if not config:
+            return self._report(STATUS_ERROR, ["Configuración no encontrada o corrupta."])
+        if not self._is_running:
+            return None
+
+        issues: list[str] = []
+        warnings: list[str] = []
+        prefix = config.get("prefix", "")
+        version = None
+        try:
+            snapshot = self.config_manager.get_environment_snapshot(config_name, config)
+        except (FileNotFoundError, KeyError, ValueError) as e:
+            issues.append(f"Ejecutables no disponibles: {e}")
+        else:
+            variables = snapshot.variables
+            prefix = variables.get("WINEPREFIX", prefix)
+            version = variables.get("PROTON_VERSION") or variables.get("WINE_VERSION")
+            wineserver = variables.get("WINESERVER", "")
+            if os.path.isabs(wineserver) and not os.path.isfile(wineserver):
+                issues.append(f"No se encuentra wineserver: {wineserver}")
+            if not snapshot.complete:
+                issues.append(f"'{variables.get('WINE', 'wine')} --version' no responde: la compilación no se puede ejecutar.")
+
+        prefix_path = Path(prefix) if prefix else None
+        size = None
+        last_install = None
+        if not prefix_path or not prefix_path.is_dir():
+            issues.append(f"El prefijo no existe: {prefix or 'no especificado'}")
+        else:
+            registry_issue, registry_warning = self._check_registry(prefix_path, config.get("arch", "win64"))
+            if registry_issue:
+                issues.append(registry_issue)
+            if registry_warning:
+                warnings.append(registry_warning)
+            last_install = self._last_install(prefix_path)
+            size = self._prefix_size(prefix_path)
+            if size is None and not self._is_running:
+                return None
+
+        status = STATUS_ERROR if issues else STATUS_WARNING if warnings else STATUS_OK
+        report = self._report(status, issues + warnings)
+        report.update({"version": version, "prefix": str(prefix), "prefix_size": size,
+                       "last_install": last_install, "config_key": config_key(config)})
+        return report
+
+    @staticmethod
+    def _report(status: str, issues: list[str]) -> dict:
+        return {"status": status, "issues": issues, "version": None, "prefix": "", "prefix_size": None,
+                "last_install": None, "checked_at": time.time()}
+
+    @staticmethod
+    def _check_registry(prefix_path: Path, arch: str) -> tuple[str | None, str | None]:
+        """Devuelve (error, aviso) sobre el system.reg del prefijo."""
+        system_reg = prefix_path / "system.reg"
+        try:
+            with open(system_reg, 'r', encoding='utf-8', errors='ignore') as f:
+                header = [f.readline().strip() for _ in range(5)]
+        except OSError:
+            return f"El prefijo no está inicializado: falta {system_reg.name}.", None
+        if not header[0].startswith(REGISTRY_HEADER):
+            return f"{system_reg.name} está dañado (cabecera no reconocida).", None
+        prefix_arch = next((line.split("=", 1)[1] for line in header if line.startswith("#arch=")), None)
+        if prefix_arch and prefix_arch != arch:
+            return None, f"El prefijo es {prefix_arch} pero la configuración usa {arch}."
+        return None, None
+
+    @staticmethod
+    def _last_install(prefix_path: Path) -> str | None:
+        index = get_install_index(prefix_path)
+        dates = [item.get("installed_at") for item in index.items.values() if item.get("installed_at")]
+        if dates:
+            return max(dates)
+        try:
+            # Verbos instalados con winetricks fuera del gestor: solo queda la fecha de su registro
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime((prefix_path / WINETRICKS_LOG_FILENAME).stat().st_mtime))
+        except OSError:
+            return None
+
+    def _prefix_size(self, prefix_path: Path) -> int | None:
+        """Tamaño del prefijo, desde la caché si su firma no ha cambiado. None si se cancela."""
+        key = os.path.realpath(prefix_path)
+        signature = [file_signature(str(prefix_path / name)) for name in ("system.reg", "user.reg", INDEX_FILENAME, WINETRICKS_LOG_FILENAME)]
+        drive_c = prefix_path / "drive_c"
+        for directory in (drive_c, drive_c / "Program Files", drive_c / "Program Files (x86)", drive_c / "users"):
+            try:
+                signature.append([str(directory), directory.stat().st_mtime_ns])
+            except OSError:
+                signature.append([str(directory), -1])
+
+        with self.cache.lock:
+            cached = self.cache.sizes.get(key)
+        if cached and cached.get("signature") == signature and time.time() - cached.get("measured_at", 0) < SIZE_MAX_AGE_SECONDS:
+            return cached["size"]
+
+        size = self._directory_size(key)
+        if size is not None:
+            with self.cache.lock:
+                self.cache.sizes[key] = {"signature": signature, "size": size, "measured_at": time.time()}
+        return size
+
+    def _directory_size(self, path: str) -> int | None:
+        """Suma el tamaño de los archivos sin seguir enlaces simbólicos (dosdevices apunta a la raíz)."""
+        total = 0
+        pending = [path]
+        while pending:
+            if not self._is_running:
+                return None
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return total
+
+
+def format_size(size: int | None) -> str:
+    if size is None:
+        return "desconocido"
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
@@ -0,0 +1,124 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from config_manager import ConfigManager
+from core.events import Event
+from core.installer import BatchInstaller
+from core.prefetch import WinetricksPrefetch
+
+class InstallRunner:
+    """
+    Equivalente sin Qt de InstallScheduler para la línea de comandos: ejecuta los trabajos de varias
+    configuraciones con un límite global de concurrencia, de uno en uno los que comparten prefijo
+    (y por tanto wineserver). run() es bloqueante y devuelve el resumen de todos los trabajos.
+    """
+
+    def __init__(self, config_manager: ConfigManager, max_concurrent: int = 2):
+        self.config_manager = config_manager
+        self.max_concurrent = max(1, max_concurrent)
+        self.job_started = Event()        # (configuración)
+        self.job_progress = Event()       # (configuración, elemento, estado)
+        self.job_item_error = Event()     # (configuración, elemento, mensaje)
+        self.job_error = Event()          # (configuración, mensaje)
+        self.job_console_output = Event() # (configuración, líneas)
+        self.job_finished = Event()       # (configuración, resumen del lote)
+        self.prefetch_progress = Event()  # (mensaje)
+        self._jobs: dict[str, BatchInstaller] = {}
+        self._summaries: dict[str, dict] = {}
+        self._prefetch: WinetricksPrefetch | None = None
+        self._lock = threading.Lock()
+        self._canceled = False
+
+    def add_job(self, config_name: str, items: list[tuple[str, str, str]], env: dict,
+                silent_mode: bool, force_mode: bool, winetricks_path: str):
+        if config_name in self._jobs:
+            raise ValueError(f"Ya existe un trabajo de instalación para la configuración '{config_name}'.")
+        installer = BatchInstaller(items, env, silent_mode, force_mode, winetricks_path, self.config_manager, config_name)
+        installer.progress.connect(lambda name, status, c=config_name: self.job_progress.emit(c, name, status))
+        installer.item_error.connect(lambda name, msg, c=config_name: self.job_item_error.emit(c, name, msg))
+        installer.error.connect(lambda msg, c=config_name: self.job_error.emit(c, msg))
+        installer.console_output.connect(lambda lines, c=config_name: self.job_console_output.emit(c, lines))
+        installer.batch_completed.connect(lambda summary, c=config_name: self._on_job_completed(c, summary))
+        self._jobs[config_name] = installer
+
+    def set_prefetch(self, verbs: set[str], winetricks_path: str):
+        """Antes de instalar, descarga en paralelo a la caché W_CACHE lo que necesitan estos verbos de winetricks."""
+        if verbs:
+            self._prefetch = WinetricksPrefetch(verbs, winetricks_path, self.config_manager)
+            self._prefetch.progress.connect(self.prefetch_progress.emit)
+
+    def run(self) -> dict:
+        """Ejecuta la precarga y los trabajos. Con Ctrl+C cancela todo, espera a que se detengan y relanza la interrupción."""
+        self.config_manager.write_to_log("wineprotonmanager", "Scheduler", f"Iniciando {len(self._jobs)} trabajo(s) de instalación (máximo {self.max_concurrent} en paralelo).")
+        # Un grupo por prefijo: sus trabajos se ejecutan seguidos en el mismo hilo
+        groups: dict[str, list[str]] = {}
+        for config_name, installer in self._jobs.items():
+            groups.setdefault(os.path.realpath(installer.env.get("WINEPREFIX", "")), []).append(config_name)
+
+        prefetch_thread = None
+        try:
+            if self._prefetch:
+                prefetch_thread = threading.Thread(target=self._prefetch.run, daemon=True)
+                prefetch_thread.start()
+                self._join(prefetch_thread)
+            with ThreadPoolExecutor(max_workers=self.max_concurrent) as pool:
+                futures = [pool.submit(self._run_group, names) for names in groups.values()]
+                try:
+                    for future in futures:
+                        self._join(future)
+                except KeyboardInterrupt:
+                    self.cancel_all() # Antes de salir del bloque, que espera a los hilos del pool
+                    raise
+        except KeyboardInterrupt:
+            self.cancel_all()
+            if prefetch_thread:
+                self._join(prefetch_thread)
+            raise
+        return self.summary()
+
+    @staticmethod
+    def _join(task):
+        """Espera a un hilo o a un Future en intervalos cortos, para que Ctrl+C llegue al hilo principal."""
+        if isinstance(task, threading.Thread):
+            while task.is_alive():
+                task.join(0.2)
+            return
+        while True:
+            try:
+                return task.result(timeout=0.2)
+            except FutureTimeoutError:
+                continue
+
+    def _run_group(self, config_names: list[str]):
+        for config_name in config_names:
+            if self._canceled:
+                self._on_job_completed(config_name, {"installed": 0, "failed": 0, "canceled": True, "error": None, "duration": 0.0, "timings": []})
+                continue
+            self.job_started.emit(config_name)
+            self._jobs[config_name].run()
+
+    def _on_job_completed(self, config_name: str, summary: dict):
+        with self._lock:
+            self._summaries[config_name] = summary
+        self.config_manager.write_to_log(config_name, "Scheduler", f"Trabajo de instalación terminado en {summary['duration']:.1f} s: {summary['installed']} instalado(s), {summary['failed']} con error.")
+        self.job_finished.emit(config_name, summary)
+
+    def cancel_all(self):
+        """Cancela los trabajos en cola y detiene los que están en curso (p. ej. con Ctrl+C)."""
+        self._canceled = True
+        if self._prefetch:
+            self._prefetch.stop()
+        for installer in self._jobs.values():
+            installer.stop()
+
+    def summary(self) -> dict:
+        with self._lock:
+            jobs = dict(self._summaries)
+        return {
+            "jobs": jobs,
+            "installed": sum(j["installed"] for j in jobs.values()),
+            "failed": sum(j["failed"] for j in jobs.values()),
+            "errors": sum(1 for j in jobs.values() if j.get("error")),
+            "canceled": self._canceled or any(j.get("canceled") for j in jobs.values()),
+        }
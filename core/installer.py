@@ -0,0 +1,428 @@
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+from config_manager import ConfigManager
+from core.events import Event
+from core.prefix_index import PrefixInstallIndex
+from core.process_runner import ProcessRunner
+
+WINETRICKS_LOAD_RE = re.compile(r"^Executing load_(\S+)")
+WINETRICKS_SKIP_RE = re.compile(r"^(\S+) already installed, skipping")
+
+class BatchInstaller:
+    """
+    Instala una lista de elementos (componentes y scripts de winetricks, ejecutables) en un prefijo,
+    con un wineserver compartido por todo el lote. No depende de Qt: informa del avance mediante Event
+    (InstallerThread los reenvía como señales y la línea de comandos los imprime). run() es bloqueante.
+    """
+    # Segundos que el wineserver del lote sigue vivo sin clientes: cubre el hueco entre elementos
+    WINESERVER_PERSISTENCE_SECONDS = 10
+    WINESERVER_DRAIN_TIMEOUT = 120
+    # Últimas líneas de salida que se conservan para los informes de error
+    ERROR_TAIL_LINES = 200
+    # La salida de consola se envía a la interfaz en lotes: como mucho cada intervalo o cada N líneas
+    CONSOLE_BATCH_INTERVAL = 0.1
+    CONSOLE_BATCH_MAX_LINES = 500
+    # En modo silencioso, segundos sin ninguna salida tras los que se considera colgado el instalador
+    INSTALL_STALL_TIMEOUT = 900
+
+    def __init__(self, items_to_install: list[tuple[str, str, str]], env: dict, silent_mode: bool, force_mode: bool, winetricks_path: str, config_manager: ConfigManager, config_name: str):
+        self.progress = Event()        # (elemento, estado)
+        self.finished = Event()        # ()
+        self.error = Event()           # (mensaje)
+        self.item_error = Event()      # (elemento, mensaje)
+        self.canceled = Event()        # (elemento)
+        self.console_output = Event()  # (lista de líneas)
+        self.batch_completed = Event() # (resumen)
+        self.items_to_install = items_to_install
+        self.env = env
+        self.silent_mode = silent_mode
+        self.force_mode = force_mode
+        self.winetricks_path = winetricks_path
+        self.config_manager = config_manager
+        self.config_name = config_name
+        self._is_running = True
+        self.current_runner: ProcessRunner | None = None
+        self._wineserver_session = False
+        self.wineserver_startup_time: float | None = None
+        self.item_timings: list[tuple[str, float, bool]] = []
+
+    def run(self):
+        """
+        Ejecuta la cola de instalación. Al terminar (con éxito, error global o cancelación)
+        siempre emite batch_completed con un resumen del lote.
+        """
+        start_time = time.monotonic()
+        summary = {"installed": 0, "failed": 0, "canceled": False, "error": None, "duration": 0.0, "timings": []}
+        clean_exit = False
+        try:
+            self._run_items(summary)
+            clean_exit = True
+        finally:
+            summary["canceled"] = summary["canceled"] or not self._is_running
+            self._end_wineserver_session(drain=clean_exit and not summary["canceled"])
+            summary["duration"] = time.monotonic() - start_time
+            summary["timings"] = list(self.item_timings)
+            self._log_timing_summary(summary["duration"])
+            self.batch_completed.emit(summary)
+
+    def _run_items(self, summary: dict):
+        try:
+            wine_executable = self.env.get("WINE")
+            if not wine_executable or not Path(wine_executable).is_file():
+                summary["error"] = f"Ejecutable de Wine/Proton no encontrado o no ejecutable: {wine_executable}"
+                self.error.emit(summary["error"])
+                return
+            if any(item[1] in ["winetricks", "wtr"] for item in self.items_to_install):
+                winetricks_executable = self.winetricks_path
+                if not Path(winetricks_executable).is_file() and winetricks_executable != "winetricks":
+                    summary["error"] = f"Ejecutable de Winetricks no encontrado o no ejecutable: {winetricks_executable}"
+                    self.error.emit(summary["error"])
+                    return
+        except EnvironmentError as e:
+            summary["error"] = str(e)
+            self.error.emit(str(e))
+            return
+
+        if not self.items_to_install:
+            return # Todo lo de la lista se descartó al planificar
+
+        self._start_wineserver_session()
+
+        for step in self._plan_install_steps():
+            if not self._is_running:
+                summary["canceled"] = True
+                self.canceled.emit(step[0][2])
+                break
+            if step[0][1] == "winetricks":
+                self._run_winetricks_group(step, summary)
+            else:
+                self._run_single_item(step[0], summary)
+
+        if self._is_running:
+            self.finished.emit()
+
+    def _plan_install_steps(self) -> list[list[tuple[str, str, str]]]:
+        """
+        Agrupa los componentes winetricks consecutivos en un único paso (una sola llamada a winetricks);
+        el resto de elementos se ejecutan uno a uno y conservan el orden de la lista.
+        """
+        steps: list[list[tuple[str, str, str]]] = []
+        for item in self.items_to_install:
+            if item[1] == "winetricks" and steps and steps[-1][0][1] == "winetricks":
+                steps[-1].append(item)
+            else:
+                steps.append([item])
+        return steps
+
+    def _run_single_item(self, item: tuple[str, str, str], summary: dict):
+        item_path_or_name, item_type, display_name_for_progress = item
+        log_source = f"Install-{display_name_for_progress}"
+
+        self.progress.emit(display_name_for_progress, "Instalando")
+        self.config_manager.write_to_log(self.config_name, log_source, f"Iniciando instalación: {item_path_or_name} (Tipo: {item_type}, Silencioso: {self.silent_mode}, Forzado: {self.force_mode})")
+
+        item_start_time = time.monotonic()
+        item_ok = False
+        try:
+            if item_type == "exe":
+                self._install_exe(item_path_or_name, display_name_for_progress)
+            elif item_type == "wtr":
+                self._install_winetricks_script(item_path_or_name, display_name_for_progress)
+            else:
+                raise ValueError(f"Tipo de instalación no reconocido: {item_type}")
+
+            self._mark_item_installed(display_name_for_progress, item_type, item_path_or_name, summary, time.monotonic() - item_start_time)
+            item_ok = True
+        except Exception as e:
+            if not self._is_running:
+                self._mark_item_canceled(display_name_for_progress, summary)
+            else:
+                self._mark_item_failed(display_name_for_progress, self._format_install_error(display_name_for_progress, e), summary)
+        finally:
+            item_duration = time.monotonic() - item_start_time
+            self.item_timings.append((display_name_for_progress, item_duration, item_ok))
+            self.config_manager.write_to_log(self.config_name, log_source, f"Duración de {display_name_for_progress}: {item_duration:.1f} s")
+
+    def _run_winetricks_group(self, items: list[tuple[str, str, str]], summary: dict):
+        """
+        Instala varios componentes winetricks con una sola invocación. El estado de cada verbo se recupera de la
+        salida ("Executing load_<verbo>", "<verbo> already installed") y de las líneas nuevas de winetricks.log.
+        Winetricks se detiene en el primer verbo que falla: ese se marca como error y el resto se reintenta
+        en una nueva invocación, igual que si se hubieran instalado por separado. Si se cancela durante la
+        llamada, el verbo en curso y los siguientes se marcan como cancelados (no cuentan como errores).
+        """
+        pending = list(items)
+        while pending:
+            if not self._is_running:
+                return
+            verbs = [verb for verb, _, _ in pending]
+            names_by_verb = {verb: name for verb, _, name in pending}
+            log_source = "Install-winetricks"
+            self.config_manager.write_to_log(self.config_name, log_source, f"Iniciando instalación agrupada de {len(verbs)} componente(s): {' '.join(verbs)} (Silencioso: {self.silent_mode}, Forzado: {self.force_mode})")
+
+            verb_started_at: dict[str, float] = {}
+            skipped_verbs: set[str] = set()
+
+            def track_verb(line: str):
+                match = WINETRICKS_LOAD_RE.match(line)
+                if match and match.group(1) in names_by_verb and match.group(1) not in verb_started_at:
+                    verb_started_at[match.group(1)] = time.monotonic()
+                    if match.group(1) != verbs[0]: # El primero ya se marcó al lanzar el grupo
+                        self.progress.emit(names_by_verb[match.group(1)], "Instalando")
+                    return
+                match = WINETRICKS_SKIP_RE.match(line)
+                if match and match.group(1) in names_by_verb:
+                    skipped_verbs.add(match.group(1))
+
+            self.progress.emit(pending[0][2], "Instalando")
+            installed_before = self._read_prefix_winetricks_log()
+            group_start_time = time.monotonic()
+            group_error = None
+            try:
+                self._install_winetricks(verbs, "winetricks", line_callback=track_verb)
+            except Exception as e:
+                group_error = e
+            group_end_time = time.monotonic()
+
+            installed_after = self._read_prefix_winetricks_log()
+            completed_verbs = set(installed_after[len(installed_before):]) | skipped_verbs
+            if group_error is None:
+                completed_verbs.update(verbs)
+
+            # Tiempo por verbo: desde su "load_" hasta el siguiente verbo de la lista o el final del grupo
+            ordered_starts = sorted(verb_started_at.items(), key=lambda kv: kv[1])
+            verb_durations = {
+                verb: (ordered_starts[i + 1][1] if i + 1 < len(ordered_starts) else group_end_time) - started
+                for i, (verb, started) in enumerate(ordered_starts)
+            }
+            if ordered_starts:
+                first_verb = ordered_starts[0][0]
+                verb_durations[first_verb] += ordered_starts[0][1] - group_start_time
+
+            remaining: list[tuple[str, str, str]] = []
+            failure_recorded = False
+            canceled = not self._is_running
+            for verb, item_type, name in pending:
+                if verb in completed_verbs:
+                    self._mark_item_installed(name, item_type, verb, summary, verb_durations.get(verb))
+                    self.item_timings.append((name, verb_durations.get(verb, 0.0), True))
+                elif canceled:
+                    self._mark_item_canceled(name, summary)
+                elif not failure_recorded:
+                    failure_recorded = True
+                    self._mark_item_failed(name, self._format_install_error(name, group_error), summary)
+                    self.item_timings.append((name, verb_durations.get(verb, group_end_time - group_start_time), False))
+                else:
+                    remaining.append((verb, item_type, name))
+
+            self.config_manager.write_to_log(self.config_name, log_source, f"Duración de la instalación agrupada ({' '.join(verbs)}): {group_end_time - group_start_time:.1f} s")
+            if remaining:
+                self.config_manager.write_to_log(self.config_name, log_source, f"Reintentando los componentes restantes: {' '.join(verb for verb, _, _ in remaining)}")
+            pending = remaining
+
+    def _read_prefix_winetricks_log(self) -> list[str]:
+        """Devuelve los verbos registrados por winetricks en el winetricks.log del prefijo, en orden."""
+        log_file = Path(self.env.get("WINEPREFIX", "")) / "winetricks.log"
+        try:
+            with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+                return [line.strip() for line in f if line.strip()]
+        except OSError:
+            return []
+
+    def _mark_item_installed(self, display_name: str, item_type: str, original_path_or_name: str, summary: dict, duration: float | None = None):
+        self._register_successful_installation(display_name, item_type, original_path_or_name, duration)
+        summary["installed"] += 1
+        self.progress.emit(display_name, "Finalizado")
+        self.config_manager.write_to_log(self.config_name, f"Install-{display_name}", f"Instalación de {display_name} completada exitosamente.")
+
+    def _mark_item_canceled(self, display_name: str, summary: dict):
+        summary["canceled"] = True
+        self.progress.emit(display_name, "Cancelado")
+        self.config_manager.write_to_log(self.config_name, f"Install-{display_name}", f"Instalación de {display_name} cancelada por el usuario.")
+
+    def _mark_item_failed(self, display_name: str, error_msg: str, summary: dict):
+        summary["failed"] += 1
+        self.config_manager.write_to_log(self.config_name, f"Install-{display_name}", f"ERROR: DURANTE LA INSTALACIÓN: {error_msg}")
+        self.progress.emit(display_name, "Error")
+        self.item_error.emit(display_name, error_msg)
+
+    def _format_install_error(self, display_name: str, e: Exception | None) -> str:
+        error_msg = f"Comando fallido para {display_name}. Detalles:\n"
+        if isinstance(e, subprocess.CalledProcessError):
+            error_msg += f"Comando: {' '.join(e.cmd)}\nCódigo de Salida: {e.returncode}\nSalida/Error: {e.output or e.stderr}"
+        elif e is not None:
+            error_msg += str(e)
+        else:
+            error_msg += "Winetricks terminó sin registrar este componente."
+        return error_msg
+
+    def _start_wineserver_session(self):
+        """
+        Arranca un wineserver persistente para el WINEPREFIX del lote, de modo que todos los elementos
+        reutilicen el mismo servidor en lugar de pagar su arranque y apagado en cada proceso.
+        """
+        log_source = "Wineserver"
+        wineserver_executable = self.env.get("WINESERVER", "wineserver")
+        if not Path(wineserver_executable).is_file() and not shutil.which(wineserver_executable):
+            self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: wineserver no encontrado ({wineserver_executable}). Cada elemento arrancará su propio servidor.")
+            return
+
+        start_time = time.monotonic()
+        try:
+            subprocess.run(
+                [wineserver_executable, f"-p{self.WINESERVER_PERSISTENCE_SECONDS}"], env=self.env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: No se pudo iniciar el wineserver persistente: {e}")
+            return
+
+        self._wineserver_session = True
+        self.wineserver_startup_time = time.monotonic() - start_time
+        self.config_manager.write_to_log(self.config_name, log_source, f"Wineserver persistente iniciado para {self.env.get('WINEPREFIX')} en {self.wineserver_startup_time:.2f} s.")
+
+    def _end_wineserver_session(self, drain: bool):
+        """
+        Cierra el wineserver del lote. En un final normal espera a que terminen sus clientes (wineserver -w);
+        tras una cancelación, un error o si el drenado agota el tiempo, lo detiene (wineserver -k).
+        """
+        if not self._wineserver_session:
+            return
+        self._wineserver_session = False
+        log_source = "Wineserver"
+        wineserver_executable = self.env.get("WINESERVER", "wineserver")
+
+        if drain:
+            try:
+                subprocess.run([wineserver_executable, "-w"], env=self.env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, timeout=self.WINESERVER_DRAIN_TIMEOUT)
+                self.config_manager.write_to_log(self.config_name, log_source, "Wineserver drenado y finalizado correctamente.")
+                return
+            except subprocess.TimeoutExpired:
+                self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: El wineserver no terminó en {self.WINESERVER_DRAIN_TIMEOUT} s. Forzando su cierre.")
+            except OSError as e:
+                self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: No se pudo drenar el wineserver: {e}")
+
+        try:
+            subprocess.run([wineserver_executable, "-k"], env=self.env, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=30)
+            self.config_manager.write_to_log(self.config_name, log_source, "Wineserver detenido (wineserver -k).")
+        except (OSError, subprocess.SubprocessError) as e:
+            self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: No se pudo detener el wineserver: {e}")
+
+    def _log_timing_summary(self, total_duration: float):
+        """Escribe en el log los tiempos por elemento y el ahorro estimado del wineserver compartido."""
+        if not self.item_timings:
+            return
+        lines = [f"  {name}: {duration:.1f} s ({'OK' if ok else 'Error'})" for name, duration, ok in self.item_timings]
+        message = f"Tiempos del lote ({total_duration:.1f} s en total):\n" + "\n".join(lines)
+        if self.wineserver_startup_time is not None and len(self.item_timings) > 1:
+            saved = self.wineserver_startup_time * (len(self.item_timings) - 1)
+            message += (f"\n  Arranque de wineserver: {self.wineserver_startup_time:.2f} s, reutilizado en {len(self.item_timings)} elementos "
+                        f"(ahorro estimado: {saved:.1f} s, sin contar actualizaciones del prefijo evitadas).")
+        self.config_manager.write_to_log(self.config_name, "Timings", message)
+
+    def _install_exe(self, exe_path: str, display_name: str):
+        exe_path = Path(exe_path)
+        if not exe_path.exists():
+            raise FileNotFoundError(f"El archivo EXE no existe: {exe_path}")
+        wine_executable = self.env.get("WINE")
+        if not wine_executable or not Path(wine_executable).is_file():
+            raise FileNotFoundError(f"Ejecutable de Wine no encontrado en el entorno: {wine_executable}")
+        cmd = [wine_executable, str(exe_path)]
+        self.config_manager.write_to_log(self.config_name, f"Install-{display_name}", f"Comando EXE: {' '.join(cmd)}")
+        self._execute_command_and_capture_output(cmd, display_name)
+
+    def _install_winetricks(self, component_names: list[str], display_name: str, line_callback=None):
+        winetricks_executable = self.winetricks_path
+        if not Path(winetricks_executable).is_file() and winetricks_executable != "winetricks":
+            raise FileNotFoundError(f"Ejecutable de Winetricks no encontrado: {winetricks_executable}")
+        silent_flag = "-q" if self.silent_mode else ""
+        force_flag = "--force" if self.force_mode else ""
+        cmd = [c for c in [winetricks_executable, silent_flag, force_flag, *component_names] if c]
+        self.config_manager.write_to_log(self.config_name, f"Install-{display_name}", f"Comando Winetricks: {' '.join(cmd)}")
+        self._execute_command_and_capture_output(cmd, display_name, line_callback)
+
+    def _install_winetricks_script(self, script_path: str, display_name: str):
+        script_path = Path(script_path)
+        if not script_path.exists():
+            raise FileNotFoundError(f"El archivo de script de Winetricks no existe: {script_path}")
+        winetricks_executable = self.winetricks_path
+        if not Path(winetricks_executable).is_file() and winetricks_executable != "winetricks":
+            raise FileNotFoundError(f"Ejecutable de Winetricks no encontrado: {winetricks_executable}")
+        silent_flag = "-q" if self.silent_mode else ""
+        force_flag = "--force" if self.force_mode else ""
+        cmd = [c for c in [winetricks_executable, silent_flag, force_flag, str(script_path)] if c]
+        self.config_manager.write_to_log(self.config_name, f"Install-{display_name}", f"Comando de script Winetricks: {' '.join(cmd)}")
+        self._execute_command_and_capture_output(cmd, display_name)
+
+    def _execute_command_and_capture_output(self, cmd: list[str], display_name: str, line_callback=None):
+        """
+        Ejecuta el comando volcando su salida línea a línea al log de la configuración.
+        Solo se conservan en memoria las últimas líneas, que se usan en el informe de error.
+        Si se indica line_callback, se llama con cada línea (sin saltos) según se lee.
+        """
+        log_source = f"Process-{display_name}"
+        pending_console_lines: list[str] = []
+
+        def flush_console_output():
+            nonlocal pending_console_lines
+            if pending_console_lines:
+                self.console_output.emit(pending_console_lines)
+                pending_console_lines = []
+
+        self.config_manager.write_to_log(self.config_name, log_source, "=== INICIO DEL LOG DEL PROCESO ===")
+        runner = ProcessRunner(
+            cmd, env=self.env, tail_lines=self.ERROR_TAIL_LINES,
+            # Sin modo silencioso el instalador puede estar esperando al usuario: no cortar por falta de salida
+            stall_timeout=self.INSTALL_STALL_TIMEOUT if self.silent_mode else None
+        )
+        self.current_runner = runner
+        if not self._is_running:
+            runner.cancel()
+        try:
+            with self.config_manager.open_log_stream(self.config_name) as log_stream:
+                def on_line(line: str):
+                    log_stream.write(line)
+                    pending_console_lines.append(line.strip())
+                    if line_callback:
+                        line_callback(line.strip())
+                    if len(pending_console_lines) >= self.CONSOLE_BATCH_MAX_LINES:
+                        flush_console_output()
+
+                result = runner.run(on_line, idle_callback=flush_console_output, idle_interval=self.CONSOLE_BATCH_INTERVAL)
+        except OSError as e:
+            raise Exception(f"Error inesperado al ejecutar comando: {str(e)}")
+        finally:
+            self.current_runner = None
+
+        self.config_manager.write_to_log(self.config_name, log_source, f"Código de retorno del proceso: {result.returncode}")
+        self.config_manager.write_to_log(self.config_name, log_source, f"Proceso terminado: {result.describe()}")
+        self.config_manager.write_to_log(self.config_name, log_source, "=== FIN DEL LOG DEL PROCESO ===\n")
+
+        if result.canceled:
+            raise Exception("La instalación fue cancelada por el usuario.")
+        if result.timed_out == "stall":
+            raise Exception(f"El comando de instalación no produjo salida durante {self.INSTALL_STALL_TIMEOUT} s y se detuvo.\n{result.output}")
+        if result.timed_out:
+            raise Exception("El comando de instalación agotó el tiempo de espera.")
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd, output=result.output)
+
+    def _register_successful_installation(self, display_name: str, item_type: str, original_path_or_name: str, duration: float | None = None):
+        install_index = PrefixInstallIndex(self.env["WINEPREFIX"]).load()
+        try:
+            install_index.record(display_name, item_type, original_path_or_name, duration)
+            install_index.save()
+        except OSError as e:
+            self.config_manager.write_to_log(self.config_name, f"Install-{display_name}", f"Advertencia: No se pudo escribir en el índice del prefijo {install_index.index_file}: {e}")
+
+    def stop(self):
+        self._is_running = False
+        runner = self.current_runner
+        if runner:
+            runner.cancel() # El hilo de instalación mata el grupo de procesos al despertar
@@ -0,0 +1,240 @@
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from pathlib import Path
+
+# Líneas de write_to_log: "[fecha] [origen] mensaje". El origen se agrupa por familia (Install-x -> Install).
+# Se busca a partir del salto de línea anterior (más rápido que '^' con MULTILINE)
+TAG_RE = re.compile(rb"\n\[[^\]\n]*\] \[([^\]\n]*)\]")
+FIRST_LINE_TAG_RE = re.compile(rb"\[[^\]\n]*\] \[([^\]\n]*)\]")
+SEARCH_WINDOW_SIZE = 4 * 1024 * 1024
+INDEX_CHUNK_SIZE = 16 * 1024 * 1024
+
+def tag_family(tag: str) -> str:
+    return tag.split("-", 1)[0].strip() or tag
+
+def search_pattern(text: str, case_sensitive: bool) -> tuple[re.Pattern, int]:
+    """
+    Patrón de bytes (UTF-8) para buscar text en el mapa, y la longitud máxima de una coincidencia.
+    re.IGNORECASE sobre bytes solo iguala letras ASCII: para el resto ("ó" y "Ó") se alternan sus
+    formas en minúscula y mayúscula.
+    """
+    if case_sensitive:
+        encoded = text.encode('utf-8')
+        return re.compile(re.escape(encoded)), len(encoded)
+    parts = []
+    max_length = 0
+    for char in text:
+        if char.isascii():
+            parts.append(re.escape(char.encode('utf-8')))
+            max_length += 1
+            continue
+        variants = sorted({char, char.lower(), char.upper()}, key=len, reverse=True)
+        encoded_variants = [variant.encode('utf-8') for variant in variants]
+        parts.append(b"(?:" + b"|".join(re.escape(variant) for variant in encoded_variants) + b")")
+        max_length += max(len(variant) for variant in encoded_variants)
+    return re.compile(b"".join(parts), re.IGNORECASE), max_length
+
+
+class LogIndex:
+    """
+    Índice de líneas de un archivo de log sobre mmap: guarda solo el desplazamiento de inicio de cada
+    línea (array de enteros) y las posiciones de las etiquetas [origen], de modo que el texto se lee del
+    mapa bajo demanda y nunca se carga entero en memoria. Las búsquedas recorren el mapa con expresiones
+    regulares de bytes. Las líneas sin etiqueta (p. ej. la salida de un proceso) pertenecen al origen
+    de la última línea etiquetada anterior.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.size = 0
+        self.line_offsets = array('Q')
+        self.tag_offsets = array('Q')
+        self.tag_family_ids = array('H')
+        self.families: list[str] = []
+        self._family_ids: dict[str, int] = {}
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+        self.inode: int | None = None # Del archivo mapeado: cambia cuando la rotación crea un log nuevo
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _remap(self) -> bool:
+        """
+        Vuelve a mapear el archivo si ha cambiado de tamaño o si es otro archivo (la rotación renombra el log
+        y la siguiente escritura crea uno nuevo). Devuelve True si se ha truncado o rotado.
+        """
+        try:
+            stat = self.path.stat()
+            size, inode = stat.st_size, stat.st_ino
+        except OSError:
+            size, inode = 0, None
+        rotated = self.inode is not None and inode != self.inode
+        if not rotated and size == self.size and (self._mmap is not None or size == 0):
+            return False
+        truncated = rotated or size < self.size
+        self.close()
+        self.size = size
+        self.inode = inode
+        if size:
+            self._file = open(self.path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return truncated
+
+    def _mapping_intact(self) -> bool:
+        """
+        False si el archivo mapeado se ha truncado en su sitio desde el último _remap: leer páginas del mapa
+        más allá de su nuevo final mataría el proceso con SIGBUS. Hasta el siguiente build() no se lee.
+        """
+        try:
+            return os.fstat(self._file.fileno()).st_size >= self.size
+        except (OSError, AttributeError, ValueError):
+            return False
+
+    def build(self, is_running=lambda: True) -> bool:
+        """
+        Indexa (o completa el índice de) lo añadido al archivo desde la última llamada. Si el archivo se ha
+        truncado (rotación) se reindexa desde el principio. Devuelve False si se interrumpe con is_running.
+        """
+        if self._remap():
+            self._reset()
+        if self._mmap is None:
+            return True
+
+        # La última línea indexada pudo quedar a medias: se reindexa desde su inicio
+        start = self.line_offsets.pop() if self.line_offsets else 0
+        while self.tag_offsets and self.tag_offsets[-1] >= start:
+            self.tag_offsets.pop()
+            self.tag_family_ids.pop()
+
+        mm = self._mmap
+        position = start
+        while position < self.size:
+            # Trozos que terminan en salto de línea: split/accumulate hacen el recuento en C
+            chunk_end = mm.rfind(b"\n", position, min(position + INDEX_CHUNK_SIZE, self.size)) + 1
+            if chunk_end <= position:
+                chunk_end = mm.find(b"\n", position) + 1 or self.size
+            pieces = mm[position:chunk_end].split(b"\n")
+            trailing = pieces.pop() # Vacío si el trozo termina en salto de línea; si no, una última línea sin terminar
+            starts = accumulate(map((1).__add__, map(len, pieces)), initial=position)
+            self.line_offsets.extend(starts)
+            if not trailing:
+                self.line_offsets.pop() # Tras el último salto de línea no empieza ninguna línea
+            position = chunk_end
+            if not is_running():
+                self._reset()
+                return False
+
+        ids_by_tag: dict[bytes, int] = {}
+        def add_tag(offset: int, raw_tag: bytes):
+            family_id = ids_by_tag.get(raw_tag)
+            if family_id is None:
+                family = tag_family(raw_tag.decode('utf-8', 'replace'))
+                family_id = self._family_ids.get(family)
+                if family_id is None:
+                    family_id = self._family_ids[family] = len(self.families)
+                    self.families.append(family)
+                ids_by_tag[raw_tag] = family_id
+            self.tag_offsets.append(offset)
+            self.tag_family_ids.append(family_id)
+
+        if start == 0:
+            first_match = FIRST_LINE_TAG_RE.match(mm, 0)
+            if first_match:
+                add_tag(0, first_match.group(1))
+        for match in TAG_RE.finditer(mm, max(0, start - 1)):
+            add_tag(match.start() + 1, match.group(1))
+        return True
+
+    def _reset(self):
+        self.line_offsets = array('Q')
+        self.tag_offsets = array('Q')
+        self.tag_family_ids = array('H')
+
+    def line_count(self) -> int:
+        return len(self.line_offsets)
+
+    def line_at(self, offset: int) -> str:
+        """Texto de la línea que empieza en offset, sin el salto de línea."""
+        if self._mmap is None or offset >= self.size or not self._mapping_intact():
+            return ""
+        end = self._mmap.find(b"\n", offset)
+        if end < 0:
+            end = self.size
+        return self._mmap[offset:end].decode('utf-8', 'replace').rstrip("\r")
+
+    def tail_offsets(self, count: int) -> array:
+        """Inicio de las últimas count líneas, buscando hacia atrás desde el final (sin indexar el archivo)."""
+        self._remap()
+        offsets = array('Q')
+        if self._mmap is None:
+            return offsets
+        end = self.size - 1 if self._mmap[self.size - 1:self.size] == b"\n" else self.size
+        while len(offsets) < count and end > 0:
+            newline = self._mmap.rfind(b"\n", 0, end)
+            offsets.append(newline + 1)
+            end = newline
+        offsets.reverse()
+        return offsets
+
+    def filtered_offsets(self, families: set[str]) -> array:
+        """Inicios de línea de los orígenes indicados (incluidas sus líneas sin etiqueta)."""
+        wanted_ids = {self._family_ids[f] for f in families if f in self._family_ids}
+        result = array('Q')
+        tag_count = len(self.tag_offsets)
+        index = 0
+        while index < tag_count:
+            if self.tag_family_ids[index] not in wanted_ids:
+                index += 1
+                continue
+            range_start = self.tag_offsets[index]
+            # Agrupar etiquetas seguidas del mismo conjunto en un único tramo
+            while index < tag_count and self.tag_family_ids[index] in wanted_ids:
+                index += 1
+            range_end = self.tag_offsets[index] if index < tag_count else self.size
+            first = bisect_left(self.line_offsets, range_start)
+            last = bisect_left(self.line_offsets, range_end)
+            result.extend(self.line_offsets[first:last])
+        return result
+
+    def search(self, text: str, from_offset: int, backwards: bool = False, case_sensitive: bool = False) -> int | None:
+        """
+        Busca text a partir de from_offset (hacia delante o hacia atrás) directamente en el mapa.
+        Devuelve el desplazamiento del inicio de la línea que coincide, o None.
+        """
+        if self._mmap is None or not text or not self._mapping_intact():
+            return None
+        pattern, overlap = search_pattern(text, case_sensitive)
+        if not backwards:
+            match = pattern.search(self._mmap, min(from_offset, self.size))
+            return self._line_start(match.start()) if match else None
+
+        end = min(from_offset, self.size)
+        while end > 0:
+            start = max(0, end - SEARCH_WINDOW_SIZE)
+            last_match = None
+            for last_match in pattern.finditer(self._mmap, start, end):
+                pass
+            if last_match:
+                return self._line_start(last_match.start())
+            if start == 0:
+                break
+            end = start + overlap
+        return None
+
+    def _line_start(self, offset: int) -> int:
+        return self._mmap.rfind(b"\n", 0, offset) + 1
+
+    @staticmethod
+    def row_for_offset(offsets: array, offset: int) -> int:
+        """Fila (en offsets, ordenado) de la línea que contiene offset."""
+        return max(0, bisect_right(offsets, offset) - 1)
@@ -0,0 +1,183 @@
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+
+# Tamaño a partir del cual se rota un log y número de logs rotados (comprimidos) que se conservan
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# Máximo de mensajes que el hilo escritor agrupa en una misma tanda de escrituras
+WRITE_BATCH_MAX = 1000
+# Los archivos sin escrituras durante este tiempo se cierran para no acumular descriptores abiertos
+IDLE_CLOSE_SECONDS = 60.0
+
+class LogWriter:
+    """
+    Escritor de logs en segundo plano. write() solo encola el texto; un hilo dedicado lo agrupa
+    por archivo, lo escribe con los archivos abiertos entre tandas y rota por tamaño (renombrando el
+    archivo, nunca truncándolo), comprimiendo con gzip los logs rotados (<log>.1.gz, <log>.2.gz, ...). Así escribir en el log nunca bloquea
+    la interfaz ni los hilos de instalación.
+    """
+
+    def __init__(self, max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT):
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._files: dict[Path, tuple[object, float]] = {} # Solo los usa el hilo escritor
+
+    def write(self, path: Path, text: str):
+        """Encola text para añadirlo al final de path."""
+        self._ensure_thread()
+        self._queue.put((Path(path), text))
+
+    def stream(self, path: Path) -> "LogStream":
+        """Objeto tipo archivo (write/flush, gestor de contexto) que escribe en path a través de la cola."""
+        return LogStream(self, Path(path))
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Espera a que se escriba todo lo encolado hasta ahora. Devuelve False si se agota el tiempo."""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                return True
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0):
+        """Escribe lo pendiente, cierra los archivos y detiene el hilo (un write() posterior lo vuelve a iniciar)."""
+        with self._thread_lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            done = threading.Event()
+            self._queue.put(("close", done))
+            self._thread = None
+        done.wait(timeout)
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=IDLE_CLOSE_SECONDS / 2)
+            except queue.Empty:
+                self._close_idle_files()
+                continue
+
+            pending: dict[Path, list[str]] = {}
+            control = []
+            while True:
+                if isinstance(item[0], Path):
+                    pending.setdefault(item[0], []).append(item[1])
+                else:
+                    control.append(item)
+                    break # Lo encolado antes de la orden de control ya está en pending
+                if sum(len(chunks) for chunks in pending.values()) >= WRITE_BATCH_MAX:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            for path, chunks in pending.items():
+                self._write_chunks(path, chunks)
+            for handle, _ in self._files.values():
+                try:
+                    handle.flush()
+                except OSError:
+                    pass
+
+            for command, done in control:
+                if command == "close":
+                    self._close_all_files()
+                    done.set()
+                    return
+                done.set()
+
+    def _write_chunks(self, path: Path, chunks: list[str]):
+        try:
+            handle = self._open(path)
+            handle.write("".join(chunks))
+            if handle.tell() >= self.max_bytes:
+                self._rotate(path)
+        except OSError as e:
+            print(f"Error escribiendo en el log {path}: {e}")
+
+    def _open(self, path: Path):
+        entry = self._files.get(path)
+        if entry is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(path, 'a', encoding='utf-8', errors='replace')
+        else:
+            handle = entry[0]
+        self._files[path] = (handle, time.monotonic())
+        return handle
+
+    def _rotate(self, path: Path):
+        """
+        Renombra log.N.gz a log.N+1.gz, renombra el log actual a log.1 y lo comprime como log.1.gz.
+        El log no se trunca en su sitio: quien lo tenga abierto o mapeado (el visor de logs) sigue
+        leyendo el archivo antiguo, y la siguiente escritura crea uno nuevo.
+        """
+        handle, _ = self._files.pop(path)
+        handle.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{index}.gz")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{index + 1}.gz"))
+        renamed = path.with_name(f"{path.name}.1")
+        os.replace(path, renamed)
+        rotated = path.with_name(f"{path.name}.1.gz")
+        tmp_rotated = rotated.with_name(rotated.name + ".tmp")
+        with open(renamed, 'rb') as source, gzip.open(tmp_rotated, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.replace(tmp_rotated, rotated)
+        renamed.unlink()
+
+    def _close_idle_files(self):
+        now = time.monotonic()
+        for path, (handle, last_write) in list(self._files.items()):
+            if now - last_write >= IDLE_CLOSE_SECONDS:
+                handle.close()
+                del self._files[path]
+
+    def _close_all_files(self):
+        for handle, _ in self._files.values():
+            try:
+                handle.close()
+            except OSError:
+                pass
+        self._files.clear()
+
+
+class LogStream:
+    """Vista tipo archivo de un log gestionado por LogWriter, para volcar salida de procesos línea a línea."""
+
+    def __init__(self, writer: LogWriter, path: Path):
+        self.writer = writer
+        self.path = path
+
+    def write(self, text: str) -> int:
+        self.writer.write(self.path, text)
+        return len(text)
+
+    def flush(self):
+        pass # El hilo escritor vuelca cada tanda
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from config_manager import ConfigManager
+from core.events import Event
+from core.winetricks_cache import load_verb_downloads, download_to_cache, evict_cache
+from core.winetricks_planner import load_verb_dependencies, transitive_dependencies
+
+class WinetricksPrefetch:
+    """
+    Descarga en paralelo, antes de instalar, los archivos que necesitan los verbos de winetricks en cola
+    (incluidos sus prerrequisitos) a la caché compartida W_CACHE, y aplica el límite de tamaño de la caché.
+    Sin Qt: run() es bloqueante y avisa mediante Event.
+    """
+    def __init__(self, verbs: set[str], winetricks_path: str, config_manager: ConfigManager, max_workers: int = 4):
+        self.progress = Event() # (mensaje)
+        self.finished = Event() # (resumen)
+        self.verbs = set(verbs)
+        self.winetricks_path = winetricks_path
+        self.config_manager = config_manager
+        self.max_workers = max(1, max_workers)
+        self._is_running = True
+
+    def run(self):
+        log_source = "Prefetch"
+        summary = {"downloaded": 0, "cached": 0, "failed": 0, "bytes": 0}
+        try:
+            cache_dir = self.config_manager.get_winetricks_cache_dir()
+            dependencies = load_verb_dependencies(self.winetricks_path)
+            downloads = load_verb_downloads(self.winetricks_path)
+
+            all_verbs = set(self.verbs)
+            for verb in self.verbs:
+                all_verbs |= transitive_dependencies(verb, dependencies)
+
+            # Winetricks guarda cada descarga en $W_CACHE/<verbo>/<archivo>
+            wanted: dict[Path, tuple[str, str | None]] = {}
+            for verb in sorted(all_verbs):
+                for url, sha256, filename in downloads.get(verb, []):
+                    wanted.setdefault(cache_dir / verb / filename, (url, sha256))
+
+            missing = {path: source for path, source in wanted.items() if not path.exists()}
+            summary["cached"] = len(wanted) - len(missing)
+            if missing:
+                self.progress.emit(f"Descargando {len(missing)} archivo(s) de Winetricks a la caché ({summary['cached']} ya en caché)...")
+                self.config_manager.write_to_log("wineprotonmanager", log_source, f"Precarga de {len(missing)} archivo(s) para: {' '.join(sorted(all_verbs))}")
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(download_to_cache, url, path, sha256, lambda: self._is_running): path
+                    for path, (url, sha256) in missing.items()
+                }
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        summary["bytes"] += future.result()
+                        summary["downloaded"] += 1
+                        self.progress.emit(f"Descargado: {path.parent.name}/{path.name}")
+                    except Exception as e:
+                        summary["failed"] += 1
+                        message = f"No se pudo precargar {path.parent.name}/{path.name}: {e}"
+                        self.progress.emit(message)
+                        self.config_manager.write_to_log("wineprotonmanager", log_source, f"Advertencia: {message}")
+
+            max_bytes = self.config_manager.get_winetricks_cache_max_mb() * 1024 * 1024
+            removed, freed = evict_cache(cache_dir, max_bytes, protected=set(wanted))
+            if removed:
+                self.config_manager.write_to_log("wineprotonmanager", log_source, f"Caché de Winetricks reducida: {removed} archivo(s), {freed / (1024 * 1024):.1f} MB liberados.")
+
+            self.config_manager.write_to_log("wineprotonmanager", log_source,
+                f"Precarga terminada: {summary['downloaded']} descargado(s) ({summary['bytes'] / (1024 * 1024):.1f} MB), "
+                f"{summary['cached']} ya en caché, {summary['failed']} con error.")
+        except Exception as e:
+            # La precarga es una optimización: si falla, winetricks descargará durante la instalación
+            self.config_manager.write_to_log("wineprotonmanager", log_source, f"Advertencia: Precarga interrumpida: {e}")
+        finally:
+            self.finished.emit(summary)
+
+    def stop(self):
+        self._is_running = False
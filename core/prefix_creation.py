@@ -0,0 +1,85 @@
+import subprocess
+import time
+from pathlib import Path
+
+from config_manager import ConfigManager
+from core.events import Event
+from core.prefix_templates import PrefixTemplateStore
+from core.process_runner import ProcessRunner
+
+class PrefixCreator:
+    """
+    Crea un prefijo: si hay plantilla para la compilación y arquitectura del entorno, lo clona;
+    si no, ejecuta wineboot y guarda el resultado como plantilla para los siguientes (solo si el prefijo
+    estaba vacío: reinicializar un prefijo ya usado no debe convertir sus programas en la plantilla).
+    Sin Qt: run() es bloqueante y avisa mediante Event.
+    """
+    WINEBOOT_TIMEOUT = 120
+
+    def __init__(self, env: dict, prefix_path: Path, config_manager: ConfigManager, config_name: str, use_template: bool = True):
+        self.progress = Event() # (mensaje o línea de wineboot)
+        self.finished = Event() # (éxito, mensaje)
+        self.env = env
+        self.prefix_path = Path(prefix_path)
+        self.config_manager = config_manager
+        self.config_name = config_name
+        self.use_template = use_template
+
+    def run(self):
+        log_source = "Creación del Prefijo"
+        start_time = time.monotonic()
+        store = PrefixTemplateStore(self.config_manager.get_prefix_templates_dir())
+        try:
+            was_empty = self._prefix_is_empty()
+            if self.use_template and store.has_template(self.env) and was_empty:
+                self.progress.emit("Clonando plantilla de prefijo...")
+                try:
+                    store.clone(self.env, self.prefix_path)
+                    message = f"Prefijo clonado desde plantilla en {time.monotonic() - start_time:.1f} s."
+                    self.config_manager.write_to_log(self.config_name, log_source, f"{message} ({self.prefix_path})")
+                    self.finished.emit(True, message)
+                    return
+                except OSError as e:
+                    self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: No se pudo clonar la plantilla ({e}). Se usará wineboot.")
+
+            self.prefix_path.mkdir(parents=True, exist_ok=True, mode=0o755)
+            self._run_wineboot()
+            message = f"Prefijo inicializado con wineboot en {time.monotonic() - start_time:.1f} s."
+            self.config_manager.write_to_log(self.config_name, log_source, f"{message} ({self.prefix_path})")
+
+            if self.use_template and was_empty and not store.has_template(self.env):
+                self.progress.emit("Guardando plantilla de prefijo...")
+                try:
+                    store.store(self.env, self.prefix_path)
+                    self.config_manager.write_to_log(self.config_name, log_source, f"Plantilla de prefijo guardada en {store.template_dir(self.env)}")
+                except OSError as e:
+                    self.config_manager.write_to_log(self.config_name, log_source, f"Advertencia: No se pudo guardar la plantilla de prefijo: {e}")
+            self.finished.emit(True, message)
+        except Exception as e:
+            self.config_manager.write_to_log(self.config_name, log_source, f"ERROR: {e}")
+            self.finished.emit(False, str(e))
+
+    def _prefix_is_empty(self) -> bool:
+        return not self.prefix_path.exists() or not any(self.prefix_path.iterdir())
+
+    def _run_wineboot(self):
+        wine_executable = self.env.get("WINE")
+        if not wine_executable or not Path(wine_executable).is_file():
+            raise FileNotFoundError(f"Ejecutable de Wine no encontrado: {wine_executable}")
+
+        result = ProcessRunner([wine_executable, "wineboot"], env=self.env, timeout=self.WINEBOOT_TIMEOUT).run(
+            lambda line: self.progress.emit(line.strip())
+        )
+        output = result.output
+        self.config_manager.write_to_log(self.config_name, f"Wineboot ({self.config_name})", f"Salida ({result.describe()}):\n{output}")
+        if result.timed_out:
+            raise Exception("La inicialización del prefijo de Wine/Proton agotó el tiempo de espera.")
+        if result.returncode != 0:
+            raise Exception(f"No se pudo inicializar el prefijo de Wine/Proton. Código de salida: {result.returncode}\nSalida: {output}")
+
+        # Esperar a que wineserver vuelque el registro a disco antes de usar el prefijo como plantilla
+        try:
+            subprocess.run([self.env.get("WINESERVER", "wineserver"), "-w"], env=self.env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
+        except (OSError, subprocess.SubprocessError):
+            pass
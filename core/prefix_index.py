@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+INDEX_FILENAME = "wineprotonmanager.json"
+LEGACY_INI_FILENAME = "wineprotonmanager.ini"
+WINETRICKS_LOG_FILENAME = "winetricks.log"
+INDEX_VERSION = 1
+
+LEGACY_ENTRY_RE = re.compile(r"^(\S+ \S+) installed (.+?) \(Type: (\S+), Source: (.*)\)\s*$")
+LEGACY_SHORT_ENTRY_RE = re.compile(r"installed\s+(\S+)")
+
+class PrefixInstallIndex:
+    """
+    Registro de lo instalado en un prefijo (wineprotonmanager.json), con nombre, tipo, origen,
+    hash, fecha y duración de cada elemento. Al cargarse incorpora los verbos del winetricks.log
+    del prefijo y migra el antiguo wineprotonmanager.ini si todavía existe.
+    """
+
+    def __init__(self, prefix_path: str | Path):
+        self.prefix_path = Path(prefix_path)
+        self.items: dict[str, dict] = {}
+        self.winetricks_verbs: set[str] = set()
+        self._lookup: set[str] = set()
+
+    @property
+    def index_file(self) -> Path:
+        return self.prefix_path / INDEX_FILENAME
+
+    def load(self) -> "PrefixInstallIndex":
+        """Carga el índice del disco, migrando el .ini antiguo y fusionando winetricks.log."""
+        self.items = {}
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.items = dict(data.get("items", {}))
+            except (OSError, ValueError) as e:
+                print(f"Error leyendo el índice de instalación {self.index_file}: {e}")
+
+        if (self.prefix_path / LEGACY_INI_FILENAME).exists():
+            self._migrate_legacy_ini()
+
+        self.winetricks_verbs = set(self._read_winetricks_log())
+        self._rebuild_lookup()
+        return self
+
+    def save(self):
+        """Escribe el índice de forma atómica (archivo temporal + os.replace)."""
+        tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "items": self.items}, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    def record(self, name: str, item_type: str, source: str, duration: float | None = None):
+        """Registra (o actualiza) un elemento instalado."""
+        self.items[name] = {
+            "name": name,
+            "type": item_type,
+            "source": source,
+            "sha256": file_sha256(source) if item_type in ("exe", "wtr") else None,
+            "installed_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration": round(duration, 2) if duration is not None else None,
+        }
+        self._rebuild_lookup()
+
+    def is_installed(self, name_or_source: str) -> bool:
+        """Comprueba en O(1) si un verbo, nombre, origen o nombre de archivo está registrado."""
+        return name_or_source in self._lookup
+
+    def installed_names(self) -> set[str]:
+        """Conjunto con todos los identificadores registrados (nombres, orígenes y verbos de winetricks)."""
+        return set(self._lookup)
+
+    def _rebuild_lookup(self):
+        lookup = set(self.winetricks_verbs)
+        for name, item in self.items.items():
+            lookup.add(name)
+            source = item.get("source")
+            if source:
+                lookup.add(source)
+                lookup.add(Path(source).name)
+        self._lookup = lookup
+
+    def _read_winetricks_log(self) -> list[str]:
+        try:
+            with open(self.prefix_path / WINETRICKS_LOG_FILENAME, 'r', encoding='utf-8', errors='ignore') as f:
+                return [line.strip() for line in f if line.strip()]
+        except OSError:
+            return []
+
+    def _migrate_legacy_ini(self):
+        """Importa las entradas de wineprotonmanager.ini y lo renombra para no volver a procesarlo."""
+        legacy_file = self.prefix_path / LEGACY_INI_FILENAME
+        try:
+            with open(legacy_file, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    match = LEGACY_ENTRY_RE.match(line.strip())
+                    if match:
+                        installed_at, name, item_type, source = match.groups()
+                    else:
+                        short_match = LEGACY_SHORT_ENTRY_RE.search(line)
+                        if not short_match:
+                            continue
+                        installed_at, name, item_type, source = "", short_match.group(1), "", ""
+                    self.items.setdefault(name, {
+                        "name": name, "type": item_type, "source": source, "sha256": None,
+                        "installed_at": installed_at, "duration": None,
+                    })
+            self.save()
+            legacy_file.rename(legacy_file.with_name(LEGACY_INI_FILENAME + ".migrated"))
+        except OSError as e:
+            print(f"Error migrando {legacy_file}: {e}")
+
+
+def file_sha256(path: str) -> str | None:
+    """Calcula el SHA-256 de un archivo por bloques. Devuelve None si no se puede leer."""
+    try:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+_index_cache: dict[str, tuple[tuple, PrefixInstallIndex]] = {}
+_index_cache_lock = threading.Lock()
+
+def _index_signature(prefix_path: Path) -> tuple:
+    signature = []
+    for filename in (INDEX_FILENAME, LEGACY_INI_FILENAME, WINETRICKS_LOG_FILENAME):
+        try:
+            stat = (prefix_path / filename).stat()
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def get_install_index(prefix_path: str | Path) -> PrefixInstallIndex:
+    """
+    Devuelve el índice de un prefijo, reutilizando la copia en memoria mientras no cambien
+    (fecha y tamaño) el índice, el .ini antiguo ni el winetricks.log. El resultado es de solo lectura.
+    """
+    prefix_path = Path(prefix_path)
+    key = os.path.realpath(prefix_path)
+    with _index_cache_lock:
+        signature = _index_signature(prefix_path)
+        cached = _index_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        index = PrefixInstallIndex(prefix_path).load()
+        # La carga puede haber migrado el .ini: volver a firmar tras ella
+        _index_cache[key] = (_index_signature(prefix_path), index)
+        return index
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+TEMPLATE_INFO_FILENAME = "template.json"
+TEMPLATE_PREFIX_DIRNAME = "prefix"
+REGISTRY_FILES = ("system.reg", "user.reg", "userdef.reg")
+# Archivos del prefijo que no deben pasar a la plantilla (son propios de cada prefijo)
+PER_PREFIX_FILES = ("wineprotonmanager.json", "wineprotonmanager.ini", "wineprotonmanager.ini.migrated", "winetricks.log")
+
+class PrefixTemplateStore:
+    """
+    Plantillas de prefijos recién inicializados, una por compilación de Wine/Proton (ruta real del
+    ejecutable, su fecha y su versión) y WINEARCH. Un prefijo nuevo se clona de su plantilla con
+    'cp --reflink=auto' (copia por referencia si el sistema de archivos lo permite) en lugar de ejecutar wineboot.
+    """
+
+    def __init__(self, templates_dir: Path):
+        self.templates_dir = Path(templates_dir)
+
+    def template_key(self, env: dict) -> str:
+        wine_executable = env.get("WINE", "wine")
+        wine_executable = os.path.realpath(wine_executable if Path(wine_executable).is_file() else shutil.which(wine_executable) or wine_executable)
+        try:
+            build_mtime = os.stat(wine_executable).st_mtime_ns
+        except OSError:
+            build_mtime = 0
+        version = env.get("PROTON_VERSION") or env.get("WINE_VERSION_IN_PROTON") or env.get("WINE_VERSION", "")
+        key_data = json.dumps([wine_executable, build_mtime, version, env.get("WINEARCH", "win64")])
+        return hashlib.sha1(key_data.encode("utf-8")).hexdigest()[:16]
+
+    def template_dir(self, env: dict) -> Path:
+        return self.templates_dir / self.template_key(env)
+
+    def has_template(self, env: dict) -> bool:
+        template_dir = self.template_dir(env)
+        return (template_dir / TEMPLATE_INFO_FILENAME).is_file() and (template_dir / TEMPLATE_PREFIX_DIRNAME / "system.reg").is_file()
+
+    def clone(self, env: dict, prefix_path: Path):
+        """Clona la plantilla en prefix_path (que debe estar vacío) y corrige las rutas absolutas."""
+        template_dir = self.template_dir(env)
+        with open(template_dir / TEMPLATE_INFO_FILENAME, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        prefix_path.mkdir(parents=True, exist_ok=True, mode=0o755)
+        _copy_tree(template_dir / TEMPLATE_PREFIX_DIRNAME, prefix_path)
+        _fix_prefix_paths(prefix_path, info.get("source_prefix", ""), str(prefix_path))
+
+    def store(self, env: dict, prefix_path: Path):
+        """Guarda un prefijo recién inicializado como plantilla de su compilación y arquitectura."""
+        template_dir = self.template_dir(env)
+        tmp_dir = template_dir.with_name(template_dir.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        (tmp_dir / TEMPLATE_PREFIX_DIRNAME).mkdir(parents=True)
+        _copy_tree(prefix_path, tmp_dir / TEMPLATE_PREFIX_DIRNAME)
+        for filename in PER_PREFIX_FILES:
+            try:
+                (tmp_dir / TEMPLATE_PREFIX_DIRNAME / filename).unlink()
+            except OSError:
+                pass
+        info = {
+            "wine": env.get("WINE", ""),
+            "version": env.get("PROTON_VERSION") or env.get("WINE_VERSION_IN_PROTON") or env.get("WINE_VERSION", ""),
+            "arch": env.get("WINEARCH", "win64"),
+            "source_prefix": str(prefix_path),
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with open(tmp_dir / TEMPLATE_INFO_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=4)
+        shutil.rmtree(template_dir, ignore_errors=True)
+        os.replace(tmp_dir, template_dir)
+
+
+def _copy_tree(source: Path, destination: Path):
+    """Copia el contenido de source en destination conservando enlaces y permisos, con reflinks si es posible."""
+    result = subprocess.run(["cp", "-a", "--reflink=auto", f"{source}/.", str(destination)], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise OSError(f"No se pudo copiar {source} a {destination}: {result.stderr.strip()}")
+
+def _fix_prefix_paths(prefix_path: Path, old_prefix: str, new_prefix: str):
+    """Sustituye la ruta del prefijo de origen por la nueva en el registro y en los enlaces de dosdevices."""
+    if not old_prefix or old_prefix == new_prefix:
+        return
+    replacements = [(old_prefix, new_prefix)]
+    # En el registro las rutas Unix aparecen también como Z:\\ruta\\con\\barras escapadas
+    old_windows = "Z:" + old_prefix.replace("/", "\\\\")
+    new_windows = "Z:" + new_prefix.replace("/", "\\\\")
+    replacements.append((old_windows, new_windows))
+    for reg_name in REGISTRY_FILES:
+        reg_file = prefix_path / reg_name
+        if not reg_file.is_file():
+            continue
+        content = reg_file.read_text(encoding='utf-8', errors='surrogateescape')
+        updated = content
+        for old, new in replacements:
+            updated = updated.replace(old, new)
+        if updated != content:
+            reg_file.write_text(updated, encoding='utf-8', errors='surrogateescape')
+
+    dosdevices = prefix_path / "dosdevices"
+    if dosdevices.is_dir():
+        for link in dosdevices.iterdir():
+            if link.is_symlink():
+                target = os.readlink(link)
+                if target.startswith(old_prefix):
+                    link.unlink()
+                    link.symlink_to(new_prefix + target[len(old_prefix):])
@@ -0,0 +1,261 @@
+import codecs
+import os
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+# Margen entre SIGTERM y SIGKILL al detener un grupo de procesos
+KILL_GRACE_SECONDS = 0.2
+# Tiempo que se sigue leyendo tras salir el proceso, por si algún hijo mantiene abierta la tubería
+EXIT_DRAIN_SECONDS = 2.0
+READ_CHUNK_SIZE = 64 * 1024
+
+class ProcessResult:
+    """Resultado de un proceso ejecutado con ProcessRunner: código, tiempos, uso de recursos y últimas líneas."""
+
+    def __init__(self, cmd: list[str]):
+        self.cmd = cmd
+        self.returncode: int | None = None
+        self.duration = 0.0
+        self.user_time = 0.0
+        self.system_time = 0.0
+        self.max_rss_kb = 0
+        self.timed_out: str | None = None # "stall" (sin salida) o "timeout" (tiempo total)
+        self.canceled = False
+        self.output_tail: list[str] = []
+        self.stdout_tail: list[str] = [] # Solo salida estándar (igual que output_tail si se mezcla stderr)
+
+    @property
+    def output(self) -> str:
+        return "".join(self.output_tail)
+
+    @property
+    def stdout(self) -> str:
+        return "".join(self.stdout_tail)
+
+    def describe(self) -> str:
+        """Resumen de una línea para el log."""
+        status = "cancelado" if self.canceled else (f"tiempo agotado ({self.timed_out})" if self.timed_out else f"código {self.returncode}")
+        return (f"{status}, {self.duration:.1f} s, CPU usuario {self.user_time:.1f} s, sistema {self.system_time:.1f} s, "
+                f"RSS máx {self.max_rss_kb / 1024:.0f} MB")
+
+
+class ProcessRunner:
+    """
+    Ejecuta un comando en su propio grupo de procesos y lee su salida sin bloquear (selectors), de modo que:
+    - stall_timeout detiene el proceso si pasa ese tiempo sin producir salida;
+    - timeout detiene el proceso si supera ese tiempo total;
+    - cancel() (desde cualquier hilo) despierta la lectura al instante y mata el grupo completo;
+    - al terminar se registran duración y rusage (wait4) en el ProcessResult.
+    """
+
+    def __init__(self, cmd: list[str], env: dict | None = None, cwd: str | None = None,
+                 timeout: float | None = None, stall_timeout: float | None = None,
+                 merge_stderr: bool = True, tail_lines: int = 200):
+        self.cmd = [str(c) for c in cmd]
+        self.env = env
+        self.cwd = cwd
+        self.timeout = timeout
+        self.stall_timeout = stall_timeout
+        self.merge_stderr = merge_stderr
+        self.tail_lines = tail_lines
+        self.pid: int | None = None
+        self._cancel_event = threading.Event()
+        # cancel() puede llegar desde otro hilo cuando run() ya ha cerrado la tubería: el cierre y la escritura
+        # comparten este cerrojo para no escribir nunca en un descriptor cerrado (y quizá reutilizado)
+        self._wake_lock = threading.Lock()
+        self._wake_read_fd, self._wake_write_fd = os.pipe()
+
+    def cancel(self):
+        """Solicita la detención del proceso. Es seguro llamarlo desde otro hilo."""
+        self._cancel_event.set()
+        with self._wake_lock:
+            if self._wake_write_fd < 0:
+                return
+            try:
+                os.write(self._wake_write_fd, b"x")
+            except OSError:
+                pass
+
+    def run(self, line_callback=None, idle_callback=None, idle_interval: float = 0.5) -> ProcessResult:
+        """
+        Ejecuta el comando hasta que termina, se cancela o agota un tiempo límite.
+        line_callback recibe cada línea (con su salto de línea); idle_callback se llama como mucho cada
+        idle_interval segundos aunque el proceso no escriba nada. Lanza OSError si no se puede lanzar.
+        """
+        result = ProcessResult(self.cmd)
+        tail: deque[str] = deque(maxlen=self.tail_lines)
+        stdout_tail: deque[str] = deque(maxlen=self.tail_lines)
+        start_time = time.monotonic()
+        try:
+            process = subprocess.Popen(
+                self.cmd, env=self.env, cwd=self.cwd, stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT if self.merge_stderr else subprocess.PIPE,
+                start_new_session=True
+            )
+        except OSError:
+            self._close_wake_pipe()
+            raise
+        self.pid = process.pid
+
+        selector = selectors.DefaultSelector()
+        streams = [process.stdout] + ([process.stderr] if process.stderr else [])
+        for stream in streams:
+            os.set_blocking(stream.fileno(), False)
+            selector.register(stream, selectors.EVENT_READ, codecs.getincrementaldecoder("utf-8")(errors="replace"))
+        selector.register(self._wake_read_fd, selectors.EVENT_READ, None)
+        partial_lines = {stream.fileno(): "" for stream in streams}
+
+        stdout_fd = process.stdout.fileno()
+
+        def emit(line: str, fd: int):
+            tail.append(line)
+            if fd == stdout_fd:
+                stdout_tail.append(line)
+            if line_callback:
+                line_callback(line)
+
+        last_output = start_time
+        last_idle = start_time
+        exit_status = None
+        exited_at = None
+        try:
+            # Seguir mientras quede salida por leer o el proceso no haya terminado
+            while len(selector.get_map()) > 1 or exit_status is None:
+                now = time.monotonic()
+                if self._cancel_event.is_set():
+                    result.canceled = True
+                    break
+                if self.timeout is not None and now - start_time > self.timeout:
+                    result.timed_out = "timeout"
+                    break
+                if self.stall_timeout is not None and now - last_output > self.stall_timeout:
+                    result.timed_out = "stall"
+                    break
+                if exit_status is None:
+                    exit_status = self._try_reap(process)
+                    if exit_status is not None:
+                        exited_at = now
+                if exited_at is not None and now - exited_at > EXIT_DRAIN_SECONDS:
+                    break # Algún hijo conserva la tubería abierta: no esperar a que la cierre
+
+                wait_for = idle_interval
+                if self.timeout is not None:
+                    wait_for = min(wait_for, max(0.0, self.timeout - (now - start_time)))
+                if self.stall_timeout is not None:
+                    wait_for = min(wait_for, max(0.0, self.stall_timeout - (now - last_output)))
+                events = selector.select(timeout=max(wait_for, 0.01))
+
+                for key, _ in events:
+                    if key.data is None: # Aviso de cancelación
+                        continue
+                    fd = key.fileobj.fileno()
+                    try:
+                        chunk = os.read(fd, READ_CHUNK_SIZE)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        text = key.data.decode(b"", final=True)
+                        selector.unregister(key.fileobj)
+                        remaining = partial_lines.pop(fd, "") + text
+                        if remaining:
+                            emit(remaining, fd)
+                        continue
+                    last_output = time.monotonic()
+                    text = partial_lines[fd] + key.data.decode(chunk)
+                    *lines, partial_lines[fd] = text.split("\n")
+                    for line in lines:
+                        emit(line + "\n", fd)
+
+                if idle_callback and time.monotonic() - last_idle >= idle_interval:
+                    last_idle = time.monotonic()
+                    idle_callback()
+
+            if result.canceled or result.timed_out:
+                exit_status = self._kill_group(process) or exit_status
+            for fd, remaining in partial_lines.items():
+                if remaining:
+                    emit(remaining, fd)
+            if exit_status is None:
+                exit_status = self._reap(process)
+        finally:
+            selector.close()
+            for stream in streams:
+                stream.close()
+            self._close_wake_pipe()
+
+        _, status, rusage = exit_status
+        result.returncode = os.waitstatus_to_exitcode(status)
+        process.returncode = result.returncode # Ya recogido con wait4: que Popen no vuelva a esperarlo
+        result.user_time = rusage.ru_utime
+        result.system_time = rusage.ru_stime
+        result.max_rss_kb = rusage.ru_maxrss
+        result.duration = time.monotonic() - start_time
+        result.output_tail = list(tail)
+        result.stdout_tail = list(stdout_tail)
+        if idle_callback:
+            idle_callback()
+        return result
+
+    def _try_reap(self, process: subprocess.Popen):
+        try:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        except ChildProcessError:
+            return (process.pid, 0, _empty_rusage())
+        return (pid, status, rusage) if pid else None
+
+    def _reap(self, process: subprocess.Popen):
+        try:
+            return os.wait4(process.pid, 0)
+        except ChildProcessError:
+            return (process.pid, 0, _empty_rusage())
+
+    def _kill_group(self, process: subprocess.Popen):
+        """
+        SIGTERM al grupo completo y, si sigue vivo tras un margen breve, SIGKILL.
+        Devuelve el estado de salida (de wait4) si el proceso principal se recogió entretanto.
+        """
+        exit_status = None
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                break
+            deadline = time.monotonic() + KILL_GRACE_SECONDS
+            while time.monotonic() < deadline:
+                if exit_status is None:
+                    exit_status = self._try_reap(process)
+                try:
+                    os.killpg(process.pid, 0)
+                except ProcessLookupError:
+                    return exit_status # Ningún proceso del grupo sigue vivo
+                time.sleep(0.01)
+        return exit_status
+
+    def _close_wake_pipe(self):
+        with self._wake_lock:
+            fds = (self._wake_read_fd, self._wake_write_fd)
+            self._wake_read_fd = self._wake_write_fd = -1
+            for fd in fds:
+                if fd < 0:
+                    continue
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+
+class _EmptyRusage:
+    ru_utime = 0.0
+    ru_stime = 0.0
+    ru_maxrss = 0
+
+def _empty_rusage():
+    return _EmptyRusage()
+
+def run_command(cmd: list[str], env: dict | None = None, timeout: float | None = None, merge_stderr: bool = True) -> ProcessResult:
+    """Ejecuta un comando corto (p. ej. 'wine --version') y devuelve su resultado con la salida capturada."""
+    return ProcessRunner(cmd, env=env, timeout=timeout, merge_stderr=merge_stderr).run()
@@ -0,0 +1,298 @@
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from core.events import Event
+
+PROTONDB_HOST = "www.protondb.com"
+SUMMARY_PATH = "/api/v1/reports/summaries/{appid}.json"
+USER_AGENT = "WineProtonManager/1.0"
+REQUEST_TIMEOUT_SECONDS = 10
+
+MAX_WORKERS = 4
+REQUESTS_PER_SECOND = 5.0
+# Espera ante un 429 (o un error 5xx) si el servidor no indica Retry-After: 1, 2, 4... hasta el máximo
+BACKOFF_INITIAL_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+MAX_ATTEMPTS = 5
+# Los resultados se entregan juntos al llegar a este número o tras este tiempo
+RESULT_BATCH_SIZE = 25
+RESULT_BATCH_INTERVAL_SECONDS = 0.25
+# Mientras llegan resultados, la caché se guarda en disco como mucho con esta frecuencia (y siempre al terminar)
+CACHE_SAVE_INTERVAL_SECONDS = 5.0
+
+RATING_NOT_FOUND = "No encontrado"
+RATING_NO_DATA = "Sin datos"
+RATING_OFFLINE = "Sin conexión"
+RATING_FETCH_FAILED = "Error de consulta"
+
+CACHE_VERSION = 1
+CACHE_FILENAME = "protondb.json"
+# Campos del resumen de la API que se guardan en la caché
+SUMMARY_FIELDS = ("tier", "confidence", "total")
+
+def rating_text(summary: dict | None) -> str:
+    """Texto de la columna ProtonDB para un resumen de la API (None: juego sin informes o error)."""
+    if summary is None:
+        return RATING_NOT_FOUND
+    return str(summary.get("tier") or RATING_NO_DATA).capitalize()
+
+def rating_tooltip(entry: dict | None) -> str:
+    """Detalle de una calificación guardada en la RatingCache (confianza, número de informes y fecha de consulta)."""
+    if not entry:
+        return ""
+    summary = entry.get("summary") or {}
+    lines = []
+    if summary.get("confidence"):
+        lines.append(f"Confianza: {summary['confidence']}")
+    if summary.get("total") is not None:
+        lines.append(f"Informes: {summary['total']}")
+    lines.append(f"Consultado: {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.get('fetched_at', 0)))}")
+    return "\n".join(lines)
+
+
+class RatingCache:
+    """
+    Calificaciones de ProtonDB ya consultadas, en memoria y en cache/protondb.json: por appid, el resumen
+    (tier, confianza y número de informes, o None si ProtonDB no tiene informes del juego) y la fecha de la
+    consulta. Las entradas más antiguas que el TTL se muestran igualmente, pero se vuelven a consultar.
+    """
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def get(self, appid: str) -> dict | None:
+        """Entrada guardada ({"summary", "fetched_at"}), o None si el juego no se ha consultado nunca."""
+        with self._lock:
+            return self._entries.get(appid)
+
+    @staticmethod
+    def is_fresh(entry: dict | None, ttl_seconds: float) -> bool:
+        return bool(entry) and time.time() - entry.get("fetched_at", 0) < ttl_seconds
+
+    def put(self, appid: str, summary: dict | None):
+        if summary is not None:
+            summary = {field: summary.get(field) for field in SUMMARY_FIELDS}
+        with self._lock:
+            self._entries[appid] = {"summary": summary, "fetched_at": time.time()}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": CACHE_VERSION, "entries": self._entries}
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+                self._dirty = False
+            except OSError as e:
+                print(f"Error guardando la caché de ProtonDB {self.cache_file}: {e}")
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = dict(data.get("entries", {}))
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+
+_caches: dict[str, RatingCache] = {}
+_caches_lock = threading.Lock()
+
+def get_rating_cache(cache_file: Path) -> RatingCache:
+    """Caché compartida por todos los que usan el mismo archivo."""
+    with _caches_lock:
+        cache = _caches.get(str(cache_file))
+        if cache is None:
+            cache = _caches[str(cache_file)] = RatingCache(cache_file)
+        return cache
+
+
+class _RetryLater(Exception):
+    def __init__(self, delay: float | None):
+        super().__init__(delay)
+        self.delay = delay
+
+
+class _FetchFailed(Exception):
+    """Error de red o respuesta inesperada: no se sabe nada nuevo del juego."""
+
+
+class ProtonDBFetcher:
+    """
+    Consulta la API de ProtonDB para muchos juegos con un único conjunto de MAX_WORKERS hilos: cada hilo
+    reutiliza su conexión HTTPS (keep-alive), todos comparten un límite de REQUESTS_PER_SECOND, y un 429
+    pausa a todos durante el Retry-After del servidor (o con espera exponencial) antes de reintentar.
+    Un mismo appid no se pide dos veces: las peticiones repetidas esperan a la que ya está en curso y los
+    resultados de la sesión se reutilizan. Los resultados se entregan por tandas mediante results_ready.
+    Una consulta fallida (error de red, respuesta inesperada o 429 tras MAX_ATTEMPTS intentos) se entrega
+    marcada como tal y no se recuerda, para que se pueda volver a pedir. Con una RatingCache, cada respuesta
+    válida se guarda en ella; los fallos no la modifican.
+    Sin Qt: run() es bloqueante (reparte los resultados) hasta stop().
+    """
+
+    def __init__(self, cache: RatingCache | None = None, max_workers: int = MAX_WORKERS,
+                 requests_per_second: float = REQUESTS_PER_SECOND):
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.results_ready = Event() # (lista de (appid, resumen o None, si la consulta se completó))
+        self._queue: queue.Queue[tuple[str, int]] = queue.Queue()
+        self._results: queue.Queue[tuple[str, dict | None, bool]] = queue.Queue()
+        self._known: dict[str, dict | None] = {} # Resultados ya obtenidos en esta sesión
+        self._pending: set[str] = set()          # Pedidos y aún sin resultado (en cola o en curso)
+        self._in_flight: set[str] = set()        # Consultándose ahora mismo en algún hilo
+        self._lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._local = threading.local() # Conexión HTTPS de cada hilo
+        self._is_running = True
+
+    def request(self, appids):
+        """Pide el resumen de estos appid (los ya conocidos se entregan sin volver a consultarlos)."""
+        with self._lock:
+            for appid in appids:
+                if appid in self._known:
+                    self._results.put((appid, self._known[appid], True))
+                elif appid not in self._pending:
+                    self._pending.add(appid)
+                    if appid not in self._in_flight: # Si no, se reencola al reintentar o llega al terminar
+                        self._queue.put((appid, 1))
+
+    def cancel(self):
+        """Descarta las peticiones en cola (p. ej. al recargar la tabla); las que están en curso terminan, pero no se reintentan."""
+        with self._lock:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._pending.clear()
+
+    def stop(self):
+        self._is_running = False
+        self.cancel()
+
+    def run(self):
+        for _ in range(self.max_workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+        batch: list[tuple[str, dict | None, bool]] = []
+        last_flush = last_save = time.monotonic()
+        while self._is_running:
+            try:
+                batch.append(self._results.get(timeout=RESULT_BATCH_INTERVAL_SECONDS))
+            except queue.Empty:
+                pass
+            if batch and (len(batch) >= RESULT_BATCH_SIZE or time.monotonic() - last_flush >= RESULT_BATCH_INTERVAL_SECONDS):
+                self.results_ready.emit(batch)
+                batch = []
+                last_flush = time.monotonic()
+            if self.cache and time.monotonic() - last_save >= CACHE_SAVE_INTERVAL_SECONDS:
+                self.cache.save()
+                last_save = time.monotonic()
+        if self.cache:
+            self.cache.save()
+
+    def _worker(self):
+        # Los hilos son daemon: si una petición está en curso al cerrar la aplicación, no se espera a que termine
+        while self._is_running:
+            try:
+                appid, attempt = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            with self._lock:
+                self._in_flight.add(appid)
+            self._wait_for_slot()
+            if not self._is_running:
+                break
+            try:
+                summary = self._fetch(appid)
+            except _RetryLater as retry:
+                if attempt < MAX_ATTEMPTS:
+                    delay = retry.delay if retry.delay is not None else min(BACKOFF_MAX_SECONDS, BACKOFF_INITIAL_SECONDS * 2 ** (attempt - 1))
+                    self._pause_all(delay)
+                    with self._lock:
+                        self._in_flight.discard(appid)
+                        if appid in self._pending: # Si se canceló mientras tanto, no se reintenta
+                            self._queue.put((appid, attempt + 1))
+                    continue
+                self._finish(appid, None, False)
+                continue
+            except _FetchFailed:
+                self._finish(appid, None, False)
+                continue
+            if self.cache:
+                self.cache.put(appid, summary)
+            self._finish(appid, summary, True)
+        self._close_connection()
+
+    def _finish(self, appid: str, summary: dict | None, ok: bool):
+        with self._lock:
+            self._pending.discard(appid)
+            self._in_flight.discard(appid)
+            if ok:
+                self._known[appid] = summary
+        self._results.put((appid, summary, ok))
+
+    def _wait_for_slot(self):
+        """Límite de peticiones por segundo compartido por todos los hilos."""
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at)
+            self._next_request_at = start_at + self.min_interval
+        while self._is_running and time.monotonic() < start_at:
+            time.sleep(min(0.2, start_at - time.monotonic()))
+
+    def _pause_all(self, delay: float):
+        with self._lock:
+            self._next_request_at = max(self._next_request_at, time.monotonic() + delay)
+
+    def _close_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection:
+            connection.close()
+        self._local.connection = None
+
+    def _fetch(self, appid: str) -> dict | None:
+        """Resumen de un juego, o None si no tiene informes. Reintenta una vez si la conexión se cerró."""
+        for reuse_attempt in range(2):
+            if getattr(self._local, "connection", None) is None:
+                self._local.connection = http.client.HTTPSConnection(PROTONDB_HOST, timeout=REQUEST_TIMEOUT_SECONDS)
+            connection = self._local.connection
+            try:
+                connection.request("GET", SUMMARY_PATH.format(appid=appid), headers={"User-Agent": USER_AGENT, "Accept": "application/json"})
+                response = connection.getresponse()
+                body = response.read() # Leer entero para poder reutilizar la conexión
+            except (http.client.HTTPException, OSError):
+                self._close_connection()
+                if reuse_attempt == 0:
+                    continue # El servidor cerró la conexión inactiva: reintentar con una nueva
+                raise _FetchFailed(appid)
+            if response.getheader("Connection", "").lower() == "close":
+                self._close_connection()
+
+            if response.status == 200:
+                try:
+                    return json.loads(body.decode())
+                except ValueError:
+                    raise _FetchFailed(appid)
+            if response.status == 429 or response.status >= 500:
+                retry_after = response.getheader("Retry-After")
+                raise _RetryLater(float(retry_after) if retry_after and retry_after.isdigit() else None)
+            if response.status == 404:
+                return None # Juego sin informes
+            raise _FetchFailed(appid)
+        raise _FetchFailed(appid)
@@ -0,0 +1,142 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_FLAG = "--profile-startup"
+CPROFILE_FLAG = "--profile-startup-cprofile"
+PROFILE_ENV = "WPM_PROFILE_STARTUP" # "1" para el informe de fases, "cprofile" para añadir el volcado de cProfile
+HISTORY_FILENAME = "startup-profile.jsonl"
+CHECK_FLAG = "--check-startup-budget" # Mide, comprueba el presupuesto y sale con código 1 si no se cumple
+# (tests/test_startup_imports.py comprueba lo mismo para la importación en cada ejecución de pytest)
+
+# Presupuesto de la fase de importación. Antes de cargar diálogos e hilos bajo demanda la fase
+# rondaba los 150 ms; después, unos 95 ms (mediana de 15 arranques en frío, mismo equipo).
+IMPORT_PHASE = "Importación de módulos"
+IMPORT_BUDGET_MS = 120.0
+# Módulos que solo deben cargarse al usarse (diálogos, hilos de trabajo y dependencias pesadas)
+LAZY_MODULE_PREFIXES = ("dialogs.", "threads.", "vdf")
+
+class StartupProfiler:
+    """
+    Medición del arranque: tiempo real de cada fase (importaciones, carga de configuración, construcción de
+    cada panel, estilos, primer pintado). Solo mide si se arranca con --profile-startup (o la variable
+    WPM_PROFILE_STARTUP); en otro caso phase() no hace nada. finish() escribe un informe de texto, añade
+    una línea al historial startup-profile.jsonl (para comparar entre versiones) y, si se pidió, un .prof de cProfile.
+    """
+
+    def __init__(self, argv: list[str] | None = None, environ: dict | None = None):
+        argv = sys.argv if argv is None else argv
+        environ = os.environ if environ is None else environ
+        env_value = environ.get(PROFILE_ENV, "").strip().lower()
+        self.use_cprofile = CPROFILE_FLAG in argv or env_value == "cprofile"
+        self.check_budget = CHECK_FLAG in argv
+        self.enabled = (self.use_cprofile or self.check_budget or PROFILE_FLAG in argv
+                        or env_value not in ("", "0", "false", "no"))
+        self.origin = time.perf_counter()
+        self.phases: list[tuple[str, int, float, float]] = [] # (nombre, profundidad, inicio, duración)
+        self.marks: list[tuple[str, float]] = []
+        self._depth = 0
+        self._profile = None
+        self._finished = False
+        self.eager_modules: list[str] = []
+        if self.enabled and self.use_cprofile:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled or self._finished:
+            yield
+            return
+        start = time.perf_counter()
+        position = len(self.phases)
+        self.phases.append((name, self._depth, start - self.origin, 0.0))
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.phases[position] = (name, self._depth, start - self.origin, time.perf_counter() - start)
+
+    def mark(self, name: str):
+        """Registra un instante (p. ej. el primer pintado de la ventana)."""
+        if self.enabled and not self._finished:
+            self.marks.append((name, time.perf_counter() - self.origin))
+
+    def record_eager_imports(self):
+        """Anota los módulos de carga bajo demanda que ya están importados (llamar al terminar las importaciones)."""
+        if self.enabled and not self._finished:
+            self.eager_modules = sorted(name for name in sys.modules
+                                        if name.startswith(LAZY_MODULE_PREFIXES) and name not in ("dialogs", "threads"))
+
+    def budget_violations(self) -> list[str]:
+        """Incumplimientos del presupuesto de importación (lista vacía si se cumple)."""
+        violations = []
+        import_ms = next((duration * 1000 for name, _, _, duration in self.phases if name == IMPORT_PHASE), None)
+        if import_ms is not None and import_ms > IMPORT_BUDGET_MS:
+            violations.append(f"La fase '{IMPORT_PHASE}' tardó {import_ms:.1f} ms (presupuesto: {IMPORT_BUDGET_MS:.0f} ms)")
+        if self.eager_modules:
+            violations.append(f"Módulos importados al arrancar que deberían cargarse bajo demanda: {', '.join(self.eager_modules)}")
+        return violations
+
+    def report(self) -> str:
+        lines = ["Perfil de arranque de WineProton Manager", f"Fecha: {time.strftime('%Y-%m-%d %H:%M:%S')}", ""]
+        lines.append(f"{'Fase':<50} {'Duración (ms)':>14} {'Inicio (ms)':>12}")
+        for name, depth, start, duration in self.phases:
+            lines.append(f"{'  ' * depth + name:<50} {duration * 1000:>14.1f} {start * 1000:>12.1f}")
+        for name, moment in self.marks:
+            lines.append(f"{'* ' + name:<50} {'':>14} {moment * 1000:>12.1f}")
+        violations = self.budget_violations()
+        lines.append("")
+        lines.append("Presupuesto de importación: " + ("SUPERADO" if violations else "cumplido"))
+        lines.extend(f"  - {violation}" for violation in violations)
+        return "\n".join(lines) + "\n"
+
+    def finish(self, output_dir: Path) -> Path | None:
+        """Detiene la medición y escribe el informe en output_dir. Devuelve la ruta del informe."""
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        report_file = output_dir / f"startup-profile-{stamp}.txt"
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(str(output_dir / f"startup-profile-{stamp}.prof"))
+        report_file.write_text(self.report(), encoding='utf-8')
+
+        history_entry = {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "phases": {name: round(duration * 1000, 1) for name, _, _, duration in self.phases},
+            "marks": {name: round(moment * 1000, 1) for name, moment in self.marks},
+            "budget_violations": self.budget_violations(),
+        }
+        with open(output_dir / HISTORY_FILENAME, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(history_entry, ensure_ascii=False) + "\n")
+        print(f"Perfil de arranque guardado en {report_file}")
+        return report_file
+
+
+def watch_first_paint(widget, callback):
+    """Llama a callback una sola vez, cuando widget recibe su primer evento de pintado."""
+    from PyQt5.QtCore import QObject, QEvent
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint:
+                watched.removeEventFilter(self)
+                callback()
+            return False
+
+    paint_filter = _FirstPaintFilter(widget)
+    widget.installEventFilter(paint_filter)
+    return paint_filter
+
+# Instancia única: se crea al importar este módulo (lo primero que hace main.py)
+profiler = StartupProfiler()
@@ -0,0 +1,217 @@
+import re
+import time
+from pathlib import Path
+
+from core.events import Event
+from core.steam_manifest_cache import ManifestCache
+# Una tanda de filas se envía a la interfaz al llegar a este tamaño o tras este tiempo
+BATCH_SIZE = 50
+BATCH_INTERVAL_SECONDS = 0.1
+
+def convert_to_unsigned(signed_id: int) -> int:
+    """Convierte un AppID de 32 bits con signo a su equivalente positivo."""
+    return signed_id & 0xffffffff
+
+def natural_sort_key(text: str) -> list:
+    return [int(t) if t.isdigit() else t.lower() for t in re.split('([0-9]+)', text)]
+
+def read_steam_config(steam_root: Path) -> tuple[dict, str | None, list[Path]]:
+    """
+    Lee config.vdf y libraryfolders.vdf. Devuelve (CompatToolMapping, herramienta por defecto,
+    bibliotecas), con la biblioteca principal primero.
+    """
+    import vdf
+    config_path = steam_root / "config/config.vdf"
+    compat_tools_config = {}
+    global_default_tool = None
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_data = vdf.load(f)
+        steam_section = config_data.get("InstallConfigStore", {}).get("Software", {}).get("Valve", {}).get("Steam", {})
+        compat_tools_config = steam_section.get("CompatToolMapping", {})
+        global_default_tool = steam_section.get("DefaultCompatTool")
+    return compat_tools_config, global_default_tool, library_paths(steam_root)
+
+def library_paths(steam_root: Path) -> list[Path]:
+    """Bibliotecas de Steam declaradas en libraryfolders.vdf que existen en disco."""
+    import vdf
+    lib_paths = [steam_root]
+    library_folders_path = steam_root / "steamapps/libraryfolders.vdf"
+    if library_folders_path.exists():
+        try:
+            with open(library_folders_path, 'r', encoding='utf-8') as f:
+                lib_folders_data = vdf.load(f)
+            for lib_info in lib_folders_data.get("libraryfolders", {}).values():
+                if "path" in lib_info and Path(lib_info["path"]).exists() and Path(lib_info["path"]) not in lib_paths:
+                    lib_paths.append(Path(lib_info["path"]))
+        except Exception as e:
+            print(f"Advertencia: No se pudo parsear libraryfolders.vdf: {e}")
+    return lib_paths
+
+def compat_tool_for(appid: str, is_steam_game: bool, compat_config: dict, global_tool: str | None) -> str:
+    """Herramienta de compatibilidad asignada a un juego en config.vdf (o la que Steam usa por defecto)."""
+    default = global_tool or ("Nativo/No Proton" if is_steam_game else "Predeterminado de Steam")
+    return compat_config.get(appid, {}).get("name", default)
+
+def steam_game(record: dict | None, compat_config: dict, global_tool: str | None) -> dict | None:
+    """Fila de la tabla para un registro de appmanifest, o None si no es un juego."""
+    if not record or not record["appid"] or not record["name"] or record["is_tool"]:
+        return None
+    appid = record["appid"]
+    return {"appid": appid, "name": record["name"], "compat_tool": compat_tool_for(appid, True, compat_config, global_tool),
+            "tooltip": "", "is_steam_game": True}
+
+def shortcuts_files(steam_root: Path) -> list[Path]:
+    """Archivos shortcuts.vdf (juegos Non-Steam) de cada usuario de Steam."""
+    userdata_root = steam_root / "userdata"
+    if not userdata_root.exists():
+        return []
+    return [d / "config/shortcuts.vdf" for d in userdata_root.iterdir()
+            if d.is_dir() and d.name != "0" and (d / "config/shortcuts.vdf").exists()]
+
+def shortcut_games(shortcuts_path: Path, compat_config: dict, global_tool: str | None) -> list[dict]:
+    """Filas de la tabla para los juegos Non-Steam de un shortcuts.vdf."""
+    import vdf
+    with open(shortcuts_path, "rb") as f:
+        shortcuts_data = vdf.binary_load(f)
+    games = []
+    for entry_data in shortcuts_data.get('shortcuts', {}).values():
+        app_name = entry_data.get('AppName')
+        signed_appid = entry_data.get('appid')
+        if not app_name or signed_appid is None:
+            continue
+        unsigned_appid = str(convert_to_unsigned(signed_appid))
+        games.append({"appid": unsigned_appid, "name": app_name,
+                      "compat_tool": compat_tool_for(unsigned_appid, False, compat_config, global_tool),
+                      "tooltip": f"{app_name}\nRuta: {entry_data.get('Exe', 'N/A')}", "is_steam_game": False})
+    return games
+
+def is_proton_tool(record: dict | None) -> bool:
+    return bool(record and record["name"] and "proton" in record["name"].lower())
+
+def custom_compat_tools(steam_root: Path) -> set[str]:
+    """Herramientas personalizadas (GE-Proton, etc.) instaladas en 'compatibilitytools.d'."""
+    tools = set()
+    compat_dir = steam_root / "compatibilitytools.d"
+    if compat_dir.exists():
+        for entry in compat_dir.iterdir():
+            if entry.is_dir() and (entry / "toolmanifest.vdf").exists():
+                tools.add(entry.name)
+    return tools
+
+def library_manifests(lib_paths: list[Path]):
+    for lib_path in lib_paths:
+        steamapps_path = lib_path / "steamapps"
+        if steamapps_path.exists():
+            yield from steamapps_path.glob("appmanifest_*.acf")
+
+def available_proton_versions(steam_root: Path, lib_paths: list[Path], manifest_cache: ManifestCache) -> list[str]:
+    """
+    Herramientas de compatibilidad disponibles: las personalizadas (GE-Proton) de 'compatibilitytools.d'
+    y las oficiales de Steam (Proton 8.0, Experimental, etc.) de los manifiestos. 'default' va al final.
+    """
+    versions = custom_compat_tools(steam_root)
+    for acf_file in library_manifests(lib_paths):
+        record = manifest_cache.get(acf_file)
+        if is_proton_tool(record):
+            versions.add(record["name"])
+    return sort_compat_tools(versions)
+
+def sort_compat_tools(versions: set[str]) -> list[str]:
+    """Orden "natural" descendente, con 'default' al final."""
+    versions = set(versions) | {"default"}
+    sorted_versions = sorted(versions, key=natural_sort_key, reverse=True)
+    sorted_versions.remove('default')
+    sorted_versions.append('default')
+    return sorted_versions
+
+
+class SteamLibraryScan:
+    """
+    Recorre las bibliotecas de Steam (appmanifest_*.acf) y los shortcuts.vdf de cada usuario y envía
+    los juegos encontrados por tandas, para que la tabla se llene poco a poco sin bloquear la interfaz.
+    Los manifiestos se leen a través de la ManifestCache: solo se analizan los nuevos o modificados.
+    Las herramientas disponibles se envían al empezar (las de compatibilitytools.d y las ya conocidas por
+    la caché) y otra vez al terminar si el recorrido encontró cambios.
+    Sin Qt: run() es bloqueante y avisa mediante Event; stop() lo cancela entre archivo y archivo.
+    """
+
+    def __init__(self, steam_root: Path, manifest_cache: ManifestCache):
+        self.steam_root = Path(steam_root)
+        self.manifest_cache = manifest_cache
+        self.tools_ready = Event()  # (herramientas de compatibilidad disponibles)
+        self.games_found = Event()  # (lista de juegos: dicts con appid, name, compat_tool, tooltip, is_steam_game)
+        self.error = Event()        # (mensaje)
+        self.finished = Event()     # (resumen)
+        self._is_running = True
+        self._batch: list[dict] = []
+        self._last_flush = 0.0
+
+    def stop(self):
+        self._is_running = False
+
+    def run(self):
+        start = time.monotonic()
+        count = 0
+        processed_appids: set[str] = set()
+        try:
+            compat_config, global_tool, lib_paths = read_steam_config(self.steam_root)
+            custom_tools = custom_compat_tools(self.steam_root)
+            known_tools = sort_compat_tools(custom_tools | {r["name"] for r in self.manifest_cache.records() if is_proton_tool(r)})
+            self.tools_ready.emit(known_tools)
+
+            self._last_flush = time.monotonic()
+            found_tools: set[str] = set()
+            seen_manifests: set[str] = set()
+            for game in self._library_games(lib_paths, compat_config, global_tool, processed_appids, found_tools, seen_manifests):
+                count += self._add(game)
+            for game in self._non_steam_games(compat_config, global_tool, processed_appids):
+                count += self._add(game)
+            self._flush()
+
+            if self._is_running:
+                self.manifest_cache.prune(seen_manifests)
+                tools = sort_compat_tools(custom_tools | found_tools)
+                if tools != known_tools:
+                    self.tools_ready.emit(tools)
+        except Exception as e:
+            self.error.emit(f"Ocurrió un error general:\n{e}")
+        finally:
+            self.manifest_cache.save()
+        self.finished.emit({"games": count, "canceled": not self._is_running, "duration": time.monotonic() - start})
+
+    def _add(self, game: dict) -> int:
+        self._batch.append(game)
+        if len(self._batch) >= BATCH_SIZE or time.monotonic() - self._last_flush >= BATCH_INTERVAL_SECONDS:
+            self._flush()
+        return 1
+
+    def _flush(self):
+        if self._batch and self._is_running:
+            self.games_found.emit(self._batch)
+        self._batch = []
+        self._last_flush = time.monotonic()
+
+    def _library_games(self, lib_paths: list[Path], compat_config: dict, global_tool: str | None, processed_appids: set,
+                       found_tools: set[str], seen_manifests: set[str]):
+        for acf_file in library_manifests(lib_paths):
+            if not self._is_running:
+                return
+            seen_manifests.add(str(acf_file))
+            record = self.manifest_cache.get(acf_file)
+            if is_proton_tool(record):
+                found_tools.add(record["name"])
+            game = steam_game(record, compat_config, global_tool)
+            if game and game["appid"] not in processed_appids:
+                processed_appids.add(game["appid"])
+                yield game
+
+    def _non_steam_games(self, compat_config: dict, global_tool: str | None, processed_appids: set):
+        """Juegos Non-Steam desde los archivos shortcuts.vdf de cada usuario."""
+        for shortcuts_path in shortcuts_files(self.steam_root):
+            if not self._is_running:
+                return
+            for game in shortcut_games(shortcuts_path, compat_config, global_tool):
+                if game["appid"] not in processed_appids:
+                    processed_appids.add(game["appid"])
+                    yield game
@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+CACHE_VERSION = 1
+CACHE_FILENAME = "steam_manifests.json"
+
+# Aplicaciones de los manifiestos que no son juegos
+TOOL_KEYWORDS = ["runtime", "sdk", "redist", "proton", "steamworks"]
+
+def read_manifest(acf_file: Path) -> dict:
+    import vdf
+    with open(acf_file, 'r', encoding='utf-8') as f:
+        return vdf.load(f).get("AppState", {})
+
+def manifest_record(app_data: dict) -> dict:
+    """Campos de un appmanifest que usa el gestor."""
+    name = app_data.get("name") or ""
+    return {
+        "appid": app_data.get("appid"),
+        "name": name,
+        "installdir": app_data.get("installdir"),
+        "size_on_disk": app_data.get("SizeOnDisk"),
+        "is_tool": any(k in name.lower() for k in TOOL_KEYWORDS),
+    }
+
+class ManifestCache:
+    """
+    Caché de los appmanifest_*.acf ya leídos, en memoria y en cache/steam_manifests.json: por ruta, la
+    fecha de modificación y el tamaño del archivo y los campos extraídos (appid, nombre, installdir,
+    SizeOnDisk y si es una herramienta). Con la caché al día, volver a recorrer una biblioteca cuesta un
+    stat por manifiesto en lugar de un análisis VDF. También se recuerdan los manifiestos que no se pudieron
+    leer, hasta que cambien en disco.
+    """
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def get(self, acf_file: Path) -> dict | None:
+        """Registro del manifiesto (ver manifest_record), o None si no se puede leer."""
+        key = str(acf_file)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+        signature = [stat.st_mtime_ns, stat.st_size]
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry.get("signature") == signature:
+            return entry.get("record")
+
+        try:
+            record = manifest_record(read_manifest(acf_file))
+        except Exception:
+            record = None
+        with self._lock:
+            self._entries[key] = {"signature": signature, "record": record}
+            self._dirty = True
+        return record
+
+    def forget(self, acf_file: Path):
+        """Olvida un manifiesto borrado."""
+        with self._lock:
+            if self._entries.pop(str(acf_file), None) is not None:
+                self._dirty = True
+
+    def records(self) -> list[dict]:
+        """Todos los registros guardados (p. ej. para conocer las herramientas antes de recorrer las bibliotecas)."""
+        with self._lock:
+            return [entry["record"] for entry in self._entries.values() if entry.get("record")]
+
+    def prune(self, seen_paths: set[str]):
+        """Olvida los manifiestos que ya no existen (llamar tras recorrer todas las bibliotecas)."""
+        with self._lock:
+            for key in [key for key in self._entries if key not in seen_paths]:
+                del self._entries[key]
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": CACHE_VERSION, "entries": self._entries}
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+                self._dirty = False
+            except OSError as e:
+                print(f"Error guardando la caché de manifiestos de Steam {self.cache_file}: {e}")
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = dict(data.get("entries", {}))
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+
+_caches: dict[str, ManifestCache] = {}
+_caches_lock = threading.Lock()
+
+def get_manifest_cache(cache_file: Path) -> ManifestCache:
+    """Caché compartida por todos los análisis que usan el mismo archivo."""
+    with _caches_lock:
+        cache = _caches.get(str(cache_file))
+        if cache is None:
+            cache = _caches[str(cache_file)] = ManifestCache(cache_file)
+        return cache
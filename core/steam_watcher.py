@@ -0,0 +1,289 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from core.events import Event
+from core.steam_library import (read_steam_config, library_manifests, steam_game, shortcuts_files, shortcut_games,
+                                custom_compat_tools, is_proton_tool, sort_compat_tools)
+from core.steam_manifest_cache import ManifestCache
+
+# Cambios seguidos (Steam reescribe varios archivos a la vez) se aplican juntos tras este margen
+DEBOUNCE_SECONDS = 0.5
+# Intervalo de la comprobación por fechas de modificación cuando no hay inotify
+POLL_INTERVAL_SECONDS = 5.0
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, len
+
+class Inotify:
+    """Acceso mínimo a inotify de Linux mediante ctypes: vigila directorios y devuelve las rutas que cambian."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._directories: dict[int, str] = {}
+
+    @classmethod
+    def create(cls) -> "Inotify | None":
+        """Instancia nueva, o None si el sistema no tiene inotify (u otro motivo impide usarlo)."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return cls()
+        except (OSError, AttributeError) as e:
+            print(f"inotify no disponible, se usará la comprobación periódica: {e}")
+            return None
+
+    def watch(self, directory: str) -> bool:
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._directories[wd] = directory
+        return True
+
+    def watched(self) -> set[str]:
+        return set(self._directories.values())
+
+    def read(self, timeout: float) -> tuple[set[str], bool]:
+        """Espera eventos hasta timeout segundos. Devuelve (rutas afectadas, si se desbordó la cola del núcleo)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set(), False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), False
+        paths: set[str] = set()
+        overflow = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            directory = self._directories.get(wd)
+            if mask & IN_IGNORED:
+                self._directories.pop(wd, None) # Directorio borrado o desmontado
+            if directory:
+                paths.add(os.path.join(directory, os.fsdecode(name)) if name else directory)
+        return paths, overflow
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SteamLibraryWatcher:
+    """
+    Vigila los steamapps/ de cada biblioteca, compatibilitytools.d, config/config.vdf y los shortcuts.vdf
+    de cada usuario, y envía a la tabla solo lo que cambia: juegos añadidos o modificados (nombre,
+    herramienta asignada), juegos eliminados y la nueva lista de herramientas. Usa inotify si está
+    disponible y, si no, compara cada POLL_INTERVAL_SECONDS las fechas de modificación de esos archivos.
+    Los manifiestos se leen a través de la ManifestCache, así que solo se vuelven a analizar los modificados.
+    Sin Qt: run() es bloqueante y avisa mediante Event; stop() lo detiene.
+    """
+
+    def __init__(self, steam_root: Path, manifest_cache: ManifestCache, use_inotify: bool = True):
+        self.steam_root = Path(steam_root)
+        self.manifest_cache = manifest_cache
+        self.use_inotify = use_inotify
+        self.games_changed = Event() # (juegos añadidos o modificados, appids eliminados)
+        self.tools_changed = Event() # (herramientas de compatibilidad disponibles)
+        self._is_running = True
+        self._inotify: Inotify | None = None
+        self.compat_config: dict = {}
+        self.global_tool: str | None = None
+        self.lib_paths: list[Path] = []
+        self._manifests: dict[str, dict | None] = {}
+        self._shortcuts: dict[str, list[dict]] = {}
+        self._games: dict[str, dict] = {}
+        self._tools: list[str] = []
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify else "polling"
+
+    def stop(self):
+        self._is_running = False
+
+    def run(self):
+        self._load_state()
+        self._inotify = Inotify.create() if self.use_inotify else None
+        try:
+            if self._inotify:
+                self._update_watches()
+                self._run_inotify()
+            else:
+                self._run_polling()
+        finally:
+            if self._inotify:
+                self._inotify.close()
+            self.manifest_cache.save()
+
+    def _run_inotify(self):
+        while self._is_running:
+            changed, overflow = self._inotify.read(0.5)
+            changed = {path for path in changed if self._is_relevant(path)}
+            if not changed and not overflow:
+                continue
+            # Agrupar la ráfaga de eventos de una misma escritura de Steam
+            deadline = time.monotonic() + DEBOUNCE_SECONDS
+            while self._is_running and time.monotonic() < deadline:
+                more, more_overflow = self._inotify.read(max(0.0, deadline - time.monotonic()))
+                changed |= {path for path in more if self._is_relevant(path)}
+                overflow = overflow or more_overflow
+            if overflow:
+                changed = None # Se perdieron eventos: revisar todo
+            self._apply(changed)
+            self._update_watches()
+
+    def _is_relevant(self, path: str) -> bool:
+        """Descarta los eventos de otros archivos de los directorios vigilados (descargas, registros, etc.)."""
+        name = os.path.basename(path)
+        parent = os.path.dirname(path)
+        compat_dir = str(self.steam_root / "compatibilitytools.d")
+        userdata_root = str(self.steam_root / "userdata")
+        return (name.endswith(".acf") or name in ("config.vdf", "libraryfolders.vdf", "shortcuts.vdf")
+                or path == compat_dir or parent == compat_dir
+                or parent == userdata_root or os.path.dirname(parent) == userdata_root)
+
+    def _run_polling(self):
+        snapshot = self._snapshot()
+        while self._is_running:
+            deadline = time.monotonic() + POLL_INTERVAL_SECONDS
+            while self._is_running and time.monotonic() < deadline:
+                time.sleep(0.2)
+            if not self._is_running:
+                break
+            current = self._snapshot()
+            changed = {path for path in snapshot.keys() | current.keys() if snapshot.get(path) != current.get(path)}
+            snapshot = current
+            if changed:
+                self._apply(changed)
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        """Fecha de modificación y tamaño de cada archivo vigilado (para la comprobación periódica)."""
+        paths = [self.steam_root / "config/config.vdf", self.steam_root / "steamapps/libraryfolders.vdf"]
+        paths.extend(library_manifests(self.lib_paths))
+        paths.extend(shortcuts_files(self.steam_root))
+        compat_dir = self.steam_root / "compatibilitytools.d"
+        if compat_dir.is_dir():
+            paths.extend(entry / "toolmanifest.vdf" for entry in compat_dir.iterdir())
+        snapshot = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def _watch_directories(self) -> list[Path]:
+        directories = [self.steam_root, self.steam_root / "config", self.steam_root / "compatibilitytools.d",
+                       self.steam_root / "userdata"]
+        directories.extend(lib_path / "steamapps" for lib_path in self.lib_paths)
+        userdata_root = self.steam_root / "userdata"
+        if userdata_root.is_dir():
+            for user_folder in userdata_root.iterdir():
+                directories.extend([user_folder, user_folder / "config"])
+        return [directory for directory in directories if directory.is_dir()]
+
+    def _update_watches(self):
+        """Vigila los directorios que han aparecido (bibliotecas nuevas, compatibilitytools.d, usuarios)."""
+        watched = self._inotify.watched()
+        for directory in self._watch_directories():
+            if str(directory) not in watched and not self._inotify.watch(str(directory)):
+                print(f"No se puede vigilar {directory}")
+
+    def _load_state(self):
+        """Estado de partida: el mismo que acaba de mostrar el análisis completo de la biblioteca."""
+        self.compat_config, self.global_tool, self.lib_paths = read_steam_config(self.steam_root)
+        self._manifests = {str(acf_file): self.manifest_cache.get(acf_file) for acf_file in library_manifests(self.lib_paths)}
+        self._shortcuts = {str(path): self._read_shortcuts(path) for path in shortcuts_files(self.steam_root)}
+        self._games = self._build_games()
+        self._tools = self._build_tools()
+
+    def _apply(self, changed: set[str] | None):
+        """Actualiza el estado con las rutas cambiadas (None: todas) y envía las diferencias."""
+        config_paths = {str(self.steam_root / "config/config.vdf"), str(self.steam_root / "steamapps/libraryfolders.vdf")}
+        if changed is None or changed & config_paths:
+            try:
+                self.compat_config, self.global_tool, self.lib_paths = read_steam_config(self.steam_root)
+            except Exception as e:
+                print(f"Advertencia: No se pudo leer la configuración de Steam: {e}")
+
+        # Manifiestos: los nuevos y modificados se leen (desde la caché si no cambiaron); los borrados se olvidan
+        current = {str(acf_file) for acf_file in library_manifests(self.lib_paths)}
+        for path in list(self._manifests):
+            if path not in current:
+                del self._manifests[path]
+                self.manifest_cache.forget(path)
+        for path in current:
+            if changed is None or path in changed or path not in self._manifests:
+                self._manifests[path] = self.manifest_cache.get(Path(path))
+
+        # Accesos directos Non-Steam: se releen los modificados; también cambian con config.vdf (herramienta)
+        current_shortcuts = {str(path) for path in shortcuts_files(self.steam_root)}
+        self._shortcuts = {path: games for path, games in self._shortcuts.items() if path in current_shortcuts}
+        for path in current_shortcuts:
+            if changed is None or path in changed or path not in self._shortcuts or changed & config_paths:
+                self._shortcuts[path] = self._read_shortcuts(Path(path))
+
+        games = self._build_games()
+        updated = [game for appid, game in games.items() if self._games.get(appid) != game]
+        removed = [appid for appid in self._games if appid not in games]
+        self._games = games
+        if updated or removed:
+            self.games_changed.emit(updated, removed)
+
+        tools = self._build_tools()
+        if tools != self._tools:
+            self._tools = tools
+            self.tools_changed.emit(tools)
+        self.manifest_cache.save()
+
+    def _read_shortcuts(self, path: Path) -> list[dict]:
+        try:
+            return shortcut_games(path, self.compat_config, self.global_tool)
+        except Exception as e:
+            print(f"Advertencia: No se pudo leer {path}: {e}")
+            return []
+
+    def _build_games(self) -> dict[str, dict]:
+        """Juegos por appid, con la misma prioridad que el análisis completo (bibliotecas y luego Non-Steam)."""
+        games: dict[str, dict] = {}
+        for record in self._manifests.values():
+            game = steam_game(record, self.compat_config, self.global_tool)
+            if game:
+                games.setdefault(game["appid"], game)
+        for shortcut_list in self._shortcuts.values():
+            for game in shortcut_list:
+                games.setdefault(game["appid"], game)
+        return games
+
+    def _build_tools(self) -> list[str]:
+        tools = custom_compat_tools(self.steam_root)
+        tools |= {record["name"] for record in self._manifests.values() if is_proton_tool(record)}
+        return sort_compat_tools(tools)
@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+CACHE_VERSION = 1
+
+class WineVersionCache:
+    """
+    Caché de 'wine --version' por ejecutable (ruta real, tamaño y fecha de modificación), en memoria y
+    en un pequeño JSON. Si se sustituye o actualiza una compilación cambia su firma y se vuelve a consultar.
+    Los fallos solo se recuerdan en memoria, para reintentar en la siguiente sesión.
+    """
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self._entries: dict[str, dict] = {}
+        self._failures: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def get_version(self, wine_executable: str, probe) -> str | None:
+        """
+        Devuelve la versión de wine_executable. Si no está en caché (o la firma ha cambiado)
+        llama a probe() y guarda el resultado; probe devuelve la versión o None si falla.
+        """
+        key, signature = self._signature(wine_executable)
+        if key is None:
+            return probe()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.get("signature") == signature:
+                return entry.get("version")
+            if self._failures.get(key) == signature:
+                return None
+
+        version = probe()
+        with self._lock:
+            if version:
+                self._entries[key] = {"signature": signature, "version": version}
+                self._failures.pop(key, None)
+                self._save()
+            else:
+                self._failures[key] = signature
+        return version
+
+    def invalidate(self, wine_executable: str | None = None):
+        """Olvida la versión de un ejecutable (o todas si no se indica ninguno)."""
+        with self._lock:
+            if wine_executable is None:
+                self._entries.clear()
+                self._failures.clear()
+            else:
+                key, _ = self._signature(wine_executable)
+                self._entries.pop(key, None)
+                self._failures.pop(key, None)
+            self._save()
+
+    @staticmethod
+    def _signature(wine_executable: str) -> tuple[str | None, list | None]:
+        try:
+            real_path = os.path.realpath(wine_executable)
+            stat = os.stat(real_path)
+        except (OSError, TypeError):
+            return None, None
+        return real_path, [stat.st_size, stat.st_mtime_ns]
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = dict(data.get("entries", {}))
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+    def _save(self):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "entries": self._entries}, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Error guardando la caché de versiones de Wine {self.cache_file}: {e}")
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, unquote
+from urllib.request import urlopen, Request
+
+from core.winetricks_planner import resolve_winetricks_script
+
+LOAD_FUNCTION_RE = re.compile(r"^load_([A-Za-z0-9_.+-]+)\(\)")
+W_DOWNLOAD_RE = re.compile(r"^\s*w_download\s+(.+)$")
+ASSIGNMENT_RE = re.compile(r"""^\s*([A-Za-z_][A-Za-z0-9_]*)=["']?([^"'\s;]*)["']?\s*$""")
+VARIABLE_RE = re.compile(r"\$\{?([A-Za-z_][A-Za-z0-9_]*)\}?")
+SHA256_RE = re.compile(r"^[0-9a-fA-F]{64}$")
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+_downloads_cache: dict[str, tuple[tuple, dict[str, list[tuple[str, str | None, str]]]]] = {}
+_downloads_cache_lock = threading.Lock()
+
+def _expand_variables(value: str, variables: dict[str, str]) -> str:
+    return VARIABLE_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), value)
+
+def parse_verb_downloads(script_text: str) -> dict[str, list[tuple[str, str | None, str]]]:
+    """
+    Extrae de cada función load_<verbo> sus llamadas a w_download como (url, sha256, nombre de archivo).
+    Solo se resuelven variables asignadas con un valor literal dentro de la propia función; las URLs que
+    dependen de otras variables se ignoran (winetricks las descargará por sí mismo durante la instalación).
+    """
+    downloads: dict[str, list[tuple[str, str | None, str]]] = {}
+    current_verb = None
+    variables: dict[str, str] = {}
+    for line in script_text.splitlines():
+        match = LOAD_FUNCTION_RE.match(line)
+        if match:
+            current_verb = match.group(1)
+            variables = {}
+            continue
+        if current_verb is None:
+            continue
+        if line.startswith("}"):
+            current_verb = None
+            continue
+
+        assignment = ASSIGNMENT_RE.match(line)
+        if assignment:
+            variables[assignment.group(1)] = _expand_variables(assignment.group(2), variables)
+            continue
+
+        download = W_DOWNLOAD_RE.match(line)
+        if not download:
+            continue
+        args = [arg.strip("\"'") for arg in download.group(1).split("#")[0].split()]
+        args = [_expand_variables(arg, variables) for arg in args]
+        if not args or "$" in args[0] or not args[0].startswith(("http://", "https://")):
+            continue
+        url = args[0]
+        sha256 = args[1] if len(args) > 1 and SHA256_RE.match(args[1]) else None
+        filename = args[2] if len(args) > 2 and "$" not in args[2] else unquote(Path(urlparse(url).path).name)
+        if filename:
+            downloads.setdefault(current_verb, []).append((url, sha256, filename))
+    return downloads
+
+def load_verb_downloads(winetricks_path: str) -> dict[str, list[tuple[str, str | None, str]]]:
+    """Descargas por verbo, cacheadas mientras no cambie (fecha y tamaño) el script de winetricks."""
+    script_path = resolve_winetricks_script(winetricks_path)
+    if not script_path:
+        return {}
+    try:
+        stat = script_path.stat()
+    except OSError:
+        return {}
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = str(script_path.resolve())
+    with _downloads_cache_lock:
+        cached = _downloads_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        try:
+            with open(script_path, 'r', encoding='utf-8', errors='ignore') as f:
+                downloads = parse_verb_downloads(f.read())
+        except OSError:
+            return {}
+        _downloads_cache[key] = (signature, downloads)
+        return downloads
+
+def download_to_cache(url: str, destination: Path, sha256: str | None, is_running=lambda: True) -> int:
+    """
+    Descarga url en destination (vía un .part y os.replace), comprobando el sha256 si se conoce.
+    Devuelve los bytes descargados. Lanza IOError si falla, no coincide el hash o se cancela.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    part_file = destination.with_name(destination.name + ".part")
+    digest = hashlib.sha256()
+    downloaded = 0
+    try:
+        req = Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+        with urlopen(req, timeout=30) as response, open(part_file, 'wb') as f:
+            while True:
+                if not is_running():
+                    raise IOError("Descarga cancelada.")
+                chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                digest.update(chunk)
+                downloaded += len(chunk)
+        if sha256 and digest.hexdigest().lower() != sha256.lower():
+            raise IOError(f"El hash SHA-256 de {destination.name} no coincide.")
+        os.replace(part_file, destination)
+        return downloaded
+    except Exception:
+        try:
+            part_file.unlink()
+        except OSError:
+            pass
+        raise
+
+def evict_cache(cache_dir: Path, max_bytes: int, protected: set[Path] | None = None) -> tuple[int, int]:
+    """
+    Reduce la caché a max_bytes borrando primero los archivos usados hace más tiempo.
+    Nunca borra los archivos de protected. Devuelve (archivos borrados, bytes liberados).
+    """
+    protected = {Path(p).resolve() for p in (protected or set())}
+    entries = []
+    total = 0
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            path = Path(root) / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            total += stat.st_size
+            entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+
+    removed_files = 0
+    freed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path.resolve() in protected:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        freed += size
+        removed_files += 1
+        try:
+            path.parent.rmdir() # Solo se borra si ha quedado vacío
+        except OSError:
+            pass
+    return removed_files, freed
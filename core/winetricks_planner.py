@@ -0,0 +1,145 @@
+import re
+import shutil
+import threading
+from pathlib import Path
+
+LOAD_FUNCTION_RE = re.compile(r"^load_([A-Za-z0-9_.+-]+)\(\)")
+W_CALL_RE = re.compile(r"\bw_call\s+([A-Za-z0-9_.+-]+)")
+
+_dependency_cache: dict[str, tuple[tuple, dict[str, set[str]]]] = {}
+_dependency_cache_lock = threading.Lock()
+
+def resolve_winetricks_script(winetricks_path: str) -> Path | None:
+    """Devuelve la ruta real del script de winetricks (resolviendo el PATH si hace falta)."""
+    if Path(winetricks_path).is_file():
+        return Path(winetricks_path)
+    found = shutil.which(winetricks_path)
+    return Path(found) if found else None
+
+def parse_verb_dependencies(script_text: str) -> dict[str, set[str]]:
+    """
+    Extrae, para cada función load_<verbo> del script de winetricks, los verbos que invoca con w_call.
+    Es la misma información que usa winetricks para instalar prerrequisitos.
+    """
+    dependencies: dict[str, set[str]] = {}
+    current_verb = None
+    for line in script_text.splitlines():
+        match = LOAD_FUNCTION_RE.match(line)
+        if match:
+            current_verb = match.group(1)
+            dependencies.setdefault(current_verb, set())
+            continue
+        if current_verb is None:
+            continue
+        if line.startswith("}"):
+            current_verb = None
+            continue
+        for dependency in W_CALL_RE.findall(line):
+            if dependency != current_verb:
+                dependencies[current_verb].add(dependency)
+    return dependencies
+
+def load_verb_dependencies(winetricks_path: str) -> dict[str, set[str]]:
+    """Dependencias directas por verbo, cacheadas mientras no cambie (fecha y tamaño) el script de winetricks."""
+    script_path = resolve_winetricks_script(winetricks_path)
+    if not script_path:
+        return {}
+    try:
+        stat = script_path.stat()
+    except OSError:
+        return {}
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = str(script_path.resolve())
+    with _dependency_cache_lock:
+        cached = _dependency_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        try:
+            with open(script_path, 'r', encoding='utf-8', errors='ignore') as f:
+                dependencies = parse_verb_dependencies(f.read())
+        except OSError:
+            return {}
+        _dependency_cache[key] = (signature, dependencies)
+        return dependencies
+
+def transitive_dependencies(verb: str, dependencies: dict[str, set[str]]) -> set[str]:
+    """Todos los verbos que acaba instalando un verbo a través de w_call (sin incluirse a sí mismo)."""
+    result: set[str] = set()
+    stack = list(dependencies.get(verb, ()))
+    while stack:
+        dependency = stack.pop()
+        if dependency in result or dependency == verb:
+            continue
+        result.add(dependency)
+        stack.extend(dependencies.get(dependency, ()))
+    return result
+
+
+class InstallPlan:
+    """Resultado de planificar una lista de instalación para un prefijo concreto."""
+
+    def __init__(self, original_items: list[tuple[str, str, str]]):
+        self.original_items = list(original_items)
+        self.items: list[tuple[str, str, str]] = []
+        self.dropped: list[tuple[tuple[str, str, str], str]] = []
+
+    def has_changes(self) -> bool:
+        return bool(self.dropped) or self.items != self.original_items
+
+
+def plan_installation(items: list[tuple[str, str, str]], installed: set[str], dependencies: dict[str, set[str]],
+                      force_mode: bool) -> InstallPlan:
+    """
+    Planifica la instalación de los componentes winetricks de la lista:
+    1. Descarta los verbos ya registrados en el prefijo (salvo en modo forzado) y los repetidos.
+    2. Ordena cada tramo consecutivo de verbos topológicamente (prerrequisitos primero), de modo que cada
+       prerrequisito se instale una vez y las llamadas posteriores lo encuentren ya instalado.
+    Un verbo que otro de la lista invoca con w_call no se descarta: la llamada puede ser condicional
+    (según W_ARCH, w_workaround_wine_bug...) y winetricks ya se salta los verbos instalados.
+    Los elementos que no son winetricks conservan su posición.
+    """
+    plan = InstallPlan(items)
+    closures = {verb: transitive_dependencies(verb, dependencies) for verb, item_type, _ in items if item_type == "winetricks"}
+
+    kept: list[tuple[str, str, str]] = []
+    seen_verbs: set[str] = set()
+    for item in items:
+        verb, item_type, _ = item
+        if item_type == "winetricks" and not force_mode and verb in installed:
+            plan.dropped.append((item, "Ya instalado en el prefijo"))
+        elif item_type == "winetricks" and verb in seen_verbs:
+            plan.dropped.append((item, "Duplicado en la lista"))
+        else:
+            seen_verbs.add(verb)
+            kept.append(item)
+
+
+    # Ordenar cada tramo consecutivo de verbos winetricks sin mover los demás elementos
+    ordered: list[tuple[str, str, str]] = []
+    run: list[tuple[str, str, str]] = []
+    for item in kept + [None]:
+        if item is not None and item[1] == "winetricks":
+            run.append(item)
+            continue
+        ordered.extend(_order_winetricks_run(run, closures))
+        run = []
+        if item is not None:
+            ordered.append(item)
+    plan.items = ordered
+    return plan
+
+def _order_winetricks_run(run: list[tuple[str, str, str]], closures: dict[str, set[str]]) -> list[tuple[str, str, str]]:
+    """Orden topológico estable (respeta el orden original siempre que las dependencias lo permitan)."""
+    if len(run) < 2:
+        return list(run)
+    verbs_in_run = {item[0] for item in run}
+    pending_deps = {item[0]: closures.get(item[0], set()) & verbs_in_run for item in run}
+    ordered: list[tuple[str, str, str]] = []
+    pending = list(run)
+    placed: set[str] = set()
+    while pending:
+        ready = next((item for item in pending if pending_deps[item[0]] <= placed), pending[0]) # Ciclo: romperlo por orden
+        pending.remove(ready)
+        placed.add(ready[0])
+        ordered.append(ready)
+    return ordered
@@ -1,5 +1,27 @@
-from .config_dialog import ConfigDialog
-from .custom_program_dialog import CustomProgramDialog
-from .manage_programs_dialog import ManageProgramsDialog
-from .repository_dialog import RepositoryDialog
-from .select_groups_dialog import SelectGroupsDialog
+# Los diálogos se importan la primera vez que se usan (PEP 562): importar un submódulo
+# (from dialogs.x import ...) no arrastra al resto.
+import importlib
+
+_DIALOG_MODULES = {
+    "ConfigDialog": "config_dialog",
+    "CustomProgramDialog": "custom_program_dialog",
+    "InstallPlanDialog": "install_plan_dialog",
+    "LogViewerDialog": "log_viewer_dialog",
+    "ManageProgramsDialog": "manage_programs_dialog",
+    "RepositoryDialog": "repository_dialog",
+    "SelectConfigsDialog": "select_configs_dialog",
+    "SelectGroupsDialog": "select_groups_dialog",
+}
+
+__all__ = list(_DIALOG_MODULES)
+
+def __getattr__(name):
+    module_name = _DIALOG_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,19 +1,16 @@
-import subprocess
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QTabWidget, QWidget, QListWidget,
                              QHBoxLayout, QPushButton, QLabel, QFormLayout, QComboBox,
                              QLineEdit, QGroupBox, QRadioButton, QDialogButtonBox,
                              QMessageBox, QProgressDialog, QFileDialog, QProgressBar,
-                             QListWidgetItem, QCheckBox, QApplication)
+                             QListWidgetItem, QCheckBox, QSpinBox, QStyle)
 from PyQt5.QtCore import pyqtSignal, Qt, QDir
 from PyQt5.QtGui import QFont
 
+import threading
 from pathlib import Path
 from functools import partial
-from threads.download_thread import DownloadThread
-from threads.decompression_thread import DecompressionThread
-from threads.version_search_thread import VersionSearchThread
-from dialogs.repository_dialog import RepositoryDialog
+from core.health import HealthScanner, STATUS_OK, STATUS_WARNING, STATUS_ERROR, format_size
 from styles import STYLE_BREEZE, COLOR_BREEZE_ACCENT, COLOR_BREEZE_PRIMARY
 from config_manager import ConfigManager
 
@@ -26,10 +23,16 @@ class ConfigDialog(QDialog):
         self.setWindowTitle("Configuración de Entorno")
         self.setMinimumSize(825, 625)
         self.current_config_name_for_editing = None
+        self.health_thread = None
+        self.test_thread = None
+        self._health_rescan: set[str] | None = None # Configuraciones a analizar cuando termine el análisis en curso
+        self._health_rescan_requested = False
+        self.health_reports = HealthScanner(config_manager).cached_reports()
         self.setup_ui()
         self.config_manager.apply_breeze_style_to_widget(self)
         self.load_configs()
         self.update_save_settings_button_state()
+        self.start_health_scan()
 
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -81,6 +84,11 @@ class ConfigDialog(QDialog):
         self.btn_set_default.clicked.connect(self.set_default_config)
         btn_layout.addWidget(self.btn_set_default)
 
+        self.btn_check_health = QPushButton("Comprobar Estado")
+        self.btn_check_health.setAutoDefault(False)
+        self.btn_check_health.clicked.connect(lambda: self.start_health_scan())
+        btn_layout.addWidget(self.btn_check_health)
+
         layout.addLayout(btn_layout)
 
         self.lbl_config_info = QLabel("Selecciona una configuración para ver los detalles")
@@ -182,7 +190,8 @@ class ConfigDialog(QDialog):
         self.new_tab.setLayout(layout)
 
     def create_and_initialize_prefix(self):
-        """Crea el directorio del prefijo si no existe y ejecuta wineboot de forma segura."""
+        """Crea el directorio del prefijo si no existe y lo inicializa (clonando su plantilla o con wineboot)."""
+        from threads.prefix_creation_thread import PrefixCreationThread
         config_name = self.config_name.text().strip()
         if not config_name:
             QMessageBox.warning(self, "Error", "Debes especificar un nombre para la configuración.")
@@ -241,68 +250,39 @@ class ConfigDialog(QDialog):
         self.config_manager.apply_breeze_style_to_widget(progress_dialog)
         progress_dialog.show()
 
-        process = None
         try:
             prefix_path.mkdir(parents=True, exist_ok=True, mode=0o755)
 
-            # 3. Crear una copia temporal de las configuraciones para obtener el entorno de forma segura
-            temp_full_configs = {
-                "configs": {config_name: temp_config_data},
-                "last_used": config_name
-            }
-            original_configs = self.config_manager.configs
-            self.config_manager.configs = temp_full_configs
-            env = self.config_manager.get_current_environment(config_name)
-            self.config_manager.configs = original_configs # Restaurar inmediatamente
+            # 3. Obtener el entorno de la configuración sin guardarla todavía
+            env = self.config_manager.build_environment(temp_config_data)
 
             wine_executable = env.get("WINE")
             if not wine_executable or not Path(wine_executable).is_file():
                 raise FileNotFoundError(f"Ejecutable de Wine no encontrado: {wine_executable}")
 
-            process = subprocess.Popen([wine_executable, "wineboot"], env=env,
-                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                       text=True, bufsize=1, universal_newlines=True)
-            log_output = ""
-            while True:
-                line = process.stdout.readline()
-                if not line: break
-                log_output += line
-                progress_dialog.setLabelText(f"Inicializando...\n{line.strip()}")
-                QApplication.processEvents()
-
-            process.wait(timeout=120)
-            self.config_manager.write_to_log("Creación del Prefijo", f"Wineboot ({config_name})", f"Salida:\n{log_output}")
-
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, "wineboot", output=log_output)
+            # Un prefijo existente que se reinicializa no se sobrescribe con la plantilla: se usa wineboot
+            creation_thread = PrefixCreationThread(env, prefix_path, self.config_manager, config_name)
+            creation_thread.progress.connect(lambda line: progress_dialog.setLabelText(f"Inicializando...\n{line}"))
+            ok, message = creation_thread.wait_until_done()
+            if not ok:
+                raise Exception(message)
 
-            QMessageBox.information(self, "Éxito", "El prefijo ha sido inicializado exitosamente.\nRecuerda guardar la configuración si deseas conservarla.")
+            QMessageBox.information(self, "Éxito", f"El prefijo ha sido inicializado exitosamente.\n{message}\nRecuerda guardar la configuración si deseas conservarla.")
 
         except Exception as e:
-            if process: process.kill()
-            error_msg = f"No se pudo inicializar el prefijo: {e}"
-            if isinstance(e, subprocess.CalledProcessError):
-                error_msg = f"Falló la inicialización del prefijo. Código: {e.returncode}\nSalida: {e.output}"
-            QMessageBox.critical(self, "Error al Crear/Inicializar Prefijo", error_msg)
+            QMessageBox.critical(self, "Error al Crear/Inicializar Prefijo", f"No se pudo inicializar el prefijo: {e}")
         finally:
             progress_dialog.close()
 
     def _create_prefix(self, config: dict, config_name: str, prefix_path: Path):
         """Crea un nuevo prefijo de Wine/Proton y lo inicializa con wineboot."""
+        from threads.prefix_creation_thread import PrefixCreationThread
         prefix_path.mkdir(parents=True, exist_ok=True, mode=0o755)
 
-        original_configs = self.config_manager.configs.copy()
-        temp_configs_dict = {k: v.copy() if isinstance(v, dict) else v for k, v in original_configs.get("configs", {}).items()}
-        temp_configs_dict[config_name] = config
-        self.config_manager.configs["configs"] = temp_configs_dict
-        self.config_manager.configs["last_used"] = config_name
-
-        env = self.config_manager.get_current_environment(config_name)
+        env = self.config_manager.build_environment(config)
 
         wine_executable = env.get("WINE")
         if not wine_executable or not Path(wine_executable).is_file():
-            self.config_manager.configs = original_configs
-            self.config_manager.save_configs()
             raise FileNotFoundError(f"Ejecutable de Wine no encontrado: {wine_executable}")
 
         progress_dialog = QProgressDialog("Inicializando Prefijo de Wine/Proton...", "", 0, 0, self)
@@ -314,36 +294,13 @@ class ConfigDialog(QDialog):
         progress_dialog.show()
 
         try:
-            process = subprocess.Popen(
-                [wine_executable, "wineboot"],
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            log_output = ""
-            for line in process.stdout:
-                log_output += line
-                progress_dialog.setLabelText(f"Inicializando Prefijo de Wine/Proton...\n{line.strip()}")
-                QApplication.processEvents()
-            process.wait(timeout=60)
-
-            self.config_manager.write_to_log("Creación del Prefijo", f"Wineboot ({config_name})", f"Salida:\n{log_output}")
-
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, "wineboot", output=log_output)
-
-        except subprocess.TimeoutExpired:
-            process.kill()
-            raise Exception("La inicialización del prefijo de Wine/Proton agotó el tiempo de espera.")
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"No se pudo inicializar el prefijo de Wine/Proton. Código de salida: {e.returncode}\nSalida: {e.output}")
+            creation_thread = PrefixCreationThread(env, prefix_path, self.config_manager, config_name)
+            creation_thread.progress.connect(lambda line: progress_dialog.setLabelText(f"Inicializando Prefijo de Wine/Proton...\n{line}"))
+            ok, message = creation_thread.wait_until_done()
+            if not ok:
+                raise Exception(message)
         finally:
             progress_dialog.close()
-            self.config_manager.configs = original_configs
-            self.config_manager.save_configs()
 
     def update_proton_prefix_options(self):
         """Controla la visibilidad de los campos de prefijo según el tipo de Proton."""
@@ -594,6 +551,7 @@ class ConfigDialog(QDialog):
 
     def add_repository_dialog(self, repo_type: str):
         """Abre el diálogo para añadir un nuevo repositorio."""
+        from dialogs.repository_dialog import RepositoryDialog
         dialog = RepositoryDialog(repo_type, self.config_manager, self)
         if dialog.exec_() == QDialog.Accepted:
             try:
@@ -664,6 +622,7 @@ class ConfigDialog(QDialog):
 
     def update_versions(self, repo_type: str):
         """Actualiza la lista de versiones disponibles desde los repositorios."""
+        from threads.version_search_thread import VersionSearchThread
         list_widget = self.list_versions_proton if repo_type == "proton" else self.list_versions_wine
         list_widget.clear()
         enabled_repos = [repo for repo in self.config_manager.get_repositories(repo_type) if repo.get("enabled", True)]
@@ -754,6 +713,7 @@ class ConfigDialog(QDialog):
 
     def download_file(self, url: str, destination: Path, name: str):
         """Inicia el proceso de descarga de un archivo."""
+        from threads.download_thread import DownloadThread
         self.progress_dialog = QProgressDialog(f"Descargando {name}...", "Cancelar", 0, 100, self)
         self.progress_dialog.setWindowTitle("Descargando")
         self.progress_dialog.setWindowModality(Qt.WindowModal)
@@ -781,6 +741,7 @@ class ConfigDialog(QDialog):
 
     def on_download_finished(self, filepath: str, name: str):
         """Maneja la finalización de una descarga, iniciando la descompresión."""
+        from threads.decompression_thread import DecompressionThread
         self.progress_dialog.setLabelText(f"Descomprimiendo {name}...")
         self.progress_dialog.setMaximum(0)
         self.config_manager.apply_breeze_style_to_widget(self.progress_dialog)
@@ -801,6 +762,15 @@ class ConfigDialog(QDialog):
         self.progress_dialog.close()
         QMessageBox.information(self, "Éxito", f"Descarga y descompresión de {name} completadas.\nInstalado en: {path}")
 
+    def _precompute_environment(self, config_name: str):
+        """Resuelve en segundo plano el entorno de la configuración guardada, para que el primer uso no espere."""
+        def worker():
+            try:
+                self.config_manager.refresh_environment_snapshot(config_name)
+            except Exception as e: # Ejecutable inexistente, etc.: se informará al usarla
+                print(f"No se pudo preparar el entorno de '{config_name}': {e}")
+        threading.Thread(target=worker, daemon=True).start()
+
     def save_new_config(self):
         """Guarda una nueva configuración o actualiza una existente."""
         try:
@@ -858,9 +828,11 @@ class ConfigDialog(QDialog):
 
             self.config_manager.configs.setdefault("configs", {})[new_config_name] = config_data
             self.config_manager.save_configs()
+            self._precompute_environment(new_config_name)
             QMessageBox.information(self, "Guardado", f"Configuración '{new_config_name}' guardada exitosamente.")
 
             self.load_configs() 
+            self.start_health_scan([new_config_name])
             self.tabs.setCurrentIndex(0)
             self.current_config_name_for_editing = None
 
@@ -894,9 +866,46 @@ class ConfigDialog(QDialog):
         steam_root_layout.addWidget(self.btn_browse_steam_root)
         paths_layout.addRow("Ruta Raíz de Steam:", steam_root_layout)
 
+        watch_steam_layout = QHBoxLayout()
+        watch_steam_label = QLabel("Actualizar la tabla de juegos de Steam al detectar cambios en las bibliotecas")
+        self.checkbox_watch_steam_library = QCheckBox()
+        self.checkbox_watch_steam_library.setToolTip("Vigila steamapps, compatibilitytools.d, config.vdf y shortcuts.vdf (con inotify, o comprobando cada pocos segundos si no está disponible).")
+        self.checkbox_watch_steam_library.setChecked(self.config_manager.get_watch_steam_library())
+        watch_steam_layout.addWidget(watch_steam_label)
+        watch_steam_layout.addStretch()
+        watch_steam_layout.addWidget(self.checkbox_watch_steam_library)
+        paths_layout.addRow(watch_steam_layout)
+
         paths_group.setLayout(paths_layout)
         main_layout.addWidget(paths_group)
 
+        protondb_group = QGroupBox("ProtonDB")
+        protondb_layout = QFormLayout()
+
+        protondb_ttl_layout = QHBoxLayout()
+        protondb_ttl_label = QLabel("Volver a consultar las calificaciones guardadas tras")
+        self.spin_protondb_cache_ttl_hours = QSpinBox()
+        self.spin_protondb_cache_ttl_hours.setRange(1, 24 * 365)
+        self.spin_protondb_cache_ttl_hours.setSuffix(" h")
+        self.spin_protondb_cache_ttl_hours.setToolTip("Las calificaciones guardadas se muestran al momento; solo las más antiguas que este tiempo se actualizan en segundo plano.")
+        self.spin_protondb_cache_ttl_hours.setValue(self.config_manager.get_protondb_cache_ttl_hours())
+        protondb_ttl_layout.addWidget(protondb_ttl_label)
+        protondb_ttl_layout.addStretch()
+        protondb_ttl_layout.addWidget(self.spin_protondb_cache_ttl_hours)
+        protondb_layout.addRow(protondb_ttl_layout)
+
+        protondb_offline_layout = QHBoxLayout()
+        protondb_offline_label = QLabel("Modo sin conexión (mostrar solo las calificaciones guardadas)")
+        self.checkbox_protondb_offline = QCheckBox()
+        self.checkbox_protondb_offline.setChecked(self.config_manager.get_protondb_offline())
+        protondb_offline_layout.addWidget(protondb_offline_label)
+        protondb_offline_layout.addStretch()
+        protondb_offline_layout.addWidget(self.checkbox_protondb_offline)
+        protondb_layout.addRow(protondb_offline_layout)
+
+        protondb_group.setLayout(protondb_layout)
+        main_layout.addWidget(protondb_group)
+
         install_options_group = QGroupBox("Tema y Opciones de Instalación")
         install_options_layout = QFormLayout()
 
@@ -924,6 +933,30 @@ class ConfigDialog(QDialog):
         force_winetricks_layout.addWidget(self.checkbox_force_winetricks)
         install_options_layout.addRow(force_winetricks_layout)
 
+        parallel_installs_layout = QHBoxLayout()
+        parallel_installs_label = QLabel("Instalaciones simultáneas en prefijos distintos")
+        self.spin_max_parallel_installs = QSpinBox()
+        self.spin_max_parallel_installs.setRange(1, 16)
+        self.spin_max_parallel_installs.setToolTip("Número máximo de entornos que se instalan a la vez. Las instalaciones de un mismo prefijo siempre se ejecutan en serie.")
+        self.spin_max_parallel_installs.setValue(self.config_manager.get_max_parallel_installs())
+        parallel_installs_layout.addWidget(parallel_installs_label)
+        parallel_installs_layout.addStretch()
+        parallel_installs_layout.addWidget(self.spin_max_parallel_installs)
+        install_options_layout.addRow(parallel_installs_layout)
+
+        cache_size_layout = QHBoxLayout()
+        cache_size_label = QLabel("Tamaño máximo de la caché de descargas de Winetricks")
+        self.spin_winetricks_cache_max_mb = QSpinBox()
+        self.spin_winetricks_cache_max_mb.setRange(0, 1024 * 1024)
+        self.spin_winetricks_cache_max_mb.setSingleStep(1024)
+        self.spin_winetricks_cache_max_mb.setSuffix(" MB")
+        self.spin_winetricks_cache_max_mb.setToolTip(f"Caché compartida por todas las configuraciones ({self.config_manager.get_winetricks_cache_dir()}). Al superarse, se borran primero los archivos usados hace más tiempo.")
+        self.spin_winetricks_cache_max_mb.setValue(self.config_manager.get_winetricks_cache_max_mb())
+        cache_size_layout.addWidget(cache_size_label)
+        cache_size_layout.addStretch()
+        cache_size_layout.addWidget(self.spin_winetricks_cache_max_mb)
+        install_options_layout.addRow(cache_size_layout)
+
         install_options_group.setLayout(install_options_layout)
         main_layout.addWidget(install_options_group)
 
@@ -958,7 +991,7 @@ class ConfigDialog(QDialog):
         """Habilita/deshabilita el botón 'Guardar Ajustes' basándose en si hay una instalación en curso."""
 
         if hasattr(self.config_manager, 'app_instance') and self.config_manager.app_instance:
-            is_installer_running = self.config_manager.app_instance.installer_thread is not None and self.config_manager.app_instance.installer_thread.isRunning()
+            is_installer_running = self.config_manager.app_instance.is_installation_running()
             is_backup_running = self.config_manager.app_instance.backup_thread is not None and self.config_manager.app_instance.backup_thread.isRunning()
             self.btn_save_settings.setEnabled(not is_installer_running and not is_backup_running)
         else:
@@ -975,10 +1008,15 @@ class ConfigDialog(QDialog):
         try:
             # Guardar ruta de Winetricks
             winetricks_path_ok = self.config_manager.set_winetricks_path(self.edit_winetricks_path.text().strip())
+            if not winetricks_path_ok and self.edit_winetricks_path.text().strip():
+                QMessageBox.warning(self, "Ruta Inválida", "La ruta de Winetricks no es válida o no existe.")
 
             # Guardar ruta de Steam
             steam_root_path = self.edit_steam_root_path.text().strip()
             self.config_manager.set_steam_root_path(steam_root_path)
+            self.config_manager.set_watch_steam_library(self.checkbox_watch_steam_library.isChecked())
+            self.config_manager.set_protondb_cache_ttl_hours(self.spin_protondb_cache_ttl_hours.value())
+            self.config_manager.set_protondb_offline(self.checkbox_protondb_offline.isChecked())
 
             # Guardar Tema
             theme = "dark" if self.theme_combo.currentText() == "Oscuro" else "light"
@@ -987,6 +1025,8 @@ class ConfigDialog(QDialog):
             # Guardar otras opciones
             self.config_manager.set_silent_install(self.checkbox_silent_global.isChecked())
             self.config_manager.set_force_winetricks_install(self.checkbox_force_winetricks.isChecked())
+            self.config_manager.set_max_parallel_installs(self.spin_max_parallel_installs.value())
+            self.config_manager.set_winetricks_cache_max_mb(self.spin_winetricks_cache_max_mb.value())
             self.config_manager.set_ask_for_backup_before_action(self.checkbox_ask_for_backup_before_action.isChecked())
 
             # Guardar todo en el archivo JSON
@@ -1060,7 +1100,9 @@ class ConfigDialog(QDialog):
             item = QListWidgetItem(name)
             if name == last_used:
                 item.setText(f"{name} (Por Defecto)")
+            item.setData(Qt.UserRole, name)
             item.setFont(font_for_item) 
+            self._apply_health_badge(item, self.health_reports.get(name))
             self.list_config.addItem(item)
             if name == last_used:
                 self.list_config.setCurrentItem(item) 
@@ -1190,9 +1232,83 @@ class ConfigDialog(QDialog):
             f"<b>Arquitectura:</b> {config.get('arch', 'win64')}",
             f"<b>Prefijo:</b> <span style='color: #FFB347; font-weight: bold;'>{config.get('prefix', 'No especificado')}</span>"
         ])
+        info.extend(self._health_info_lines(config_name))
 
         self.lbl_config_info.setText("<br>".join(info))
 
+    def start_health_scan(self, config_names: list[str] | None = None):
+        """Comprueba en segundo plano el estado de las configuraciones indicadas (todas si no se indica ninguna)."""
+        from threads.health_scan_thread import HealthScanThread
+
+        if self.health_thread and self.health_thread.isRunning():
+            # Se analizan al terminar el análisis en curso
+            if config_names is None or self._health_rescan is None:
+                self._health_rescan = None if config_names is None else set(config_names)
+            else:
+                self._health_rescan.update(config_names)
+            self._health_rescan_requested = True
+            return
+        self._health_rescan_requested = False
+        self.btn_check_health.setEnabled(False)
+        self.health_thread = HealthScanThread(self.config_manager, config_names)
+        self.health_thread.report_ready.connect(self.on_health_report)
+        self.health_thread.finished_scan.connect(self.on_health_scan_finished)
+        self.health_thread.start()
+
+    def on_health_report(self, config_name: str, report: dict):
+        self.health_reports[config_name] = report
+        for row in range(self.list_config.count()):
+            item = self.list_config.item(row)
+            if item.data(Qt.UserRole) == config_name:
+                self._apply_health_badge(item, report)
+                if item is self.list_config.currentItem():
+                    self.update_displayed_config_info()
+                break
+
+    def on_health_scan_finished(self, summary: dict):
+        self.btn_check_health.setEnabled(True)
+        if self._health_rescan_requested and not summary.get("canceled"):
+            names = None if self._health_rescan is None else sorted(self._health_rescan)
+            self._health_rescan = None
+            self.start_health_scan(names)
+
+    def _apply_health_badge(self, item: QListWidgetItem, report: dict | None):
+        """Icono y descripción emergente con el estado de la configuración."""
+        icons = {
+            STATUS_OK: QStyle.SP_DialogApplyButton,
+            STATUS_WARNING: QStyle.SP_MessageBoxWarning,
+            STATUS_ERROR: QStyle.SP_MessageBoxCritical,
+        }
+        if not report:
+            item.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+            item.setToolTip("Comprobando estado...")
+            return
+        item.setIcon(self.style().standardIcon(icons.get(report["status"], QStyle.SP_MessageBoxQuestion)))
+        item.setToolTip("\n".join(report["issues"]) or "Sin problemas detectados.")
+
+    def _health_info_lines(self, config_name: str) -> list[str]:
+        report = self.health_reports.get(config_name)
+        if not report:
+            return ["<b>Estado:</b> comprobando..."]
+        labels = {STATUS_OK: ("Correcto", "#27ae60"), STATUS_WARNING: ("Con avisos", "#f39c12"), STATUS_ERROR: ("Con errores", "#da4453")}
+        label, color = labels.get(report["status"], ("Desconocido", COLOR_BREEZE_PRIMARY))
+        lines = [
+            f"<b>Estado:</b> <span style='color: {color}; font-weight: bold;'>{label}</span>",
+            f"<b>Tamaño del prefijo:</b> {format_size(report.get('prefix_size'))}",
+            f"<b>Última instalación:</b> {report.get('last_install') or 'Ninguna registrada'}",
+        ]
+        lines.extend(f"&nbsp;&nbsp;• {issue}" for issue in report["issues"])
+        return lines
+
+    def done(self, result: int):
+        if self.health_thread and self.health_thread.isRunning():
+            self.health_thread.stop()
+            self.health_thread.wait()
+        if self.test_thread and self.test_thread.isRunning():
+            self.test_thread.stop()
+            self.test_thread.wait()
+        super().done(result)
+
     def browse_prefix(self):
         """Abre un diálogo para seleccionar el directorio de prefijo."""
         key = "wine_prefix" if self.config_type.currentText() == "Wine" else "proton_prefix"
@@ -1233,6 +1349,9 @@ class ConfigDialog(QDialog):
 
     def test_configuration(self):
         """Prueba la configuración actual de Wine/Proton."""
+        from threads.wine_test_thread import WineTestThread
+        if self.test_thread and self.test_thread.isRunning():
+            return
         config_name_test = self.config_name.text().strip()
         if not config_name_test:
             QMessageBox.warning(self, "Advertencia", "Por favor, introduce un nombre para la configuración antes de probar.")
@@ -1256,44 +1375,30 @@ class ConfigDialog(QDialog):
         elif self.wine_directory.text().strip():
             temp_config["wine_dir"] = self.wine_directory.text().strip()
 
-        original_configs = self.config_manager.configs.copy()
-        temp_configs_dict = {k: v.copy() if isinstance(v, dict) else v for k, v in original_configs.get("configs", {}).items()}
-        temp_configs_dict[config_name_test] = temp_config
-        self.config_manager.configs["configs"] = temp_configs_dict
-        self.config_manager.configs["last_used"] = config_name_test 
-
-        try:
-            env = self.config_manager.get_current_environment(config_name_test)
-
-            wine_executable = env.get("WINE")
-            if not wine_executable or not Path(wine_executable).is_file():
-                raise FileNotFoundError(f"Ejecutable de Wine no encontrado en la ruta especificada o en el PATH del sistema: {wine_executable}")
-
-            process = subprocess.run(
-                [wine_executable, "--version"],
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=10,
-                check=True 
-            )
-            version_output = process.stdout.strip()
+        # Resolver el entorno y 'wine --version' pueden tardar (o colgarse): se ejecutan en un hilo
+        self.btn_test.setEnabled(False)
+        self.btn_test.setText("Probando...")
+        self.test_thread = WineTestThread(self.config_manager, temp_config)
+        self.test_thread.result_ready.connect(self.on_test_result)
+        self.test_thread.error.connect(lambda msg: QMessageBox.critical(self, "Error de Prueba", msg))
+        self.test_thread.finished.connect(self._on_test_finished)
+        self.test_thread.start()
+
+    def on_test_result(self, result):
+        if result.timed_out:
+            QMessageBox.critical(self, "Error de Prueba", "El comando Wine/Proton --version tardó demasiado en responder.")
+        elif result.returncode != 0:
+            error_details = f"Código de Salida: {result.returncode}\nSalida: {result.output}"
+            QMessageBox.critical(self, "Error de Prueba", f"El comando Wine/Proton --version falló.\nDetalles:\n{error_details}")
+        else:
+            version_output = result.stdout.strip()
             QMessageBox.information(
                 self,
                 "Prueba Exitosa",
                 f"Configuración válida.\nVersión Detectada: {version_output}"
             )
-        except FileNotFoundError as e:
-            QMessageBox.critical(self, "Error de Prueba", f"Error de archivo: {str(e)}")
-        except subprocess.TimeoutExpired:
-            QMessageBox.critical(self, "Error de Prueba", "El comando Wine/Proton --version tardó demasiado en responder.")
-        except subprocess.CalledProcessError as e:
-            error_details = f"Código de Salida: {e.returncode}\nStdout: {e.stdout}\nStderr: {e.stderr}"
-            QMessageBox.critical(self, "Error de Prueba", f"El comando Wine/Proton --version falló.\nDetalles:\n{error_details}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error de Prueba", f"Error inesperado durante la prueba: {str(e)}")
-        finally:
 
-            self.config_manager.configs = original_configs
-            self.config_manager.save_configs() 
+    def _on_test_finished(self):
+        self.btn_test.setEnabled(True)
+        self.btn_test.setText("Probar Configuración")
             
\ No newline at end of file
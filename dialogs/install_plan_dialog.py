@@ -0,0 +1,55 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem,
+                             QHeaderView, QDialogButtonBox, QWidget)
+from PyQt5.QtGui import QColor
+
+from config_manager import ConfigManager
+from core.winetricks_planner import InstallPlan
+
+class InstallPlanDialog(QDialog):
+    """Muestra el plan de instalación calculado por configuración antes de empezar."""
+
+    def __init__(self, plans: dict[str, InstallPlan], config_manager: ConfigManager, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.plans = plans
+        self.config_manager = config_manager
+        self.setWindowTitle("Plan de Instalación")
+        self.setMinimumSize(600, 450)
+        self.setup_ui()
+        self.config_manager.apply_breeze_style_to_widget(self)
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        info_label = QLabel(
+            "Se han reordenado o descartado componentes de Winetricks según sus dependencias y lo ya instalado en cada prefijo."
+        )
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Elemento", "Acción"])
+        self.tree.setColumnCount(2)
+        self.tree.setSelectionMode(QTreeWidget.NoSelection)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.tree.header().setSectionResizeMode(1, QHeaderView.Stretch)
+
+        for config_name, plan in self.plans.items():
+            config_item = QTreeWidgetItem([config_name, f"{len(plan.items)} a instalar, {len(plan.dropped)} omitido(s)"])
+            for position, (_, item_type, name) in enumerate(plan.items, start=1):
+                QTreeWidgetItem(config_item, [f"{position}. {name}", "Instalar" if item_type == "winetricks" else f"Instalar ({item_type})"])
+            for (_, _, name), reason in plan.dropped:
+                dropped_item = QTreeWidgetItem(config_item, [name, f"Omitir: {reason}"])
+                dropped_item.setForeground(0, QColor("darkorange"))
+                dropped_item.setForeground(1, QColor("darkorange"))
+            self.tree.addTopLevelItem(config_item)
+            config_item.setExpanded(True)
+        layout.addWidget(self.tree)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.button(QDialogButtonBox.Ok).setText("Instalar")
+        button_box.button(QDialogButtonBox.Ok).setAutoDefault(False)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        self.setLayout(layout)
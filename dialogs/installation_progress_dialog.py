@@ -1,9 +1,12 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QListWidget, QPushButton, QWidget
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QPlainTextEdit, QPushButton, QWidget
 from PyQt5.QtCore import Qt
 
 from config_manager import ConfigManager
 
 class InstallationProgressDialog(QDialog):
+    # Líneas máximas que conserva la vista; las más antiguas se descartan (el log completo está en disco)
+    MAX_LOG_LINES = 5000
+
     def __init__(self, item_name: str, config_manager: ConfigManager, parent: QWidget | None = None):
         super().__init__(parent)
         self.setWindowTitle(f"Instalando: {item_name}")
@@ -21,10 +24,10 @@ class InstallationProgressDialog(QDialog):
         self.label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(self.label)
 
-        self.log_output = QListWidget()
-        self.log_output.setSelectionMode(QListWidget.NoSelection)
-        self.log_output.setVerticalScrollMode(QListWidget.ScrollPerPixel)
-        self.log_output.setWordWrap(True)
+        self.log_output = QPlainTextEdit()
+        self.log_output.setReadOnly(True)
+        self.log_output.setUndoRedoEnabled(False)
+        self.log_output.setMaximumBlockCount(self.MAX_LOG_LINES)
         main_layout.addWidget(self.log_output)
 
         self.close_button = QPushButton("Cerrar")
@@ -37,8 +40,17 @@ class InstallationProgressDialog(QDialog):
 
     def append_log(self, text: str):
         """Añade una línea al log de salida de la consola."""
-        self.log_output.addItem(text)
-        self.log_output.scrollToBottom()
+        self.append_log_lines([text])
+
+    def append_log_lines(self, lines: list[str]):
+        """Añade un lote de líneas de una sola vez, manteniendo el desplazamiento al final solo si ya estaba ahí."""
+        if not lines:
+            return
+        scroll_bar = self.log_output.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 2
+        self.log_output.appendPlainText("\n".join(lines))
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
 
     def set_status(self, status_text: str):
         """Actualiza el texto de estado en el diálogo."""
@@ -0,0 +1,294 @@
+from array import array
+from pathlib import Path
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton,
+                             QTableView, QHeaderView, QCheckBox, QWidget, QAbstractItemView)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PyQt5.QtGui import QFontDatabase
+
+from config_manager import ConfigManager
+from core.log_index import LogIndex
+from threads.log_index_thread import LogIndexThread
+
+class LogLinesModel(QAbstractListModel):
+    """Modelo virtual de líneas de log: cada fila es un desplazamiento y el texto se lee del mmap al pintarla."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_index: LogIndex | None = None
+        self.offsets = array('Q')
+
+    def set_lines(self, index: LogIndex | None, offsets: array):
+        self.beginResetModel()
+        self.log_index = index
+        self.offsets = offsets
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.offsets)
+
+    def data(self, model_index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and self.log_index is not None and model_index.isValid():
+            return self.log_index.line_at(self.offsets[model_index.row()])
+        return None
+
+
+class LogViewerDialog(QDialog):
+    """
+    Visor de los logs de la aplicación (<config>.log y wineprotonmanager.log). Muestra al instante
+    el final del archivo y, mientras tanto, indexa el archivo completo en segundo plano para poder
+    desplazarse por todo él, filtrar por origen ([Install-*], [Backup], ...) y buscar texto.
+    """
+    TAIL_LINES = 5000
+    REFRESH_INTERVAL_MS = 2000
+    ALL_SOURCES = "Todos los orígenes"
+
+    def __init__(self, config_manager: ConfigManager, parent: QWidget | None = None, initial_log: str | None = None):
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self.setWindowTitle("Visor de Logs")
+        self.setMinimumSize(900, 600)
+        self.log_index: LogIndex | None = None
+        self.tail_index: LogIndex | None = None
+        self.index_thread: LogIndexThread | None = None
+        self.setup_ui()
+        self.config_manager.apply_breeze_style_to_widget(self)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh_log)
+        self.refresh_timer.start()
+
+        self.populate_log_files(initial_log)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Log:"))
+        self.combo_logs = QComboBox()
+        self.combo_logs.currentIndexChanged.connect(self.open_selected_log)
+        top_layout.addWidget(self.combo_logs, 1)
+        top_layout.addWidget(QLabel("Origen:"))
+        self.combo_sources = QComboBox()
+        self.combo_sources.addItem(self.ALL_SOURCES)
+        self.combo_sources.currentIndexChanged.connect(lambda: self.apply_filter())
+        top_layout.addWidget(self.combo_sources)
+        self.chk_follow = QCheckBox("Seguir el final")
+        self.chk_follow.setChecked(True)
+        top_layout.addWidget(self.chk_follow)
+        layout.addLayout(top_layout)
+
+        self.model = LogLinesModel(self)
+        # QTableView con filas de altura fija no recorre el modelo entero (QListView/QTreeView sí, fila a fila)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+        self.view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.verticalHeader().hide()
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(self.view.fontMetrics().height() + 2)
+        layout.addWidget(self.view)
+
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Buscar en el log...")
+        self.search_edit.returnPressed.connect(self.find_next)
+        search_layout.addWidget(self.search_edit, 1)
+        self.chk_case = QCheckBox("Distinguir mayúsculas")
+        search_layout.addWidget(self.chk_case)
+        self.btn_find_previous = QPushButton("Anterior")
+        self.btn_find_previous.setAutoDefault(False)
+        self.btn_find_previous.clicked.connect(self.find_previous)
+        search_layout.addWidget(self.btn_find_previous)
+        self.btn_find_next = QPushButton("Siguiente")
+        self.btn_find_next.setAutoDefault(False)
+        self.btn_find_next.clicked.connect(self.find_next)
+        search_layout.addWidget(self.btn_find_next)
+        self.btn_end = QPushButton("Ir al Final")
+        self.btn_end.setAutoDefault(False)
+        self.btn_end.clicked.connect(self.view.scrollToBottom)
+        search_layout.addWidget(self.btn_end)
+        layout.addLayout(search_layout)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+    def populate_log_files(self, initial_log: str | None):
+        log_files = sorted(self.config_manager.log_dir.glob("*.log"), key=lambda p: p.stat().st_mtime, reverse=True)
+        self.combo_logs.blockSignals(True)
+        self.combo_logs.clear()
+        for log_file in log_files:
+            self.combo_logs.addItem(log_file.name, str(log_file))
+        if initial_log:
+            position = self.combo_logs.findText(initial_log)
+            if position >= 0:
+                self.combo_logs.setCurrentIndex(position)
+        self.combo_logs.blockSignals(False)
+        self.open_selected_log()
+
+    def open_selected_log(self):
+        self._stop_index_thread()
+        self._close_indexes()
+        self.combo_sources.blockSignals(True)
+        self.combo_sources.clear()
+        self.combo_sources.addItem(self.ALL_SOURCES)
+        self.combo_sources.blockSignals(False)
+
+        log_path = self.combo_logs.currentData()
+        if not log_path:
+            self.model.set_lines(None, array('Q'))
+            self.status_label.setText("No hay logs.")
+            return
+
+        self.config_manager.flush_logs()
+        # Final del archivo al instante, sin esperar al índice completo
+        self.tail_index = LogIndex(Path(log_path))
+        self.model.set_lines(self.tail_index, self.tail_index.tail_offsets(self.TAIL_LINES))
+        self.view.scrollToBottom()
+        self.status_label.setText(f"Mostrando las últimas {self.model.rowCount()} líneas. Indexando el archivo completo...")
+        self._set_search_enabled(False)
+
+        self.index_thread = LogIndexThread(Path(log_path))
+        self.index_thread.index_ready.connect(self.on_index_ready)
+        self.index_thread.index_failed.connect(self.on_index_failed)
+        self.index_thread.start()
+
+    def on_index_ready(self, index: LogIndex | None):
+        if self.sender() is not self.index_thread:
+            if index:
+                index.close() # Resultado de un log que ya no está seleccionado
+            return
+        self.index_thread = None
+        if index is None:
+            return
+        if self.tail_index:
+            self.tail_index.close()
+            self.tail_index = None
+        self.log_index = index
+        self._update_sources()
+        self.apply_filter()
+        self._set_search_enabled(True)
+
+    def on_index_failed(self, error_msg: str):
+        """El índice completo no se pudo construir: se mantiene la vista del final del archivo, sin búsqueda."""
+        if self.sender() is not self.index_thread:
+            return
+        self.index_thread = None
+        self.status_label.setText(f"Mostrando las últimas {self.model.rowCount()} líneas. No se pudo indexar el archivo completo "
+                                  f"(búsqueda y filtro no disponibles): {error_msg}")
+
+    def refresh_log(self):
+        """Incorpora lo escrito en el log desde la última vez (solo indexa lo nuevo)."""
+        if self.log_index is None:
+            return
+        self.config_manager.flush_logs(timeout=0.5)
+        previous_file = (self.log_index.inode, self.log_index.size)
+        self.log_index.build()
+        if (self.log_index.inode, self.log_index.size) != previous_file: # Texto nuevo, o log rotado
+            self._update_sources()
+            self.apply_filter(keep_position=not self.chk_follow.isChecked())
+
+    def apply_filter(self, keep_position: bool = False):
+        if self.log_index is None:
+            return
+        current_offset = self._current_offset() if keep_position else None
+        source = self.combo_sources.currentText()
+        if source and source != self.ALL_SOURCES:
+            offsets = self.log_index.filtered_offsets({source})
+        else:
+            offsets = self.log_index.line_offsets
+        self.model.set_lines(self.log_index, offsets)
+        if current_offset is not None:
+            self._select_row(LogIndex.row_for_offset(offsets, current_offset), scroll=False)
+        else:
+            self.view.scrollToBottom()
+        self.status_label.setText(f"{len(offsets)} línea(s) de {self.log_index.line_count()} ({self.log_index.size / (1024 * 1024):.1f} MB).")
+
+    def find_next(self):
+        self._find(backwards=False)
+
+    def find_previous(self):
+        self._find(backwards=True)
+
+    def _find(self, backwards: bool):
+        text = self.search_edit.text()
+        if self.log_index is None or not text:
+            return
+        offsets = self.model.offsets
+        current = self._current_offset()
+        if current is None:
+            start = self.log_index.size if backwards else 0
+        else:
+            row = LogIndex.row_for_offset(offsets, current)
+            start = current if backwards else (offsets[row + 1] if row + 1 < len(offsets) else self.log_index.size)
+
+        # Con un filtro activo, seguir buscando hasta dar con una línea visible
+        while True:
+            match = self.log_index.search(text, start, backwards=backwards, case_sensitive=self.chk_case.isChecked())
+            if match is None:
+                self.status_label.setText(f"No se encontró '{text}'.")
+                return
+            row = LogIndex.row_for_offset(offsets, match)
+            if row < len(offsets) and offsets[row] == match:
+                self.chk_follow.setChecked(False)
+                self._select_row(row)
+                return
+            start = match if backwards else self._next_line_offset(match)
+
+    def _next_line_offset(self, offset: int) -> int:
+        row = LogIndex.row_for_offset(self.log_index.line_offsets, offset)
+        offsets = self.log_index.line_offsets
+        return offsets[row + 1] if row + 1 < len(offsets) else self.log_index.size
+
+    def _current_offset(self) -> int | None:
+        selected = self.view.selectionModel().selectedIndexes()
+        if not selected:
+            return None
+        return self.model.offsets[selected[0].row()]
+
+    def _select_row(self, row: int, scroll: bool = True):
+        if not 0 <= row < self.model.rowCount():
+            return
+        model_index = self.model.index(row)
+        self.view.setCurrentIndex(model_index)
+        if scroll:
+            self.view.scrollTo(model_index, QAbstractItemView.PositionAtCenter)
+
+    def _update_sources(self):
+        current = self.combo_sources.currentText()
+        known = {self.combo_sources.itemText(i) for i in range(self.combo_sources.count())}
+        self.combo_sources.blockSignals(True)
+        for family in sorted(self.log_index.families):
+            if family not in known:
+                self.combo_sources.addItem(family)
+        self.combo_sources.setCurrentText(current)
+        self.combo_sources.blockSignals(False)
+
+    def _set_search_enabled(self, enabled: bool):
+        for widget in (self.search_edit, self.btn_find_next, self.btn_find_previous, self.combo_sources):
+            widget.setEnabled(enabled)
+
+    def _stop_index_thread(self):
+        if self.index_thread and self.index_thread.isRunning():
+            self.index_thread.stop()
+            self.index_thread.wait()
+        self.index_thread = None
+
+    def _close_indexes(self):
+        self.model.set_lines(None, array('Q'))
+        for index in (self.log_index, self.tail_index):
+            if index:
+                index.close()
+        self.log_index = None
+        self.tail_index = None
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        self._stop_index_thread()
+        self._close_indexes()
+        super().done(result)
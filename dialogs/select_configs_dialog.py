@@ -0,0 +1,56 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem,
+                             QDialogButtonBox, QWidget, QMessageBox)
+from PyQt5.QtCore import Qt
+
+from config_manager import ConfigManager
+
+class SelectConfigsDialog(QDialog):
+    """Permite elegir en qué configuraciones (prefijos) se instalará la lista actual."""
+
+    def __init__(self, config_manager: ConfigManager, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self.setWindowTitle("Instalar en Varios Entornos")
+        self.setMinimumSize(450, 400)
+        self.setup_ui()
+        self.config_manager.apply_breeze_style_to_widget(self)
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        max_parallel = self.config_manager.get_max_parallel_installs()
+        info_label = QLabel(f"Selecciona las configuraciones destino. Se instalarán hasta <b>{max_parallel}</b> prefijos en paralelo; "
+                            "las instalaciones sobre un mismo prefijo se ejecutan en serie.")
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        self.list_configs = QListWidget()
+        last_used = self.config_manager.configs.get("last_used", "")
+        for name in sorted(self.config_manager.configs.get("configs", {}).keys()):
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if name == last_used else Qt.Unchecked)
+            self.list_configs.addItem(item)
+        layout.addWidget(self.list_configs)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.button(QDialogButtonBox.Ok).setAutoDefault(False)
+        button_box.accepted.connect(self.validate_and_accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        self.setLayout(layout)
+
+    def validate_and_accept(self):
+        if not self.get_selected_configs():
+            QMessageBox.warning(self, "Advertencia", "Selecciona al menos una configuración.")
+            return
+        self.accept()
+
+    def get_selected_configs(self) -> list[str]:
+        """Devuelve los nombres de las configuraciones marcadas."""
+        return [
+            self.list_configs.item(i).text()
+            for i in range(self.list_configs.count())
+            if self.list_configs.item(i).checkState() == Qt.Checked
+        ]
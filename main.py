@@ -2,15 +2,19 @@ import sys
 import ssl
 import traceback
 
+from core.startup_profiler import profiler, watch_first_paint
+
 # Mover estas configuraciones globales aquí
 ssl._create_default_https_context = ssl._create_unverified_context
 sys.setrecursionlimit(3000)
 
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt, QProcess
+with profiler.phase("Importación de módulos"):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt, QProcess, QTimer
 
-from config_manager import ConfigManager
-from ui.main_window import InstallerApp
+    from config_manager import ConfigManager
+    from ui.main_window import InstallerApp
+profiler.record_eager_imports()
 
 def main():
     try:
@@ -20,14 +24,17 @@ def main():
         if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
             QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
-        app = QApplication(sys.argv)
-        app.setStyle("Fusion")
+        with profiler.phase("Creación de QApplication"):
+            app = QApplication(sys.argv)
+            app.setStyle("Fusion")
 
         # Primero, se crea el gestor de configuración
-        config_manager = ConfigManager(None)
+        with profiler.phase("Carga de configuración"):
+            config_manager = ConfigManager(None)
 
         # Luego, se inyecta en la ventana principal
-        installer = InstallerApp(config_manager)
+        with profiler.phase("Construcción de la ventana principal"):
+            installer = InstallerApp(config_manager)
         
         # Se asigna la instancia de la app al config_manager para referencias cruzadas
         config_manager.app_instance = installer
@@ -41,7 +48,23 @@ def main():
         else:
             installer.resize(window_size)
 
-        installer.show()
+        if profiler.enabled:
+            def on_first_paint():
+                profiler.mark("Primer pintado de la ventana")
+                # Cerrar el informe cuando el bucle de eventos quede libre tras el primer pintado
+                QTimer.singleShot(0, finish_profile)
+            def finish_profile():
+                profiler.finish(config_manager.log_dir)
+                if profiler.check_budget:
+                    violations = profiler.budget_violations()
+                    for violation in violations:
+                        print(f"Presupuesto de arranque superado: {violation}")
+                    app.exit(1 if violations else 0)
+            watch_first_paint(installer, on_first_paint)
+
+        with profiler.phase("Mostrar ventana"):
+            installer.show()
+        app.aboutToQuit.connect(config_manager.flush_configs)
         sys.exit(app.exec_())
 
     except Exception as e:
@@ -18,6 +18,9 @@ setup(
         'gui_scripts': [
             'wineprotonmanager=main:main',
         ],
+        'console_scripts': [
+            'wpm=cli:main',
+        ],
     },
     install_requires=open('requirements.txt').read().splitlines(),
     classifiers=[
@@ -0,0 +1,40 @@
+"""
+Presupuesto de arranque: importar la ventana principal no debe cargar diálogos, hilos de trabajo ni vdf
+(se cargan bajo demanda) y la fase de importación debe quedar dentro de IMPORT_BUDGET_MS.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Arranques en frío medidos; se compara el mejor para que una carga puntual del equipo no falle la prueba
+RUNS = 3
+
+# Mide lo mismo que la fase "Importación de módulos" de main.py, en un intérprete nuevo
+IMPORT_SCRIPT = """
+import json, sys, time
+from core.startup_profiler import IMPORT_BUDGET_MS, LAZY_MODULE_PREFIXES
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from config_manager import ConfigManager
+import ui.main_window
+elapsed_ms = (time.perf_counter() - start) * 1000
+eager = sorted(name for name in sys.modules if name.startswith(LAZY_MODULE_PREFIXES) and name not in ("dialogs", "threads"))
+print(json.dumps({"elapsed_ms": elapsed_ms, "budget_ms": IMPORT_BUDGET_MS, "eager": eager}))
+"""
+
+def _measure_import() -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_main_window_import_is_lazy_and_within_budget():
+    measurements = [_measure_import() for _ in range(RUNS)]
+    assert measurements[0]["eager"] == [], f"Módulos que deberían cargarse bajo demanda: {measurements[0]['eager']}"
+    best_ms = min(m["elapsed_ms"] for m in measurements)
+    budget_ms = measurements[0]["budget_ms"]
+    assert best_ms <= budget_ms, f"Importación de la ventana principal: {best_ms:.0f} ms (presupuesto {budget_ms:.0f} ms)"
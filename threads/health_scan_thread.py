@@ -0,0 +1,22 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from config_manager import ConfigManager
+from core.health import HealthScanner
+
+class HealthScanThread(QThread):
+    """Ejecuta un HealthScanner en segundo plano y reenvía sus eventos como señales de Qt."""
+    report_ready = pyqtSignal(str, dict)
+    finished_scan = pyqtSignal(dict)
+
+    def __init__(self, config_manager: ConfigManager, config_names: list[str] | None = None, max_workers: int = 4):
+        super().__init__()
+        self.config_names = config_names
+        self.scanner = HealthScanner(config_manager, max_workers)
+        self.scanner.report_ready.connect(self.report_ready.emit)
+        self.scanner.finished.connect(self.finished_scan.emit)
+
+    def run(self):
+        self.scanner.run(self.config_names)
+
+    def stop(self):
+        self.scanner.stop()
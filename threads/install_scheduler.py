@@ -0,0 +1,212 @@
+import os
+import time
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from config_manager import ConfigManager
+from threads.installer_thread import InstallerThread
+from threads.prefetch_thread import PrefetchThread
+
+class InstallJob:
+    """Cola de instalación para una configuración concreta (un prefijo)."""
+
+    def __init__(self, config_name: str, items: list[tuple[str, str, str]], env: dict):
+        self.config_name = config_name
+        self.items = items
+        self.env = env
+        self.prefix_key = os.path.realpath(env.get("WINEPREFIX", ""))
+        self.state = "Pendiente"
+        self.thread: InstallerThread | None = None
+        self.item_status: dict[str, str] = {}
+        self.summary: dict = {}
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+    def duration(self) -> float:
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+
+class InstallScheduler(QObject):
+    """
+    Planificador de instalaciones para varias configuraciones a la vez.
+    Los trabajos de prefijos distintos se ejecutan en paralelo hasta el límite global de concurrencia;
+    los trabajos que comparten prefijo (y por tanto wineserver) se ejecutan de uno en uno.
+    """
+    job_started = pyqtSignal(str)
+    job_progress = pyqtSignal(str, str, str)
+    job_item_error = pyqtSignal(str, str, str)
+    job_error = pyqtSignal(str, str)
+    job_canceled = pyqtSignal(str, str)
+    job_console_output = pyqtSignal(str, list)
+    job_finished = pyqtSignal(str, dict)
+    all_finished = pyqtSignal(dict)
+    prefetch_progress = pyqtSignal(str)
+
+    def __init__(self, config_manager: ConfigManager, max_concurrent: int = 2, parent: QObject | None = None):
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self.max_concurrent = max(1, max_concurrent)
+        self.jobs: dict[str, InstallJob] = {}
+        self._pending: list[str] = []
+        self._active: dict[str, InstallJob] = {}
+        self._canceling = False
+        self._prefetch_thread: PrefetchThread | None = None
+        self._prefetching = False
+
+    def add_job(self, config_name: str, items: list[tuple[str, str, str]], env: dict,
+                silent_mode: bool, force_mode: bool, winetricks_path: str):
+        """Añade la cola de instalación de una configuración. Debe llamarse antes de start()."""
+        if config_name in self.jobs:
+            raise ValueError(f"Ya existe un trabajo de instalación para la configuración '{config_name}'.")
+
+        job = InstallJob(config_name, items, env)
+        job.thread = InstallerThread(
+            items, env,
+            silent_mode=silent_mode,
+            force_mode=force_mode,
+            winetricks_path=winetricks_path,
+            config_manager=self.config_manager,
+            config_name=config_name
+        )
+        job.thread.progress.connect(lambda name, status, c=config_name: self._on_progress(c, name, status))
+        job.thread.item_error.connect(lambda name, msg, c=config_name: self.job_item_error.emit(c, name, msg))
+        job.thread.error.connect(lambda msg, c=config_name: self.job_error.emit(c, msg))
+        job.thread.canceled.connect(lambda name, c=config_name: self.job_canceled.emit(c, name))
+        job.thread.console_output.connect(lambda lines, c=config_name: self.job_console_output.emit(c, lines))
+        job.thread.batch_completed.connect(lambda summary, c=config_name: self._on_job_completed(c, summary))
+
+        self.jobs[config_name] = job
+        self._pending.append(config_name)
+
+    def set_prefetch(self, verbs: set[str], winetricks_path: str):
+        """Antes de instalar, descarga en paralelo a la caché W_CACHE lo que necesitan estos verbos de winetricks."""
+        if not verbs:
+            return
+        self._prefetch_thread = PrefetchThread(verbs, winetricks_path, self.config_manager)
+        self._prefetch_thread.progress.connect(self.prefetch_progress.emit)
+        self._prefetch_thread.finished.connect(self._on_prefetch_finished)
+
+    def start(self):
+        """Ejecuta la precarga (si la hay) e inicia tantos trabajos como permita el límite de concurrencia."""
+        self.config_manager.write_to_log("wineprotonmanager", "Scheduler", f"Iniciando {len(self._pending)} trabajo(s) de instalación (máximo {self.max_concurrent} en paralelo).")
+        if self._prefetch_thread:
+            self._prefetching = True
+            self._prefetch_thread.start()
+            return
+        self._schedule_next()
+
+    def is_running(self) -> bool:
+        return bool(self._pending or self._active or self._prefetching)
+
+    def _on_prefetch_finished(self, prefetch_summary: dict):
+        self._prefetching = False
+        self._schedule_next()
+        self._check_all_finished()
+
+    def cancel_job(self, config_name: str):
+        """Cancela un trabajo: si está en cola se descarta, si está en curso se detiene su proceso."""
+        job = self.jobs.get(config_name)
+        if not job:
+            return
+        if config_name in self._pending:
+            self._pending.remove(config_name)
+            job.state = "Cancelado"
+            for _, _, item_name in job.items:
+                job.item_status.setdefault(item_name, "Omitido")
+            self.job_finished.emit(config_name, self._job_summary(job))
+            self._check_all_finished()
+        elif config_name in self._active and job.thread:
+            job.state = "Cancelando"
+            job.thread.stop()
+
+    def cancel_all(self):
+        """Cancela todos los trabajos en cola y en curso."""
+        self._canceling = True
+        if self._prefetch_thread and self._prefetching:
+            self._prefetch_thread.stop()
+        for config_name in list(self._pending):
+            self.cancel_job(config_name)
+        for config_name in list(self._active):
+            self.cancel_job(config_name)
+
+    def wait(self, msecs: int = 5000) -> bool:
+        """Espera a que terminen los hilos activos. Devuelve False si alguno sigue en ejecución."""
+        all_stopped = True
+        if self._prefetch_thread and not self._prefetch_thread.wait(msecs):
+            all_stopped = False
+        for job in list(self._active.values()):
+            if job.thread and not job.thread.wait(msecs):
+                all_stopped = False
+        return all_stopped
+
+    def summary(self) -> dict:
+        """Devuelve un resumen por trabajo y global."""
+        jobs_summary = {name: self._job_summary(job) for name, job in self.jobs.items()}
+        return {
+            "jobs": jobs_summary,
+            "installed": sum(j["installed"] for j in jobs_summary.values()),
+            "failed": sum(j["failed"] for j in jobs_summary.values()),
+            "canceled": self._canceling or any(j["state"] == "Cancelado" for j in jobs_summary.values()),
+        }
+
+    def _job_summary(self, job: InstallJob) -> dict:
+        installed = sum(1 for s in job.item_status.values() if s == "Finalizado")
+        failed = sum(1 for s in job.item_status.values() if s in ("Error", "Cancelado"))
+        return {
+            "state": job.state,
+            "installed": installed,
+            "failed": failed,
+            "skipped": len(job.items) - installed - failed,
+            "error": job.summary.get("error"),
+            "duration": job.duration(),
+            "item_status": dict(job.item_status),
+        }
+
+    def _schedule_next(self):
+        if self._canceling:
+            return
+        busy_prefixes = {job.prefix_key for job in self._active.values()}
+        for config_name in list(self._pending):
+            if len(self._active) >= self.max_concurrent:
+                break
+            job = self.jobs[config_name]
+            if job.prefix_key in busy_prefixes:
+                continue # Otro trabajo usa el mismo prefijo (mismo wineserver): esperar
+            self._pending.remove(config_name)
+            self._active[config_name] = job
+            busy_prefixes.add(job.prefix_key)
+            job.state = "Instalando"
+            job.started_at = time.monotonic()
+            self.job_started.emit(config_name)
+            job.thread.start()
+
+    def _on_progress(self, config_name: str, item_name: str, status: str):
+        job = self.jobs.get(config_name)
+        if job:
+            job.item_status[item_name] = status
+        self.job_progress.emit(config_name, item_name, status)
+
+    def _on_job_completed(self, config_name: str, thread_summary: dict):
+        job = self._active.pop(config_name, None)
+        if not job:
+            return
+        job.summary = thread_summary
+        job.finished_at = time.monotonic()
+        if thread_summary.get("canceled"):
+            job.state = "Cancelado"
+        elif thread_summary.get("error") or thread_summary.get("failed"):
+            job.state = "Error"
+        else:
+            job.state = "Finalizado"
+
+        job_summary = self._job_summary(job)
+        self.config_manager.write_to_log(config_name, "Scheduler", f"Trabajo de instalación terminado ({job.state}) en {job_summary['duration']:.1f} s: {job_summary['installed']} instalado(s), {job_summary['failed']} con error.")
+        self.job_finished.emit(config_name, job_summary)
+
+        self._schedule_next()
+        self._check_all_finished()
+
+    def _check_all_finished(self):
+        if not self._pending and not self._active and not self._prefetching:
+            self.all_finished.emit(self.summary())
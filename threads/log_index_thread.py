@@ -0,0 +1,30 @@
+from pathlib import Path
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.log_index import LogIndex
+
+class LogIndexThread(QThread):
+    """Construye en segundo plano el índice de líneas de un log (puede tener cientos de MB)."""
+    index_ready = pyqtSignal(object) # LogIndex, o None si se canceló
+    index_failed = pyqtSignal(str)   # Mensaje de error si no se pudo leer el archivo
+
+    def __init__(self, log_path: Path):
+        super().__init__()
+        self.log_path = Path(log_path)
+        self._is_running = True
+
+    def run(self):
+        index = LogIndex(self.log_path)
+        try:
+            completed = index.build(lambda: self._is_running)
+        except (OSError, ValueError) as e:
+            index.close()
+            self.index_failed.emit(str(e))
+            return
+        if not completed:
+            index.close()
+            index = None
+        self.index_ready.emit(index)
+
+    def stop(self):
+        self._is_running = False
@@ -0,0 +1,21 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from config_manager import ConfigManager
+from core.prefetch import WinetricksPrefetch
+
+class PrefetchThread(QThread):
+    """Ejecuta una WinetricksPrefetch en segundo plano y reenvía sus eventos como señales de Qt."""
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, verbs: set[str], winetricks_path: str, config_manager: ConfigManager, max_workers: int = 4):
+        super().__init__()
+        self.prefetch = WinetricksPrefetch(verbs, winetricks_path, config_manager, max_workers)
+        self.prefetch.progress.connect(self.progress.emit)
+        self.prefetch.finished.connect(self.finished.emit)
+
+    def run(self):
+        self.prefetch.run()
+
+    def stop(self):
+        self.prefetch.stop()
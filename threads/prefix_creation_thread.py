@@ -0,0 +1,31 @@
+from pathlib import Path
+from PyQt5.QtCore import QThread, QEventLoop, pyqtSignal
+
+from config_manager import ConfigManager
+from core.prefix_creation import PrefixCreator
+
+class PrefixCreationThread(QThread):
+    """Ejecuta un PrefixCreator en segundo plano y reenvía sus eventos como señales de Qt."""
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, env: dict, prefix_path: Path, config_manager: ConfigManager, config_name: str, use_template: bool = True):
+        super().__init__()
+        self.creator = PrefixCreator(env, prefix_path, config_manager, config_name, use_template)
+        self.creator.progress.connect(self.progress.emit)
+        self.creator.finished.connect(self.finished.emit)
+
+    def run(self):
+        self.creator.run()
+
+    def wait_until_done(self) -> tuple[bool, str]:
+        """Ejecuta el hilo y espera su resultado sin bloquear la interfaz (bucle de eventos local)."""
+        result = [False, ""]
+        loop = QEventLoop()
+        def on_finished(ok: bool, message: str):
+            result[0], result[1] = ok, message
+        self.finished.connect(on_finished)
+        self.finished.connect(loop.quit)
+        self.start()
+        loop.exec_()
+        return result[0], result[1]
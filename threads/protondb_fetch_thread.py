@@ -0,0 +1,24 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.protondb import ProtonDBFetcher, RatingCache
+
+class ProtonDBFetchThread(QThread):
+    """Ejecuta un ProtonDBFetcher en segundo plano y reenvía sus tandas de resultados como señales de Qt."""
+    ratings_ready = pyqtSignal(list)
+
+    def __init__(self, cache: RatingCache | None = None):
+        super().__init__()
+        self.fetcher = ProtonDBFetcher(cache)
+        self.fetcher.results_ready.connect(self.ratings_ready.emit)
+
+    def run(self):
+        self.fetcher.run()
+
+    def request(self, appids):
+        self.fetcher.request(appids)
+
+    def cancel(self):
+        self.fetcher.cancel()
+
+    def stop(self):
+        self.fetcher.stop()
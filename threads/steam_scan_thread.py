@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.steam_library import SteamLibraryScan
+from core.steam_manifest_cache import ManifestCache
+
+class SteamScanThread(QThread):
+    """Ejecuta un SteamLibraryScan en segundo plano y reenvía sus eventos como señales de Qt."""
+    tools_ready = pyqtSignal(list)
+    games_found = pyqtSignal(list)
+    error = pyqtSignal(str)
+    finished_scan = pyqtSignal(dict)
+
+    def __init__(self, steam_root: Path, manifest_cache: ManifestCache):
+        super().__init__()
+        self.scan = SteamLibraryScan(steam_root, manifest_cache)
+        self.scan.tools_ready.connect(self.tools_ready.emit)
+        self.scan.games_found.connect(self.games_found.emit)
+        self.scan.error.connect(self.error.emit)
+        self.scan.finished.connect(self.finished_scan.emit)
+
+    def run(self):
+        self.scan.run()
+
+    def stop(self):
+        self.scan.stop()
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.steam_manifest_cache import ManifestCache
+from core.steam_watcher import SteamLibraryWatcher
+
+class SteamWatchThread(QThread):
+    """Ejecuta un SteamLibraryWatcher en segundo plano y reenvía sus eventos como señales de Qt."""
+    games_changed = pyqtSignal(list, list)
+    tools_changed = pyqtSignal(list)
+
+    def __init__(self, steam_root: Path, manifest_cache: ManifestCache):
+        super().__init__()
+        self.watcher = SteamLibraryWatcher(steam_root, manifest_cache)
+        self.watcher.games_changed.connect(self.games_changed.emit)
+        self.watcher.tools_changed.connect(self.tools_changed.emit)
+
+    def run(self):
+        self.watcher.run()
+
+    def stop(self):
+        self.watcher.stop()
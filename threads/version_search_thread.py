@@ -1,7 +1,8 @@
-import json
-from urllib.request import urlopen, Request, HTTPError
+from urllib.request import HTTPError
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from core.downloads import fetch_releases
+
 class VersionSearchThread(QThread):
     progress = pyqtSignal(int) 
     new_release = pyqtSignal(str, str, str, object, str) 
@@ -22,29 +23,9 @@ class VersionSearchThread(QThread):
                 self.progress.emit(int(fetched_count * 100 / total_repos))
                 continue
 
-            url = repo["url"]
             try:
-                req = Request(url, headers={'User-Agent': 'Mozilla/5.0 WineProtonManager'}) 
-                with urlopen(req, timeout=10) as response:
-                    if response.getcode() != 200:
-                        raise HTTPError(url, response.getcode(), response.reason, response.headers, None)
-
-                    releases = json.loads(response.read().decode())
-
-                    for release in releases:
-                        if release.get("draft", False) or release.get("prerelease", False):
-                            continue 
-
-                        version = release["tag_name"]
-                        assets = [a for a in release["assets"] if any(a["name"].endswith(ext) for ext in ['.tar.gz', '.tar.xz', '.zip', '.tar.bz2', '.tar.zst'])]
-
-                        if not assets:
-                            continue 
-
-                        release_name = release.get("name", version)
-                        published_at = release.get("published_at", "")
-
-                        self.new_release.emit(self.repo_type, release_name, version, assets, published_at)
+                for release_name, version, assets, published_at in fetch_releases(repo):
+                    self.new_release.emit(self.repo_type, release_name, version, assets, published_at)
 
             except HTTPError as e:
                 self.error.emit(f"Error HTTP del repositorio '{repo['name']}': {e.code} - {e.reason}")
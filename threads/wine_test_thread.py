@@ -0,0 +1,44 @@
+from pathlib import Path
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from config_manager import ConfigManager
+from core.process_runner import ProcessRunner
+
+class WineTestThread(QThread):
+    """
+    Prueba una configuración (aún sin guardar) en segundo plano: resuelve su entorno y ejecuta
+    'wine --version', para que un Wine colgado no congele el diálogo.
+    """
+    result_ready = pyqtSignal(object) # ProcessResult de 'wine --version'
+    error = pyqtSignal(str)
+    TIMEOUT = 10
+
+    def __init__(self, config_manager: ConfigManager, config: dict):
+        super().__init__()
+        self.config_manager = config_manager
+        self.config = config
+        self.runner: ProcessRunner | None = None
+        self._is_running = True
+
+    def run(self):
+        try:
+            env = self.config_manager.build_environment(self.config)
+            wine_executable = env.get("WINE")
+            if not wine_executable or not Path(wine_executable).is_file():
+                raise FileNotFoundError(f"Ejecutable de Wine no encontrado en la ruta especificada o en el PATH del sistema: {wine_executable}")
+            self.runner = ProcessRunner([wine_executable, "--version"], env=env, timeout=self.TIMEOUT, merge_stderr=False)
+            if not self._is_running:
+                return
+            result = self.runner.run()
+        except FileNotFoundError as e:
+            self.error.emit(f"Error de archivo: {str(e)}")
+        except Exception as e:
+            self.error.emit(f"Error inesperado durante la prueba: {str(e)}")
+        else:
+            if not result.canceled:
+                self.result_ready.emit(result)
+
+    def stop(self):
+        self._is_running = False
+        if self.runner:
+            self.runner.cancel()
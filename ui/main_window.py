@@ -1,10 +1,10 @@
 import sys
 import shutil
-import vdf
 import subprocess
-import time
 import re
+import time
 
+from collections import deque
 from functools import wraps
 from pathlib import Path
 
@@ -18,27 +18,37 @@ from PyQt5.QtGui import QIcon, QPalette, QColor, QDesktopServices
 # Importaciones de tus módulos
 from config_manager import ConfigManager
 from styles import STYLE_BREEZE, COLOR_BREEZE_PRIMARY # Importa solo lo necesario
-from dialogs.config_dialog import ConfigDialog
-from dialogs.custom_program_dialog import CustomProgramDialog
-from dialogs.manage_programs_dialog import ManageProgramsDialog
-from dialogs.select_groups_dialog import SelectGroupsDialog
-from dialogs.installation_progress_dialog import InstallationProgressDialog
-from threads.installer_thread import InstallerThread
-from threads.backup_thread import BackupThread
-from threads.protondb_thread import ProtonDBThread
+from core.backup import backup_source_path, backup_destination_path
+from core.prefix_index import get_install_index
+from core.startup_profiler import profiler
+from core.winetricks_planner import InstallPlan, plan_installation, load_verb_dependencies
+
+# Tiempo máximo por turno del bucle de eventos dedicado a crear filas de la tabla de juegos de Steam
+STEAM_FILL_BUDGET_MS = 30
 
 class InstallerApp(QWidget):
     def __init__(self, config_manager: ConfigManager):
         super().__init__()
         self.config_manager = config_manager
-        self.installer_thread = None
+        self.install_scheduler = None
+        self.install_item_results: dict[str, dict[str, str]] = {}
         self.backup_thread = None
         self.installation_progress_dialog = None
         self.backup_progress_dialog = None
 
-        self.steam_root = self._locate_steam_root()
+        with profiler.phase("Localizar Steam"):
+            self.steam_root = self._locate_steam_root()
         self.available_proton_versions = []
         self.steam_games_data = {}
+        self.steam_scan_thread = None
+        self.steam_watch_thread = None
+        self.protondb_thread = None # Un único hilo para las calificaciones de todos los juegos (ver _request_protondb_ratings)
+        # Juegos recibidos del análisis que aún no están en la tabla: se añaden por partes entre eventos
+        self._pending_steam_games: deque[dict] = deque()
+        self._steam_scan_summary = None
+        self._steam_fill_timer = QTimer(self)
+        self._steam_fill_timer.setSingleShot(True)
+        self._steam_fill_timer.timeout.connect(self._fill_steam_games_table)
 
         self.worker_threads = []
 
@@ -48,9 +58,12 @@ class InstallerApp(QWidget):
         self.force_mode = self.config_manager.get_force_winetricks_install()
         self.ask_for_backup_before_action = self.config_manager.get_ask_for_backup_before_action()
 
-        self.apply_theme_at_startup()
-        self.setup_ui()
-        self.config_manager.apply_breeze_style_to_widget(self)
+        with profiler.phase("Tema inicial"):
+            self.apply_theme_at_startup()
+        with profiler.phase("Construcción de la interfaz"):
+            self.setup_ui()
+        with profiler.phase("Estilo Breeze"):
+            self.config_manager.apply_breeze_style_to_widget(self)
         self.setMinimumSize(1000, 700)
         self.update_installation_button_state()
 
@@ -97,8 +110,10 @@ class InstallerApp(QWidget):
         content = QWidget()
         content_layout = QHBoxLayout(content)
 
-        content_layout.addWidget(self.create_left_panel(), 1) 
-        content_layout.addWidget(self.create_right_panel(), 2) 
+        with profiler.phase("Panel izquierdo"):
+            content_layout.addWidget(self.create_left_panel(), 1) 
+        with profiler.phase("Panel derecho"):
+            content_layout.addWidget(self.create_right_panel(), 2) 
         scroll.setWidget(content)
         main_layout.addWidget(scroll)
 
@@ -112,13 +127,18 @@ class InstallerApp(QWidget):
         config_layout = QVBoxLayout()
         self.lbl_config = QLabel()
         self.lbl_config.setWordWrap(True)
-        self.update_config_info() 
+        with profiler.phase("Información del entorno (update_config_info)"):
+            self.update_config_info() 
 
         self.btn_manage_environments = QPushButton("Gestionar Entornos")
         self.btn_manage_environments.setAutoDefault(False)
         self.btn_manage_environments.clicked.connect(self.configure_environments)
+        self.btn_view_logs = QPushButton("Ver Logs")
+        self.btn_view_logs.setAutoDefault(False)
+        self.btn_view_logs.clicked.connect(self.open_log_viewer)
         config_layout.addWidget(self.lbl_config)
         config_layout.addWidget(self.btn_manage_environments)
+        config_layout.addWidget(self.btn_view_logs)
         config_group.setLayout(config_layout)
         layout.addWidget(config_group)
 
@@ -173,12 +193,18 @@ class InstallerApp(QWidget):
         self.btn_install.clicked.connect(self.start_installation)
         self.btn_install.setEnabled(False) 
 
+        self.btn_install_multi = QPushButton("Instalar en Varios Entornos...")
+        self.btn_install_multi.setAutoDefault(False)
+        self.btn_install_multi.clicked.connect(self.start_multi_config_installation)
+        self.btn_install_multi.setEnabled(False)
+
         self.btn_cancel = QPushButton("Cancelar Instalación")
         self.btn_cancel.setAutoDefault(False)
         self.btn_cancel.clicked.connect(self.cancel_installation)
         self.btn_cancel.setEnabled(False) 
 
         actions_layout.addWidget(self.btn_install)
+        actions_layout.addWidget(self.btn_install_multi)
         actions_layout.addWidget(self.btn_cancel)
 
         # Grupo de Herramientas del Prefijo
@@ -286,7 +312,8 @@ class InstallerApp(QWidget):
         steam_page_layout = QVBoxLayout(steam_tab_page)
         steam_page_layout.setContentsMargins(10, 10, 10, 10)
 
-        steam_group_box = self.create_steam_games_panel()
+        with profiler.phase("Panel de juegos de Steam"):
+            steam_group_box = self.create_steam_games_panel()
         steam_page_layout.addWidget(steam_group_box)
 
         self.right_tabs.addTab(install_tab_page, "Lista de Instalación")
@@ -295,10 +322,6 @@ class InstallerApp(QWidget):
         layout.addWidget(self.right_tabs)
         return panel
 
-    def _convert_to_unsigned(self, signed_id: int) -> int:
-        """Convierte un AppID de 32 bits con signo a su equivalente positivo."""
-        return signed_id & 0xffffffff
-
     def create_steam_games_panel(self) -> QWidget:
         """
         Crea el panel de Juegos de Steam, con la columna APPID oculta,
@@ -424,7 +447,8 @@ class InstallerApp(QWidget):
             except FileNotFoundError:
                 QMessageBox.warning(self, "Error al reiniciar", "No se pudo reiniciar Steam automáticamente. Por favor, inícialo manually.")
 
-            self._load_steam_games()
+            if not (self.steam_watch_thread and self.steam_watch_thread.isRunning()):
+                self._load_steam_games() # Con la vigilancia activa, la tabla se actualiza al cambiar config.vdf
         else:
             self._load_steam_games()
 
@@ -462,172 +486,184 @@ class InstallerApp(QWidget):
         Obtiene la lista de TODAS las herramientas de compatibilidad de Proton disponibles:
         - Versiones personalizadas (GE-Proton) desde 'compatibilitytools.d'.
         - Versiones oficiales de Steam (Proton 8.0, Experimental, etc.) desde los manifiestos.
+        Normalmente ya la ha enviado el análisis de la biblioteca (ver _on_steam_tools_ready).
         """
+        from core.steam_library import available_proton_versions, library_paths
         if self.available_proton_versions:
             return self.available_proton_versions
         if not self.steam_root:
             return []
-
-        # Usamos un set para manejar automáticamente los duplicados
-        versions = {"default"}
-
-        # Buscar versiones personalizadas (como GE-Proton)
-        compat_dir = self.steam_root / "compatibilitytools.d"
-        if compat_dir.exists():
-            for entry in compat_dir.iterdir():
-                if entry.is_dir() and (entry / "toolmanifest.vdf").exists():
-                    versions.add(entry.name)
-
-        # Buscar versiones oficiales de Steam
-        library_folders_vdf_path = self.steam_root / "steamapps/libraryfolders.vdf"
-        lib_paths = {self.steam_root} 
-        if library_folders_vdf_path.exists():
-            try:
-                with open(library_folders_vdf_path, 'r', encoding='utf-8') as f:
-                    lib_folders_data = vdf.load(f)
-                for lib_info in lib_folders_data.get("libraryfolders", {}).values():
-                    if "path" in lib_info and Path(lib_info["path"]).exists():
-                        lib_paths.add(Path(lib_info["path"]))
-            except Exception as e:
-                print(f"Advertencia: No se pudo parsear libraryfolders.vdf: {e}")
-
-        for lib_path in lib_paths:
-            steamapps_path = lib_path / "steamapps"
-            if not steamapps_path.exists():
-                continue
-
-            for acf_file in steamapps_path.glob("appmanifest_*.acf"):
-                try:
-                    with open(acf_file, 'r', encoding='utf-8') as f:
-                        app_data = vdf.load(f).get("AppState", {})
-                    
-                    name = app_data.get("name")
-                    if name and "proton" in name.lower():
-                        versions.add(name)
-                except Exception:
-                    continue
-        
-        # Ordenar la lista de forma "natural" para que las versiones aparezcan correctamente
-        sorted_versions = sorted(list(versions), key=lambda s: [int(t) if t.isdigit() else t.lower() for t in re.split('([0-9]+)', s)], reverse=True)
-
-        if 'default' in sorted_versions:
-            sorted_versions.remove('default')
-            sorted_versions.append('default')
-
-        self.available_proton_versions = sorted_versions
+        self.available_proton_versions = available_proton_versions(self.steam_root, library_paths(self.steam_root),
+                                                                   self._steam_manifest_cache())
         return self.available_proton_versions
 
-    def _load_steam_games(self):
-        """Orquesta la carga de juegos de Steam y Non-Steam en la tabla."""
-        self.btn_load_steam_games.setEnabled(False)
-        self.btn_load_steam_games.setText("Cargando...")
-        self.btn_apply_steam_changes.setEnabled(False)
-        QTimer.singleShot(100, self._execute_steam_games_load) # Ejecutar la carga tras actualizar la UI
+    def _steam_manifest_cache(self):
+        """Caché de appmanifest ya leídos, compartida por los análisis de esta sesión (ver core.steam_manifest_cache)."""
+        from core.steam_manifest_cache import get_manifest_cache, CACHE_FILENAME
+        return get_manifest_cache(self.config_manager.config_dir / "cache" / CACHE_FILENAME)
 
-    def _execute_steam_games_load(self):
-        """Realiza la carga real de los juegos de Steam."""
+    def _load_steam_games(self):
+        """
+        Carga los juegos de Steam y Non-Steam en la tabla. El análisis de las bibliotecas se hace en un
+        hilo que envía los juegos por tandas; si ya había uno en curso, se cancela.
+        """
+        from threads.steam_scan_thread import SteamScanThread
         if not self.steam_root:
             QMessageBox.warning(self, "Steam no encontrado", "No se pudo localizar el directorio raíz de Steam.")
             self.steam_status_label.setText("Error: Directorio raíz de Steam no encontrado.")
-            self.btn_load_steam_games.setText("Cargar Juegos de Steam")
-            self.btn_load_steam_games.setEnabled(True)
             return
 
+        self._cancel_steam_scan()
+        self._stop_steam_watch()
+        if self.protondb_thread:
+            self.protondb_thread.cancel()
+        self.btn_apply_steam_changes.setEnabled(False)
         self.steam_status_label.setText("Buscando juegos en bibliotecas de Steam...")
         self.steam_games_table.setRowCount(0)
         self.steam_games_data.clear()
-        processed_appids = set()
+        self._steam_scan_summary = None
+
+        thread = SteamScanThread(self.steam_root, self._steam_manifest_cache())
+        thread.tools_ready.connect(self._on_steam_tools_ready)
+        thread.games_found.connect(self._on_steam_games_found)
+        thread.error.connect(self._on_steam_scan_error)
+        thread.finished_scan.connect(self._on_steam_scan_finished)
+        thread.finished.connect(lambda t=thread: self.worker_threads.remove(t))
+        self.worker_threads.append(thread)
+        self.steam_scan_thread = thread
+        thread.start()
+
+    def _cancel_steam_scan(self, wait: bool = False):
+        """Detiene el análisis en curso; sus tandas pendientes se descartan (ver _is_current_steam_scan)."""
+        if self.steam_scan_thread and self.steam_scan_thread.isRunning():
+            self.steam_scan_thread.stop()
+            if wait:
+                self.steam_scan_thread.wait()
+        self.steam_scan_thread = None
+        self._pending_steam_games.clear()
+        self._steam_fill_timer.stop()
+
+    def _is_current_steam_scan(self) -> bool:
+        return self.sender() is not None and self.sender() is self.steam_scan_thread
+
+    def _on_steam_tools_ready(self, versions: list):
+        if self._is_current_steam_scan():
+            self._set_available_proton_versions(versions)
+
+    def _set_available_proton_versions(self, versions: list):
+        """Herramientas disponibles; si cambian con la tabla ya cargada, se actualizan los desplegables creados."""
+        if versions == self.available_proton_versions:
+            return
+        self.available_proton_versions = versions
+        for row in range(self.steam_games_table.rowCount()):
+            combo = self.steam_games_table.cellWidget(row, 2)
+            if isinstance(combo, QComboBox):
+                self._fill_compat_tool_combo(combo, versions, combo.currentText())
 
-        try:
-            compat_tools_config, global_tool, lib_paths = self._get_steam_config_data()
+    def _on_steam_games_found(self, games: list):
+        if self._is_current_steam_scan():
+            self._pending_steam_games.extend(games)
+            if not self._steam_fill_timer.isActive():
+                self._steam_fill_timer.start(0)
 
-            for lib_path in lib_paths:
-                self._process_steam_library(lib_path, compat_tools_config, global_tool, processed_appids)
+    def _fill_steam_games_table(self):
+        """
+        Añade juegos pendientes a la tabla durante STEAM_FILL_BUDGET_MS como mucho y cede el control al bucle
+        de eventos, aunque el análisis envíe tandas más deprisa de lo que la tabla puede crear filas.
+        """
+        deadline = time.perf_counter() + STEAM_FILL_BUDGET_MS / 1000
+        self.steam_games_table.setUpdatesEnabled(False)
+        try:
+            while self._pending_steam_games and time.perf_counter() < deadline:
+                game = self._pending_steam_games.popleft()
+                self._add_game_to_table(game["appid"], game["name"], game["compat_tool"], game["compat_tool"],
+                                        game["tooltip"], is_steam_game=game["is_steam_game"])
+        finally:
+            self.steam_games_table.setUpdatesEnabled(True)
+        if self._pending_steam_games:
+            self._steam_fill_timer.start(0)
+        elif self._steam_scan_summary is not None:
+            self._finish_steam_games_load()
+            return
+        self.steam_status_label.setText(f"Buscando juegos en bibliotecas de Steam... {self.steam_games_table.rowCount()} encontrados.")
 
-            self._process_non_steam_games(compat_tools_config, global_tool, processed_appids)
+    def _on_steam_scan_error(self, error_msg: str):
+        if self._is_current_steam_scan():
+            QMessageBox.critical(self, "Error al leer archivos de Steam", error_msg)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error al leer archivos de Steam", f"Ocurrió un error general:\n{e}")
+    def _on_steam_scan_finished(self, summary: dict):
+        if not self._is_current_steam_scan():
+            return
+        self.steam_scan_thread = None
+        self._steam_scan_summary = summary
+        if not self._pending_steam_games:
+            self._finish_steam_games_load()
 
+    def _finish_steam_games_load(self):
         game_count = self.steam_games_table.rowCount()
         self.steam_status_label.setText(f"Búsqueda completada. {game_count} juegos encontrados.")
         self.btn_apply_steam_changes.setEnabled(game_count > 0)
-        self.btn_load_steam_games.setText("Cargar Juegos de Steam")
-        self.btn_load_steam_games.setEnabled(True)
+        self._start_steam_watch()
 
-    def _get_steam_config_data(self) -> tuple[dict, str | None, set]:
-        """Lee y parsea los archivos de configuración de Steam para obtener datos necesarios."""
-        config_path = self.steam_root / "config/config.vdf"
-        compat_tools_config = {}
-        global_default_tool = None
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = vdf.load(f)
-            steam_section = config_data.get("InstallConfigStore", {}).get("Software", {}).get("Valve", {}).get("Steam", {})
-            compat_tools_config = steam_section.get("CompatToolMapping", {})
-            global_default_tool = steam_section.get("DefaultCompatTool")
-
-        lib_paths = {self.steam_root}
-        library_folders_path = self.steam_root / "steamapps/libraryfolders.vdf"
-        if library_folders_path.exists():
-            with open(library_folders_path, 'r', encoding='utf-8') as f:
-                lib_folders_data = vdf.load(f)
-            for lib_info in lib_folders_data.get("libraryfolders", {}).values():
-                if "path" in lib_info and Path(lib_info["path"]).exists():
-                    lib_paths.add(Path(lib_info["path"]))
-        return compat_tools_config, global_default_tool, lib_paths
-
-    def _process_steam_library(self, lib_path: Path, compat_config: dict, global_tool: str | None, processed_appids: set):
-        """Procesa una única biblioteca de Steam, buscando juegos en archivos .acf."""
-        steamapps_path = lib_path / "steamapps"
-        if not steamapps_path.exists(): return
-        
-        TOOL_KEYWORDS = ["runtime", "sdk", "redist", "proton", "steamworks"]
-        for acf_file in steamapps_path.glob("appmanifest_*.acf"):
-            try:
-                with open(acf_file, 'r', encoding='utf-8') as f:
-                    game_data = vdf.load(f).get("AppState", {})
-                
-                appid = game_data.get("appid")
-                name = game_data.get("name")
-                
-                if not all([appid, name]) or appid in processed_appids or any(k in name.lower() for k in TOOL_KEYWORDS):
-                    continue
-
-                processed_appids.add(appid)
-                tool_info = compat_config.get(appid, {})
-                tool_name = tool_info.get("name", global_tool or "Nativo/No Proton")
-                self._add_game_to_table(appid, name, tool_name, tool_name, is_steam_game=True)
-            except Exception:
+    def _start_steam_watch(self):
+        """Empieza a vigilar las bibliotecas de Steam (si está activado en los ajustes) tras una carga completa."""
+        from threads.steam_watch_thread import SteamWatchThread
+        if not self.steam_root or not self.config_manager.get_watch_steam_library():
+            return
+        thread = SteamWatchThread(self.steam_root, self._steam_manifest_cache())
+        thread.games_changed.connect(self._on_steam_games_changed)
+        thread.tools_changed.connect(self._on_steam_watch_tools_changed)
+        thread.finished.connect(lambda t=thread: self.worker_threads.remove(t))
+        self.worker_threads.append(thread)
+        self.steam_watch_thread = thread
+        thread.start()
+
+    def _stop_steam_watch(self, wait: bool = False):
+        if self.steam_watch_thread and self.steam_watch_thread.isRunning():
+            self.steam_watch_thread.stop()
+            if wait:
+                self.steam_watch_thread.wait()
+        self.steam_watch_thread = None
+
+    def _is_current_steam_watch(self) -> bool:
+        return self.sender() is not None and self.sender() is self.steam_watch_thread
+
+    def _on_steam_watch_tools_changed(self, versions: list):
+        if self._is_current_steam_watch():
+            self._set_available_proton_versions(versions)
+
+    def _on_steam_games_changed(self, updated: list, removed: list):
+        """Aplica a la tabla los juegos añadidos, modificados y eliminados que ha detectado la vigilancia."""
+        if not self._is_current_steam_watch():
+            return
+        rows_by_appid = {self.steam_games_table.item(row, 1).text(): row for row in range(self.steam_games_table.rowCount())}
+        for row in sorted((rows_by_appid[appid] for appid in removed if appid in rows_by_appid), reverse=True):
+            self.steam_games_table.removeRow(row)
+        for appid in removed:
+            self.steam_games_data.pop(appid, None)
+        if removed:
+            rows_by_appid = {self.steam_games_table.item(row, 1).text(): row for row in range(self.steam_games_table.rowCount())}
+
+        for game in updated:
+            appid = game["appid"]
+            row = rows_by_appid.get(appid)
+            if row is None:
+                self._add_game_to_table(appid, game["name"], game["compat_tool"], game["compat_tool"],
+                                        game["tooltip"], is_steam_game=game["is_steam_game"])
                 continue
+            name_item = self.steam_games_table.item(row, 0)
+            name_item.setText(game["name"])
+            name_item.setToolTip(game["tooltip"] or game["name"])
+            data = self.steam_games_data.setdefault(appid, {'name': game["name"], 'compat_tool': game["compat_tool"], 'original_tool': game["compat_tool"]})
+            combo = self.steam_games_table.cellWidget(row, 2)
+            # Cambio hecho fuera del gestor: se muestra salvo que el usuario tenga un cambio sin aplicar
+            if isinstance(combo, QComboBox) and combo.currentText() == data['original_tool']:
+                self._fill_compat_tool_combo(combo, self._get_available_proton_versions(), game["compat_tool"])
+            data.update({'name': game["name"], 'compat_tool': game["compat_tool"], 'original_tool': game["compat_tool"]})
 
-    def _process_non_steam_games(self, compat_config: dict, global_tool: str | None, processed_appids: set):
-        """Procesa los juegos Non-Steam desde los archivos shortcuts.vdf."""
-        userdata_root = self.steam_root / "userdata"
-        if not userdata_root.exists(): return
-
-        for user_folder in (d for d in userdata_root.iterdir() if d.is_dir() and d.name != "0"):
-            shortcuts_path = user_folder / "config/shortcuts.vdf"
-            if not shortcuts_path.exists(): continue
-            
-            with open(shortcuts_path, "rb") as f:
-                shortcuts_data = vdf.binary_load(f)
-
-            for entry_data in shortcuts_data.get('shortcuts', {}).values():
-                app_name = entry_data.get('AppName')
-                signed_appid = entry_data.get('appid')
-                if not app_name or signed_appid is None: continue
-
-                unsigned_appid = str(self._convert_to_unsigned(signed_appid))
-                if unsigned_appid in processed_appids: continue
-
-                processed_appids.add(unsigned_appid)
-                tool_info = compat_config.get(unsigned_appid, {})
-                
-                tool_name = tool_info.get("name", global_tool or "Predeterminado de Steam")
-
-                tooltip = f"{app_name}\nRuta: {entry_data.get('Exe', 'N/A')}"
-                self._add_game_to_table(unsigned_appid, app_name, tool_name, tool_name, tooltip, is_steam_game=False)
+        game_count = self.steam_games_table.rowCount()
+        self.steam_status_label.setText(f"{game_count} juegos (actualizado {time.strftime('%H:%M:%S')}).")
+        self.btn_apply_steam_changes.setEnabled(game_count > 0)
 
     def _add_game_to_table(self, appid: str, name: str, compat_tool: str, original_tool: str, tooltip: str = "", is_steam_game: bool = True):
         """Añade una fila a la tabla de juegos de Steam."""
@@ -641,11 +677,7 @@ class InstallerApp(QWidget):
         self.steam_games_table.setItem(row, 1, QTableWidgetItem(appid))
 
         combo_proton = QComboBox()
-        versions = self._get_available_proton_versions()
-        if compat_tool not in versions:
-            combo_proton.insertItem(0, compat_tool)
-        combo_proton.addItems(versions)
-        combo_proton.setCurrentText(compat_tool)
+        self._fill_compat_tool_combo(combo_proton, self._get_available_proton_versions(), compat_tool)
         combo_proton.setProperty("appid", appid)
         self.steam_games_table.setCellWidget(row, 2, combo_proton)
 
@@ -654,16 +686,72 @@ class InstallerApp(QWidget):
         self.steam_games_table.setItem(row, 3, db_status_item)
 
         if is_steam_game:
-            thread = ProtonDBThread(appid)
-            thread.db_status_ready.connect(self._update_protondb_rating)
-            thread.finished.connect(lambda t=thread: self.worker_threads.remove(t))
-            self.worker_threads.append(thread)
-            thread.start()
-        
-    def _update_protondb_rating(self, appid: str, rating: str):
+            self._show_protondb_rating(row, appid)
+
+    def _show_protondb_rating(self, row: int, appid: str):
+        """
+        Muestra al momento la calificación guardada en la caché de ProtonDB y pide a la red solo las que
+        no existen o han caducado (según el TTL de los ajustes). En modo sin conexión solo se usa la caché.
+        """
+        from core.protondb import RatingCache, rating_text, RATING_OFFLINE
+        entry = self._protondb_cache().get(appid)
+        if entry:
+            self._update_protondb_rating(row, rating_text(entry["summary"]), entry)
+        if self.config_manager.get_protondb_offline():
+            if not entry:
+                self.steam_games_table.item(row, 3).setText(RATING_OFFLINE)
+        elif not RatingCache.is_fresh(entry, self.config_manager.get_protondb_cache_ttl_hours() * 3600):
+            self._request_protondb_ratings([appid])
+
+    def _protondb_cache(self):
+        """Caché de calificaciones de ProtonDB, compartida con el hilo que las consulta (ver core.protondb)."""
+        from core.protondb import get_rating_cache, CACHE_FILENAME
+        return get_rating_cache(self.config_manager.config_dir / "cache" / CACHE_FILENAME)
+
+    def _request_protondb_ratings(self, appids: list[str]):
+        """Pide las calificaciones al hilo de ProtonDB, que se crea la primera vez y dura toda la sesión."""
+        from threads.protondb_fetch_thread import ProtonDBFetchThread
+        if self.protondb_thread is None:
+            self.protondb_thread = ProtonDBFetchThread(self._protondb_cache())
+            self.protondb_thread.ratings_ready.connect(self._on_protondb_ratings_ready)
+            self.protondb_thread.start()
+        self.protondb_thread.request(appids)
+
+    def _on_protondb_ratings_ready(self, results: list):
+        """
+        Aplica una tanda de resultados (appid, resumen, completada) buscando las filas una sola vez por tanda.
+        Si la consulta falló se mantiene la calificación guardada en la caché, o se indica el error si no hay ninguna.
+        """
+        from core.protondb import rating_text, RATING_FETCH_FAILED
+        cache = self._protondb_cache()
+        rows_by_appid = {self.steam_games_table.item(row, 1).text(): row for row in range(self.steam_games_table.rowCount())}
+        for appid, summary, ok in results:
+            row = rows_by_appid.get(appid)
+            if row is None:
+                continue
+            entry = cache.get(appid)
+            if ok:
+                self._update_protondb_rating(row, rating_text(summary), entry)
+            elif entry:
+                self._update_protondb_rating(row, rating_text(entry["summary"]), entry)
+            else:
+                self._update_protondb_rating(row, RATING_FETCH_FAILED)
+
+    def _fill_compat_tool_combo(self, combo: QComboBox, versions: list[str], current_tool: str):
+        """Rellena el desplegable de herramientas de compatibilidad manteniendo la seleccionada."""
+        combo.blockSignals(True)
+        combo.clear()
+        if current_tool not in versions:
+            combo.addItem(current_tool)
+        combo.addItems(versions)
+        combo.setCurrentText(current_tool)
+        combo.blockSignals(False)
+
+    def _update_protondb_rating(self, row: int, rating: str, cache_entry: dict | None = None):
         """
         Actualiza la celda de estado de ProtonDB y le aplica un color según la calificación.
         """
+        from core.protondb import rating_tooltip
         # Mapa de calificaciones a colores ---
         tier_colors = {
             "platinum": QColor("#89cff0"),  # 💎 Azul claro (Platino)
@@ -674,21 +762,20 @@ class InstallerApp(QWidget):
             "native": QColor("#7CFC00"),    # 🟢 Verde lima (Nativo)
         }
 
-        for row in range(self.steam_games_table.rowCount()):
-            # Buscamos la fila correcta comparando el APPID
-            if self.steam_games_table.item(row, 1).text() == appid:
-                status_item = self.steam_games_table.item(row, 3)
-                if status_item:
-                    # Ponemos el texto de la calificación (ej. "Gold")
-                    status_item.setText(rating)
-                    
-                    # Buscamos el color en nuestro diccionario (en minúsculas para asegurar la coincidencia)
-                    color = tier_colors.get(rating.lower())
-                    
-                    if color:
-                        # Si encontramos un color, lo aplicamos al texto de la celda
-                        status_item.setForeground(color)
-                break
+        status_item = self.steam_games_table.item(row, 3)
+        if status_item:
+            # Ponemos el texto de la calificación (ej. "Gold") y el detalle guardado en la caché
+            status_item.setText(rating)
+            status_item.setToolTip(rating_tooltip(cache_entry))
+
+            # Buscamos el color en nuestro diccionario (en minúsculas para asegurar la coincidencia)
+            color = tier_colors.get(rating.lower())
+
+            if color:
+                # Si encontramos un color, lo aplicamos al texto de la celda
+                status_item.setForeground(color)
+            else:
+                status_item.setData(Qt.ForegroundRole, None) # La calificación guardada tenía color y la nueva no
 
     def _parse_shortcuts_vdf(self, path):
         """
@@ -774,6 +861,7 @@ class InstallerApp(QWidget):
         """
         Versión final que utiliza 'vdf' para guardar la configuración de forma segura.
         """
+        import vdf
         if not self.steam_root: return False
 
         config_path = self.steam_root / "config/config.vdf"
@@ -854,22 +942,39 @@ class InstallerApp(QWidget):
 
     def closeEvent(self, event):
         """Guarda el tamaño de la ventana al cerrar."""
+        self._cancel_steam_scan(wait=True)
+        self._stop_steam_watch(wait=True)
+        if self.protondb_thread:
+            # Las peticiones en curso están en hilos daemon: solo se espera al reparto de resultados
+            self.protondb_thread.stop()
+            self.protondb_thread.wait()
         self.config_manager.save_window_size(self.size())
+        self.config_manager.flush_configs()
+        self.config_manager.close_logs()
         super().closeEvent(event)
 
     def configure_environments(self):
         """Abre el diálogo para configurar entornos de Wine/Proton."""
+        from dialogs.config_dialog import ConfigDialog
         dialog = ConfigDialog(self.config_manager, self)
         dialog.update_save_settings_button_state()
         dialog.config_saved.connect(self.handle_config_saved_and_restart) # Conectar a la nueva función de reinicio
         dialog.exec_()
         self.update_config_info() # Asegurarse de actualizar la info al cerrar el diálogo
 
+    def open_log_viewer(self):
+        """Abre el visor de logs, empezando por el log de la configuración actual."""
+        from dialogs.log_viewer_dialog import LogViewerDialog
+        current_config_name = self.config_manager.configs.get("last_used", "")
+        dialog = LogViewerDialog(self.config_manager, self, initial_log=self.config_manager.get_log_path(current_config_name).name)
+        dialog.exec_()
+
     def handle_config_saved_and_restart(self):
         """
         Maneja la señal de que la configuración ha sido guardada.
         Cierra la aplicación actual y la reinicia.
         """
+        self.config_manager.flush_configs() # La nueva instancia debe leer la configuración ya guardada
         QApplication.quit()
         QProcess.startDetached(sys.executable, sys.argv)
 
@@ -939,6 +1044,7 @@ class InstallerApp(QWidget):
 
     def add_custom_program(self):
         """Abre el diálogo para añadir un nuevo programa/script personalizado."""
+        from dialogs.custom_program_dialog import CustomProgramDialog
         dialog = CustomProgramDialog(self.config_manager, self)
         if dialog.exec_() == QDialog.Accepted:
             try:
@@ -1033,6 +1139,7 @@ class InstallerApp(QWidget):
 
     def manage_custom_programs(self):
         """Abre el diálogo para gestionar (cargar/eliminar) programas personalizados."""
+        from dialogs.manage_programs_dialog import ManageProgramsDialog
         dialog = ManageProgramsDialog(self.config_manager, self)
         if dialog.exec_() == QDialog.Accepted: # Si el diálogo se cerró con "Aceptar"
             selected_programs = dialog.get_selected_programs_to_load()
@@ -1044,6 +1151,7 @@ class InstallerApp(QWidget):
 
     def select_components(self):
         """Abre el diálogo para seleccionar componentes de Winetricks."""
+        from dialogs.select_groups_dialog import SelectGroupsDialog
         # Definición de grupos de componentes de Winetricks
         component_groups = {
             "Bibliotecas Visual Basic": ["vb2run", "vb3run", "vb4run", "vb5run", "vb6run"],
@@ -1177,18 +1285,17 @@ class InstallerApp(QWidget):
             self.update_installation_button_state() # Actualizar estado del botón Instalar
 
     def cancel_installation(self):
-        """Detiene la instalación actual."""
-        if self.installer_thread and self.installer_thread.isRunning():
+        """Detiene todos los trabajos de instalación en curso y en cola."""
+        if self.is_installation_running():
             reply = QMessageBox.question(
                 self, "Confirmar Cancelación",
                 "¿Estás seguro de que quieres cancelar la instalación en curso? Esto puede dejar el prefijo en un estado inconsistente.",
                 QMessageBox.Yes | QMessageBox.No
             )
             if reply == QMessageBox.Yes:
-                self.installer_thread.stop() # Enviar señal de parada al hilo
-                self.installer_thread.wait(5000) # Esperar a que el hilo termine (hasta 5 segundos)
-                if self.installer_thread.isRunning():
-                    print("Advertencia: El hilo de instalación no terminó a tiempo.")
+                self.install_scheduler.cancel_all() # Enviar señal de parada a todos los trabajos
+                if not self.install_scheduler.wait(5000): # Esperar a que los hilos terminen (hasta 5 segundos)
+                    print("Advertencia: Algún hilo de instalación no terminó a tiempo.")
 
                 QMessageBox.information(self, "Cancelado", "La instalación ha sido cancelada por el usuario.")
 
@@ -1213,8 +1320,7 @@ class InstallerApp(QWidget):
 
                 if self.installation_progress_dialog:
                     self.installation_progress_dialog.set_status("Cancelado")
-
-                self.installation_finished() # Llamar al manejador de finalización para restablecer la UI
+                # installation_finished se invocará cuando el planificador emita all_finished
         else:
             QMessageBox.information(self, "Información", "No hay ninguna instalación en progreso para cancelar.")
 
@@ -1336,11 +1442,12 @@ class InstallerApp(QWidget):
             if self.items_table.item(row, 0).checkState() == Qt.Checked:
                 any_checked = True
 
-        is_installer_running = self.installer_thread is not None and self.installer_thread.isRunning()
+        is_installer_running = self.is_installation_running()
         is_backup_running = self.backup_thread is not None and self.backup_thread.isRunning()
 
         # Botones de instalación
         self.btn_install.setEnabled(any_checked and not is_installer_running and not is_backup_running)
+        self.btn_install_multi.setEnabled(any_checked and not is_installer_running and not is_backup_running)
         # El botón de cancelar siempre está habilitado si la instalación está en curso
         self.btn_cancel.setEnabled(is_installer_running)
 
@@ -1361,8 +1468,23 @@ class InstallerApp(QWidget):
         self.btn_explorer.setEnabled(can_use_prefix_tools)
         self.backup_prefix_button.setEnabled(can_use_prefix_tools) # Incluir el botón de backup aquí también
 
+    def is_installation_running(self) -> bool:
+        """Indica si el planificador tiene trabajos de instalación en cola o en curso."""
+        return self.install_scheduler is not None and self.install_scheduler.is_running()
+
     def start_installation(self):
-        """Inicia el proceso de instalación de los elementos seleccionados."""
+        """Inicia la instalación de los elementos seleccionados en la configuración actual."""
+        self._begin_installation(None)
+
+    def start_multi_config_installation(self):
+        """Permite elegir varias configuraciones y lanza la lista de instalación en todas ellas."""
+        from dialogs.select_configs_dialog import SelectConfigsDialog
+        dialog = SelectConfigsDialog(self.config_manager, self)
+        if dialog.exec_() == QDialog.Accepted:
+            self._begin_installation(dialog.get_selected_configs())
+
+    def _begin_installation(self, config_names: list[str] | None):
+        """Prepara los estados de la tabla y continúa (tras el posible backup) con la instalación."""
         # Filtrar solo los elementos que están marcados para instalar
         items_to_process = [
             item_data for row, item_data in enumerate(self.items_for_installation)
@@ -1393,18 +1515,19 @@ class InstallerApp(QWidget):
 
 
         if self.config_manager.get_ask_for_backup_before_action():
-            self.prompt_for_backup(lambda: self._continue_start_installation())
+            self.prompt_for_backup(lambda: self._continue_start_installation(config_names), config_names)
         else:
-            self._continue_start_installation()
-
-    def _continue_start_installation(self):
-        """Continúa con la instalación después de la posible solicitud de backup."""
-        current_config_name = self.config_manager.configs.get("last_used")
-        config = self.config_manager.get_config(current_config_name)
+            self._continue_start_installation(config_names)
 
-        if not config:
-            QMessageBox.critical(self, "Error", "No se ha seleccionado ninguna configuración de Wine/Proton o es inválida.")
-            return
+    def _continue_start_installation(self, config_names: list[str] | None = None):
+        """
+        Continúa con la instalación después de la posible solicitud de backup.
+        Crea un trabajo por configuración destino y los entrega al planificador.
+        """
+        from threads.install_scheduler import InstallScheduler
+        from dialogs.installation_progress_dialog import InstallationProgressDialog
+        if not config_names:
+            config_names = [self.config_manager.configs.get("last_used")]
 
         items_to_process_data_for_thread = [
             (item_data['path'], item_data['type'], item_data['name'])
@@ -1416,52 +1539,55 @@ class InstallerApp(QWidget):
             QMessageBox.warning(self, "Advertencia", "No hay elementos seleccionados con estado 'Pendiente' para instalar.")
             return
 
-        prefix_path = Path(config["prefix"])
-        if not prefix_path.exists():
-            reply = QMessageBox.question(
-                self, "Prefijo No Encontrado",
-                f"El prefijo de Wine/Proton en '{config['prefix']}' no existe. ¿Deseas crearlo ahora? Esto inicializará el prefijo.",
-                QMessageBox.Yes | QMessageBox.No
-            )
-            if reply == QMessageBox.Yes:
-                try:
-                    self._create_prefix(config, current_config_name, prefix_path)
-                    QMessageBox.information(self, "Prefijo Creado", "El prefijo de Wine/Proton ha sido creado exitosamente.")
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"No se pudo crear el prefijo:\n{str(e)}")
-                    return
-            else:
-                return
-
-        try:
-            env = self.config_manager.get_current_environment(current_config_name)
-        except Exception as e:
-            QMessageBox.critical(self, "Error de Entorno", f"No se pudo configurar el entorno para la instalación:\n{str(e)}")
+        targets = []
+        for config_name in config_names:
+            env = self._prepare_installation_environment(config_name, multiple_targets=len(config_names) > 1)
+            if env is not None:
+                targets.append((config_name, env))
+        if not targets:
             return
 
-        first_item_name_for_dialog = items_to_process_data_for_thread[0][2] if items_to_process_data_for_thread else "elementos"
-        self.installation_progress_dialog = InstallationProgressDialog(first_item_name_for_dialog, self.config_manager, self)
+        plans = self._plan_installations(targets, items_to_process_data_for_thread)
+        if plans is None:
+            return
 
-        # Iniciar el hilo de instalación
-        self.installer_thread = InstallerThread(
-            items_to_process_data_for_thread,
-            env,
-            silent_mode=self.silent_mode,
-            force_mode=self.force_mode,
-            winetricks_path=self.config_manager.get_winetricks_path(),
-            config_manager=self.config_manager,
-            config_name=current_config_name 
+        scheduler = InstallScheduler(self.config_manager, self.config_manager.get_max_parallel_installs(), self)
+        scheduler.set_prefetch(
+            {item[0] for plan in plans.values() for item in plan.items if item[1] == "winetricks"},
+            self.config_manager.get_winetricks_path()
         )
+        for config_name, env in targets:
+            scheduler.add_job(
+                config_name,
+                plans[config_name].items,
+                env,
+                silent_mode=self.silent_mode,
+                force_mode=self.force_mode,
+                winetricks_path=self.config_manager.get_winetricks_path()
+            )
 
-        # Conectar señales del hilo a slots de la UI
-        self.installer_thread.progress.connect(self.update_progress)
-        self.installer_thread.finished.connect(self.installation_finished)
-        self.installer_thread.error.connect(self.show_global_installation_error)
-        self.installer_thread.item_error.connect(self.show_item_installation_error)
-        self.installer_thread.canceled.connect(self.on_installation_canceled)
-        self.installer_thread.console_output.connect(self.installation_progress_dialog.append_log)
+        if not scheduler.jobs:
+            return
 
-        self.update_installation_button_state()
+        self.install_scheduler = scheduler
+        self.install_item_results = {item[2]: {} for item in items_to_process_data_for_thread}
+
+        if len(scheduler.jobs) == 1:
+            first_item_name_for_dialog = items_to_process_data_for_thread[0][2]
+        else:
+            first_item_name_for_dialog = f"{len(items_to_process_data_for_thread)} elemento(s) en {len(scheduler.jobs)} entornos"
+        self.installation_progress_dialog = InstallationProgressDialog(first_item_name_for_dialog, self.config_manager, self)
+
+        # Conectar señales del planificador a slots de la UI
+        scheduler.job_progress.connect(self.update_progress)
+        scheduler.job_error.connect(self.show_global_installation_error)
+        scheduler.job_item_error.connect(self.show_item_installation_error)
+        scheduler.job_canceled.connect(self.on_installation_canceled)
+        scheduler.job_console_output.connect(self.on_installation_console_output)
+        scheduler.job_started.connect(self.on_installation_job_started)
+        scheduler.job_finished.connect(self.on_installation_job_finished)
+        scheduler.all_finished.connect(self.installation_finished)
+        scheduler.prefetch_progress.connect(self.on_installation_prefetch_progress)
 
         try:
             self.items_table.itemChanged.disconnect(self.on_table_item_changed)
@@ -1477,27 +1603,80 @@ class InstallerApp(QWidget):
                     self.items_table.item(row, 3).setForeground(QColor("blue"))
         self.items_table.itemChanged.connect(self.on_table_item_changed)
 
+        # Los elementos descartados por el plan no llegan al hilo: reflejarlos como omitidos en ese entorno
+        for config_name, plan in plans.items():
+            for (_, _, item_name), _ in plan.dropped:
+                self.update_progress(config_name, item_name, "Omitido")
+
         self.installation_progress_dialog.show()
-        self.installer_thread.start()
+        scheduler.start()
+        self.update_installation_button_state()
+
+    def _plan_installations(self, targets: list[tuple[str, dict]], items: list[tuple[str, str, str]]) -> dict[str, InstallPlan] | None:
+        """
+        Calcula el plan de winetricks de cada entorno (dependencias, ya instalados, orden) y, si cambia algo,
+        lo muestra para confirmarlo. Devuelve None si el usuario cancela.
+        """
+        from dialogs.install_plan_dialog import InstallPlanDialog
+        dependencies = {}
+        if any(item[1] == "winetricks" for item in items):
+            dependencies = load_verb_dependencies(self.config_manager.get_winetricks_path())
+
+        indexes = {config_name: get_install_index(env["WINEPREFIX"]) for config_name, env in targets}
+        plans = {
+            config_name: plan_installation(items, indexes[config_name].installed_names(), dependencies, self.force_mode)
+            for config_name, _ in targets
+        }
+
+        if any(plan.has_changes() for plan in plans.values()):
+            dialog = InstallPlanDialog(plans, self.config_manager, self)
+            if dialog.exec_() != QDialog.Accepted:
+                return None
+        return plans
+
+    def _prepare_installation_environment(self, config_name: str, multiple_targets: bool) -> dict | None:
+        """
+        Valida la configuración destino, ofrece crear su prefijo si no existe y devuelve su entorno.
+        Devuelve None si esa configuración debe omitirse.
+        """
+        config = self.config_manager.get_config(config_name)
+        if not config:
+            QMessageBox.critical(self, "Error", f"La configuración de Wine/Proton '{config_name}' no existe o es inválida.")
+            return None
+
+        prefix_path = Path(config["prefix"])
+        if not prefix_path.exists():
+            reply = QMessageBox.question(
+                self, "Prefijo No Encontrado",
+                f"El prefijo de Wine/Proton en '{config['prefix']}' ({config_name}) no existe. ¿Deseas crearlo ahora? Esto inicializará el prefijo.",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply == QMessageBox.Yes:
+                try:
+                    self._create_prefix(config, config_name, prefix_path)
+                    if not multiple_targets:
+                        QMessageBox.information(self, "Prefijo Creado", "El prefijo de Wine/Proton ha sido creado exitosamente.")
+                except Exception as e:
+                    QMessageBox.critical(self, "Error", f"No se pudo crear el prefijo de '{config_name}':\n{str(e)}")
+                    return None
+            else:
+                return None
+
+        try:
+            return self.config_manager.get_current_environment(config_name)
+        except Exception as e:
+            QMessageBox.critical(self, "Error de Entorno", f"No se pudo configurar el entorno para la instalación en '{config_name}':\n{str(e)}")
+            return None
 
     def _create_prefix(self, config: dict, config_name: str, prefix_path: Path):
-        """Crea un nuevo prefijo de Wine/Proton y lo inicializa con wineboot."""
+        """Crea un nuevo prefijo de Wine/Proton clonando su plantilla o, si no la hay, con wineboot."""
+        from threads.prefix_creation_thread import PrefixCreationThread
         prefix_path.mkdir(parents=True, exist_ok=True, mode=0o755)
 
-        # Temporalmente asignar la config para que get_current_environment funcione
-        original_configs = self.config_manager.configs.copy()
-        temp_configs_dict = {k: v.copy() if isinstance(v, dict) else v for k, v in original_configs.get("configs", {}).items()}
-        temp_configs_dict[config_name] = config
-        self.config_manager.configs["configs"] = temp_configs_dict
-        self.config_manager.configs["last_used"] = config_name
-
-        env = self.config_manager.get_current_environment(config_name)
+        env = self.config_manager.build_environment(config)
 
         wine_executable = env.get("WINE")
         if not wine_executable or not Path(wine_executable).is_file():
-            # Restaurar configs antes de levantar el error
-            self.config_manager.configs = original_configs
-            self.config_manager.save_configs()
             raise FileNotFoundError(f"Ejecutable de Wine no encontrado: {wine_executable}")
 
         progress_dialog = QProgressDialog("Inicializando Prefijo de Wine/Proton...", "", 0, 0, self)
@@ -1509,65 +1688,65 @@ class InstallerApp(QWidget):
         progress_dialog.show()
 
         try:
-            process = subprocess.Popen(
-                [wine_executable, "wineboot"],
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            log_output = ""
-            for line in process.stdout:
-                log_output += line
-                progress_dialog.setLabelText(f"Inicializando Prefijo de Wine/Proton...\n{line.strip()}")
-                QApplication.processEvents()
-            process.wait(timeout=60) # Tiempo de espera para wineboot
-
-            self.config_manager.write_to_log("Creación del Prefijo", f"Salida de Wineboot para {config_name}:\n{log_output}")
-
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, "wineboot", output=log_output)
-
-        except subprocess.TimeoutExpired:
-            process.kill()
-            raise Exception("La inicialización del prefijo de Wine/Proton agotó el tiempo de espera.")
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"No se pudo inicializar el prefijo de Wine/Proton. Código de salida: {e.returncode}\nSalida: {e.output}")
+            creation_thread = PrefixCreationThread(env, prefix_path, self.config_manager, config_name)
+            creation_thread.progress.connect(lambda line: progress_dialog.setLabelText(f"Inicializando Prefijo de Wine/Proton...\n{line}"))
+            ok, message = creation_thread.wait_until_done()
+            if not ok:
+                raise Exception(message)
         finally:
             progress_dialog.close()
-            # Asegurarse de restaurar el estado original de configs
-            self.config_manager.configs = original_configs
-            self.config_manager.save_configs()
 
-    def update_progress(self, name: str, status: str):
+    def _is_multi_config_installation(self) -> bool:
+        return self.install_scheduler is not None and len(self.install_scheduler.jobs) > 1
+
+    def _aggregate_item_status(self, name: str) -> str:
+        """Combina el estado de un elemento en todos los entornos destino en un único estado para la tabla."""
+        statuses = list(self.install_item_results.get(name, {}).values())
+        if not statuses:
+            return "Instalando"
+        if any(s in ("Error", "Cancelado") for s in statuses):
+            return "Error"
+        total_jobs = len(self.install_scheduler.jobs) if self.install_scheduler else 1
+        if len(statuses) == total_jobs and all(s in ("Finalizado", "Omitido") for s in statuses):
+            return "Finalizado" if "Finalizado" in statuses else "Omitido"
+        return "Instalando"
+
+    def update_progress(self, config_name: str, name: str, status: str):
         """Actualiza el estado de un elemento en la tabla y en el modelo interno."""
-        found_in_model = False
+        self.install_item_results.setdefault(name, {})[config_name] = status
+        multi_config = self._is_multi_config_installation()
+
+        model_status = self._aggregate_item_status(name) if multi_config else status
         for item_data in self.items_for_installation:
             if item_data['name'] == name:
-                item_data['current_status'] = status
-                found_in_model = True
+                item_data['current_status'] = model_status
                 break
 
         if self.installation_progress_dialog and self.installation_progress_dialog.isVisible():
             # Actualizar el label principal del diálogo de progreso
-            self.installation_progress_dialog.set_status(f"Instalando {name}: {status}")
+            prefix = f"[{config_name}] " if multi_config else ""
+            self.installation_progress_dialog.set_status(f"{prefix}Instalando {name}: {status}")
+
+        if multi_config:
+            done = sum(1 for s in self.install_item_results[name].values() if s in ("Finalizado", "Omitido", "Error", "Cancelado"))
+            display_status = f"{model_status} ({done}/{len(self.install_scheduler.jobs)})"
+        else:
+            display_status = status
 
         # Actualizar el ítem de estado en la tabla
         for row in range(self.items_table.rowCount()):
             if self.items_table.item(row, 1).text() == name:
                 status_item = self.items_table.item(row, 3)
                 if status_item:
-                    status_item.setText(status)
+                    status_item.setText(display_status)
                     # Colorear según el estado
-                    if "Error" in status:
+                    if "Error" in display_status:
                         status_item.setForeground(QColor(255, 0, 0)) # Rojo
-                    elif "Finalizado" in status:
+                    elif "Finalizado" in display_status:
                         status_item.setForeground(QColor(0, 128, 0)) # Verde
-                    elif "Omitido" in status:
+                    elif "Omitido" in display_status:
                         status_item.setForeground(QColor("darkorange")) # Naranja
-                    elif "Instalando" in status:
+                    elif "Instalando" in display_status:
                         status_item.setForeground(QColor("blue")) # Azul
                     else:
                         theme = self.config_manager.get_theme()
@@ -1576,8 +1755,34 @@ class InstallerApp(QWidget):
                 # else: print(f"DEBUG: El elemento de estado es None para la fila {row}, nombre '{name}'.")
                 break
 
-    def on_installation_canceled(self, item_name: str):
+    def on_installation_console_output(self, config_name: str, lines: list[str]):
+        """Reenvía un lote de salida de consola de un trabajo al diálogo de progreso."""
+        if self.installation_progress_dialog:
+            if self._is_multi_config_installation():
+                lines = [f"[{config_name}] {line}" for line in lines]
+            self.installation_progress_dialog.append_log_lines(lines)
+
+    def on_installation_prefetch_progress(self, message: str):
+        """Muestra en el diálogo de progreso el avance de la precarga de descargas."""
+        if self.installation_progress_dialog:
+            self.installation_progress_dialog.append_log(message)
+
+    def on_installation_job_started(self, config_name: str):
+        """Informa en el diálogo de progreso del inicio de un trabajo."""
+        if self.installation_progress_dialog and self._is_multi_config_installation():
+            self.installation_progress_dialog.append_log(f"=== Iniciando instalación en '{config_name}' ===")
+
+    def on_installation_job_finished(self, config_name: str, job_summary: dict):
+        """Informa en el diálogo de progreso del resultado de un trabajo."""
+        if self.installation_progress_dialog and self._is_multi_config_installation():
+            self.installation_progress_dialog.append_log(
+                f"=== '{config_name}': {job_summary['state']} en {job_summary['duration']:.1f} s "
+                f"({job_summary['installed']} instalado(s), {job_summary['failed']} con error) ==="
+            )
+
+    def on_installation_canceled(self, config_name: str, item_name: str):
         """Actualiza el estado de un elemento cuando la instalación es cancelada."""
+        self.install_item_results.setdefault(item_name, {})[config_name] = "Cancelado"
         for item_data in self.items_for_installation:
             if item_data['name'] == item_name:
                 item_data['current_status'] = "Cancelado"
@@ -1598,12 +1803,18 @@ class InstallerApp(QWidget):
         if self.installation_progress_dialog:
             self.installation_progress_dialog.set_status("Cancelado")
 
-    def installation_finished(self):
+    def installation_finished(self, scheduler_summary: dict | None = None):
         """
         Maneja el estado final de la instalación, actualizando la GUI y mostrando un resumen.
         Limpia la lista de selección, pero mantiene los estados de los ítems.
         Los ítems "Finalizado" y "Omitido" se desmarcan. Los "Error" o "Cancelado" se mantienen marcados.
         """
+        unfinished_status = "Cancelado" if scheduler_summary and scheduler_summary.get("canceled") else "Error"
+        for item_data in self.items_for_installation:
+            if item_data['current_status'] == "Instalando":
+                # Elementos que algún trabajo no llegó a procesar (trabajo cancelado o con error global)
+                item_data['current_status'] = unfinished_status
+
         installed_count = 0
         failed_count = 0
         skipped_count = 0
@@ -1639,18 +1850,29 @@ class InstallerApp(QWidget):
                 if status_item:
                     status_item.setForeground(QColor("darkorange")) # Naranja
 
+            if status_item and self._is_multi_config_installation():
+                status_item.setText(current_status)
+
             # Re-habilitar los checkboxes para edición después de la instalación
             if checkbox_item:
                 checkbox_item.setFlags(checkbox_item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
 
         self.items_table.itemChanged.connect(self.on_table_item_changed) # Reconectar
 
-        # Restablecer el estado de los botones
-        self.update_installation_button_state()
-
         if self.installation_progress_dialog:
             self.installation_progress_dialog.set_status("Finalizado")
 
+        jobs_text = ""
+        if scheduler_summary and len(scheduler_summary.get("jobs", {})) > 1:
+            jobs_lines = [
+                f"• {name}: {job['state']} ({job['installed']} ok, {job['failed']} con error, {job['duration']:.0f} s)"
+                for name, job in scheduler_summary["jobs"].items()
+            ]
+            jobs_text = "Resumen por Entorno:\n" + "\n".join(jobs_lines) + "\n\n"
+
+        self.install_scheduler = None # Limpiar la referencia al planificador antes de restablecer la UI
+        self.update_installation_button_state()
+
         QMessageBox.information(
             self,
             "Instalación Completada",
@@ -1658,36 +1880,24 @@ class InstallerApp(QWidget):
             f"• Instalado exitosamente: {installed_count}\n"
             f"• Fallido o Cancelado: {failed_count}\n"
             f"• Omitido (no seleccionado inicialmente): {skipped_count}\n\n"
+            f"{jobs_text}"
             f"Los elementos se han desmarcado o dejado marcados según el resultado."
         )
-        self.installer_thread = None # Asegurarse de limpiar la referencia al hilo
 
-    def show_global_installation_error(self, message: str):
-        """[MODIFICACIÓN 1] Muestra un mensaje de error crítico que detiene *toda* la instalación."""
+    def show_global_installation_error(self, config_name: str, message: str):
+        """Muestra un error crítico que detiene *todo* el trabajo de una configuración (el resto de trabajos continúa)."""
         if self.installation_progress_dialog:
-            self.installation_progress_dialog.append_log(f"ERROR FATAL: {message}")
+            self.installation_progress_dialog.append_log(f"ERROR FATAL [{config_name}]: {message}")
             self.installation_progress_dialog.set_status("Error Crítico")
 
-        QMessageBox.critical(self, "Error Crítico de Instalación", message + "\nLa instalación se ha detenido.")
-        self.update_installation_button_state() # Restablecer botones
+        QMessageBox.critical(self, "Error Crítico de Instalación", f"[{config_name}] {message}\nLa instalación en este entorno se ha detenido.")
+        # El restablecimiento de la UI se realiza en installation_finished cuando terminan todos los trabajos
 
-        # Re-habilitar los checkboxes para edición
-        try:
-            self.items_table.itemChanged.disconnect(self.on_table_item_changed)
-        except TypeError:
-            pass
-        for row in range(self.items_table.rowCount()):
-            checkbox_item = self.items_table.item(row, 0)
-            if checkbox_item:
-                checkbox_item.setFlags(checkbox_item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-        self.items_table.itemChanged.connect(self.on_table_item_changed) # Reconectar
-
-        self.installer_thread = None # Asegurarse de limpiar la referencia al hilo
-
-    def show_item_installation_error(self, item_name: str, error_message: str):
+    def show_item_installation_error(self, config_name: str, item_name: str, error_message: str):
         """Maneja errores de ítems individuales (la instalación continúa)."""
         if self.installation_progress_dialog:
-            self.installation_progress_dialog.append_log(f"ERROR para '{item_name}': {error_message}")
+            prefix = f"[{config_name}] " if self._is_multi_config_installation() else ""
+            self.installation_progress_dialog.append_log(f"{prefix}ERROR para '{item_name}': {error_message}")
             # El diálogo de progreso principal seguirá mostrando "Instalando [siguiente item]"
 
     def _get_backup_destination_path(self, current_config_name: str, source_to_backup: Path, is_full_backup: bool) -> Path | None:
@@ -1696,19 +1906,7 @@ class InstallerApp(QWidget):
         Si is_full_backup es True, creará una subcarpeta con timestamp.
         Si es incremental, intentará usar la ruta del último backup completo para *esa* configuración.
         """
-        base_backup_path_for_config = self.config_manager.backup_dir / current_config_name
-        base_backup_path_for_config.mkdir(parents=True, exist_ok=True)
-
-        if is_full_backup:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            # El destino final incluye el nombre de la carpeta a copiar (source_to_backup.name)
-            return base_backup_path_for_config / f"{source_to_backup.name}_backup_{timestamp}"
-        else:
-            # Para backup incremental, el destino es la última ruta de backup completo guardada para *esta* configuración.
-            last_full_backup_path_str = self.config_manager.get_last_full_backup_path(current_config_name)
-            if last_full_backup_path_str and Path(last_full_backup_path_str).is_dir():
-                return Path(last_full_backup_path_str)
-            return None # Indicar que no hay un backup completo previo para incremental para esta configuración
+        return backup_destination_path(self.config_manager, current_config_name, source_to_backup, is_full_backup)
 
     def perform_backup(self):
         """
@@ -1722,12 +1920,7 @@ class InstallerApp(QWidget):
             QMessageBox.warning(self, "No hay prefijo", "No hay un prefijo de Wine/Proton configurado para hacer backup.")
             return
 
-        source_prefix_path = Path(config["prefix"])
-        if config.get("steam_appid"):
-            steam_compat_data_root = Path.home() / ".local/share/Steam/steamapps/compatdata"
-            source_to_backup = steam_compat_data_root / config["steam_appid"]
-        else:
-            source_to_backup = source_prefix_path
+        source_to_backup = backup_source_path(config)
 
         if not source_to_backup.exists():
             QMessageBox.warning(self, "Prefijo no existe", f"El directorio de origen para backup '{source_to_backup}' no existe.")
@@ -1763,32 +1956,37 @@ class InstallerApp(QWidget):
         elif clicked_button == btn_cancel:
             QMessageBox.information(self, "Backup Cancelado", "La operación de backup ha sido cancelada.")
 
-    def prompt_for_backup(self, callback_func):
+    def prompt_for_backup(self, callback_func, config_names: list[str] | None = None):
         """
         Muestra un diálogo preguntando si se desea hacer un backup antes de una acción.
         Ahora ofrece las mismas opciones (Rsync/Completo) que el backup manual, sin "Cancelar Acción".
+        config_names son las configuraciones cuyos prefijos modificará la acción (por defecto, la actual):
+        se hace backup de todas, una tras otra, antes de continuar.
         """
-        current_config_name = self.config_manager.configs.get("last_used")
-        config = self.config_manager.get_config(current_config_name)
-
-        if not config or "prefix" not in config:
-            callback_func() # No hay prefijo, continuar sin backup
-            return
-
-        source_prefix_path = Path(config["prefix"])
-        if config.get("steam_appid"):
-            steam_compat_data_root = Path.home() / ".local/share/Steam/steamapps/compatdata"
-            source_to_backup = steam_compat_data_root / config["steam_appid"]
-        else:
-            source_to_backup = source_prefix_path
-
-        if not source_to_backup.exists():
-            callback_func() # Prefijo no existe, continuar sin backup
+        if not config_names:
+            config_names = [self.config_manager.configs.get("last_used")]
+
+        sources_to_backup: list[tuple[str, Path]] = []
+        for config_name in config_names:
+            config = self.config_manager.get_config(config_name)
+            if not config or "prefix" not in config:
+                continue # Sin prefijo: nada que respaldar
+            source_to_backup = backup_source_path(config)
+            if source_to_backup.exists():
+                sources_to_backup.append((config_name, source_to_backup))
+
+        if not sources_to_backup:
+            callback_func() # Ningún prefijo existe todavía, continuar sin backup
             return
 
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("Realizar Backup Antes de Continuar")
-        msg_box.setText(f"Se recomienda realizar un backup del prefijo '{source_to_backup.name}' de la configuración '{current_config_name}' antes de continuar con la operación.")
+        if len(sources_to_backup) == 1:
+            config_name, source_to_backup = sources_to_backup[0]
+            msg_box.setText(f"Se recomienda realizar un backup del prefijo '{source_to_backup.name}' de la configuración '{config_name}' antes de continuar con la operación.")
+        else:
+            prefixes = "\n".join(f"• {config_name}: {source_to_backup}" for config_name, source_to_backup in sources_to_backup)
+            msg_box.setText(f"La operación modificará {len(sources_to_backup)} prefijos. Se recomienda realizar un backup de todos ellos antes de continuar:\n{prefixes}")
 
         btn_rsync = msg_box.addButton("Rsync (Incremental)", QMessageBox.YesRole)
         btn_full_backup = msg_box.addButton("Backup Completo (Nuevo)", QMessageBox.YesRole)
@@ -1802,22 +2000,32 @@ class InstallerApp(QWidget):
         clicked_button = msg_box.clickedButton()
 
         if clicked_button == btn_rsync:
-            destination_path = self._get_backup_destination_path(current_config_name, source_to_backup, is_full_backup=False)
-            if not destination_path or not destination_path.is_dir():
-                QMessageBox.warning(self, "No hay Backup Completo Previo",
-                                    "No se encontró un backup completo previo para realizar un backup incremental para esta configuración. "
-                                    "Por favor, realiza un 'Backup Completo (Nuevo)' primero o selecciona 'No hacer Backup y Continuar'.")
-                callback_func() # Continuar con la acción original si el rsync no es posible
-                return
-            self._start_backup_process(source_to_backup, destination_path, is_full_backup=False, config_name=current_config_name, prompt_callback=callback_func) 
+            self._backup_prefixes_then(sources_to_backup, False, callback_func)
         elif clicked_button == btn_full_backup:
-            destination_path = self._get_backup_destination_path(current_config_name, source_to_backup, is_full_backup=True)
-            self._start_backup_process(source_to_backup, destination_path, is_full_backup=True, config_name=current_config_name, prompt_callback=callback_func) 
+            self._backup_prefixes_then(sources_to_backup, True, callback_func)
         elif clicked_button == btn_no_backup:
             callback_func() # Continuar con la operación original sin backup
 
+    def _backup_prefixes_then(self, sources_to_backup: list[tuple[str, Path]], is_full_backup: bool, callback_func):
+        """Hace el backup de cada prefijo, uno tras otro, y al terminar el último continúa con callback_func."""
+        if not sources_to_backup:
+            callback_func()
+            return
+        (config_name, source_to_backup), rest = sources_to_backup[0], sources_to_backup[1:]
+        next_step = lambda: self._backup_prefixes_then(rest, is_full_backup, callback_func)
+
+        destination_path = self._get_backup_destination_path(config_name, source_to_backup, is_full_backup=is_full_backup)
+        if not is_full_backup and (not destination_path or not destination_path.is_dir()):
+            QMessageBox.warning(self, "No hay Backup Completo Previo",
+                                f"No se encontró un backup completo previo de la configuración '{config_name}' para realizar un backup incremental. "
+                                "Se continuará sin backup de este prefijo; realiza un 'Backup Completo (Nuevo)' la próxima vez.")
+            next_step() # Continuar con los demás prefijos (o la acción original) si el rsync no es posible
+            return
+        self._start_backup_process(source_to_backup, destination_path, is_full_backup=is_full_backup, config_name=config_name, prompt_callback=next_step)
+
     def _start_backup_process(self, source_to_backup: Path, destination_path: Path, is_full_backup: bool, config_name: str, prompt_callback=None): 
         """Método auxiliar para iniciar el hilo de backup."""
+        from threads.backup_thread import BackupThread
         self.backup_progress_dialog = QProgressDialog("Preparando backup...", "", 0, 100, self)
         self.backup_progress_dialog.setWindowTitle("Progreso del Backup")
         self.backup_progress_dialog.setWindowModality(Qt.WindowModal)